@@ -1,28 +1,154 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
 from pathlib import Path
 
 from ybi_strategy.backtest.engine import BacktestEngine
+from ybi_strategy.backtest.result_cache import ResultCache
+from ybi_strategy.backtest.writers import OUTPUT_FORMATS
 from ybi_strategy.config import load_config
+from ybi_strategy.data import MinuteBarStore
 from ybi_strategy.polygon.client import PolygonClient
+from ybi_strategy.profiling import Profiler
+from ybi_strategy.reporting.summary import ANALYSIS_LEVELS, analyze_results
 
 
-def main() -> int:
+def backtest_main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(prog="ybi_strategy", description="YBI strategy backtest (MVP).")
     parser.add_argument("--config", default="configs/strategy.yaml")
     parser.add_argument("--start", required=True, help="YYYY-MM-DD")
     parser.add_argument("--end", required=True, help="YYYY-MM-DD")
     parser.add_argument("--out", default="data/results", help="Output directory")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes simulating days in parallel (results identical to 1)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Reuse per-day checkpoints in --out from an earlier run with the same config",
+    )
+    parser.add_argument(
+        "--format", dest="output_format", choices=OUTPUT_FORMATS, default="csv",
+        help="Output file format; parquet writes typed columns (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--analysis", choices=ANALYSIS_LEVELS, default=None,
+        help="Summary statistics: none (metrics), core (+stratified/HAC/leakage), full (+resampling); "
+             "default from analysis.level in the config",
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="timers", choices=("timers", "cprofile"), default=None,
+        help="Write per-stage/per-day timings to <out>/profile.json; 'cprofile' also writes profile.pstats",
+    )
+    args = parser.parse_args(argv)
 
     config = load_config(Path(args.config))
-    client = PolygonClient.from_env()
-    engine = BacktestEngine(config=config, polygon=client, output_dir=Path(args.out))
-    engine.run(start_date=args.start, end_date=args.end)
+    client = PolygonClient.from_env(config)
+    engine = BacktestEngine(
+        config=config,
+        polygon=client,
+        output_dir=Path(args.out),
+        bar_store=MinuteBarStore.from_env(),
+        result_cache=ResultCache.from_env(),
+        profiler=Profiler(cprofile=args.profile == "cprofile") if args.profile else None,
+    )
+    engine.run(
+        start_date=args.start,
+        end_date=args.end,
+        workers=args.workers,
+        resume=args.resume,
+        output_format=args.output_format,
+        analysis=args.analysis,
+    )
     return 0
 
 
+def analyze_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ybi_strategy analyze",
+        description="Recompute summary statistics from a finished run's saved outputs.",
+    )
+    parser.add_argument("results_dir", help="Output directory of an earlier backtest (--out)")
+    parser.add_argument("--analysis", choices=ANALYSIS_LEVELS, default="full")
+    parser.add_argument(
+        "--config", default=None,
+        help="Config for analysis settings (default: the one recorded in run_metadata.json)",
+    )
+    args = parser.parse_args(argv)
+
+    config = load_config(Path(args.config)) if args.config else None
+    summary = analyze_results(Path(args.results_dir), level=args.analysis, config=config)
+    print(f"Wrote {Path(args.results_dir) / 'summary.json'} (analysis={args.analysis}, "
+          f"skipped={summary.get('analysis', {}).get('skipped', [])})")
+    return 0
+
+
+def cache_main(argv: list[str]) -> int:
+    from ybi_strategy.polygon.http_cache import HttpCache
+    from ybi_strategy.polygon.sqlite_cache import SqliteHttpCache, migrate_dir_cache
+
+    parser = argparse.ArgumentParser(prog="ybi_strategy cache", description="HTTP cache maintenance.")
+    sub = parser.add_subparsers(dest="action", required=True)
+    migrate = sub.add_parser("migrate", help="Copy a directory cache into a SQLite cache file.")
+    migrate.add_argument("src", help="Existing YBI_HTTP_CACHE_DIR directory")
+    migrate.add_argument("dst", help="SQLite cache file (YBI_HTTP_CACHE_DB)")
+    recompress = sub.add_parser(
+        "recompress", help="Rewrite a directory cache's entries with the current compression setting."
+    )
+    recompress.add_argument("dir", help="YBI_HTTP_CACHE_DIR directory")
+    recompress.add_argument("--compression", choices=["gzip", "zstd", "none"], default=None,
+                            help="Target codec (default: YBI_HTTP_CACHE_COMPRESSION or gzip)")
+    stats = sub.add_parser("stats", help="Show entry count and size of a SQLite cache file.")
+    stats.add_argument("db", help="SQLite cache file")
+    args = parser.parse_args(argv)
+
+    if args.action == "migrate":
+        cache = SqliteHttpCache.from_path(args.dst)
+        copied = migrate_dir_cache(args.src, cache)
+        print(f"Migrated {copied} entries from {args.src} to {args.dst}")
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.action == "recompress":
+        dir_cache = HttpCache.from_dir(args.dir, compression=args.compression)
+        rewritten = dir_cache.recompress()
+        print(f"Rewrote {rewritten} entries in {args.dir} as {dir_cache.compression}")
+    else:
+        print(json.dumps(SqliteHttpCache.from_path(args.db).stats(), indent=2))
+    return 0
+
+
+def result_cache_main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="ybi_strategy result-cache", description="Per-day result cache maintenance."
+    )
+    sub = parser.add_subparsers(dest="action", required=True)
+    stats = sub.add_parser("stats", help="Show entry/object counts of a result cache directory.")
+    stats.add_argument("dir", help="Result cache directory (YBI_RESULT_CACHE_DIR)")
+    prune = sub.add_parser("prune", help="Drop cached days and unreferenced result objects.")
+    prune.add_argument("dir", help="Result cache directory (YBI_RESULT_CACHE_DIR)")
+    prune.add_argument("--older-than-days", type=float, default=None, help="Only entries older than N days")
+    prune.add_argument("--config", default=None, help="Only entries for this simulation config hash")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache.from_dir(args.dir)
+    if args.action == "prune":
+        removed = cache.prune(older_than_days=args.older_than_days, sim_hash=args.config)
+        print(f"Removed {removed['entries']} entries and {removed['objects']} objects from {args.dir}")
+    print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "cache":
+        return cache_main(argv[1:])
+    if argv and argv[0] == "analyze":
+        return analyze_main(argv[1:])
+    if argv and argv[0] == "result-cache":
+        return result_cache_main(argv[1:])
+    return backtest_main(argv)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
-
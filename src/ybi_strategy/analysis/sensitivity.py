@@ -118,7 +118,9 @@ def run_sensitivity_analysis(
     # Import here to avoid circular imports
     from ybi_strategy.config import Config
     from ybi_strategy.polygon.client import PolygonClient
-    from ybi_strategy.backtest.engine import BacktestEngine
+    from ybi_strategy.backtest.batch import BacktestVariant, BatchBacktestEngine
+    from ybi_strategy.backtest.result_cache import ResultCache
+    from ybi_strategy.data import MinuteBarStore
 
     analysis = SensitivityAnalysis(
         parameter_name=".".join(param_path),
@@ -133,7 +135,11 @@ def run_sensitivity_analysis(
 
     # Initialize Polygon client once
     polygon = PolygonClient(api_key=polygon_api_key)
+    bar_store = MinuteBarStore.from_env()
+    # Variants that differ only in non-simulation settings reuse each other's days
+    result_cache = ResultCache.from_env()
 
+    variants: list[BacktestVariant] = []
     for value in test_values:
         # Create variant config
         variant_dict = copy.deepcopy(config_dict)
@@ -150,15 +156,20 @@ def run_sensitivity_analysis(
         value_str = str(value).replace(".", "_")
         output_dir = output_base_dir / f"{param_path[-1]}_{value_str}"
         output_dir.mkdir(parents=True, exist_ok=True)
+        variants.append(BacktestVariant(config=Config(raw=variant_dict), output_dir=output_dir))
+
+    # Run all variants together: each day is screened and fetched once per group of
+    # variants with the same screening config, then simulated per variant
+    batch = BatchBacktestEngine(
+        variants=variants,
+        polygon=polygon,
+        bar_store=bar_store,
+        result_cache=result_cache,
+    )
+    batch.run(start_date=start_date, end_date=end_date)
 
-        # Run backtest
-        config = Config(raw=variant_dict)
-        engine = BacktestEngine(
-            config=config,
-            polygon=polygon,
-            output_dir=output_dir,
-        )
-        engine.run(start_date=start_date, end_date=end_date)
+    for value, variant, engine in zip(test_values, variants, batch.engines):
+        output_dir = variant.output_dir
 
         # Load results
         summary_path = output_dir / "summary.json"
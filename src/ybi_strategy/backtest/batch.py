@@ -0,0 +1,171 @@
+"""Run several config variants over the same dates with one data pass.
+
+Variants are grouped by the config sections that decide what a day loads
+(screening, universe, calendar, premarket window). Each trading day is loaded
+once per group - watchlist, minute bars and PDH/PDL bars - and every variant in
+the group only runs the simulation stage on those inputs. A 20-point slippage
+sweep therefore costs one screening/fetch pass plus 20 simulations.
+
+Each variant writes the same outputs to its own directory as a standalone
+`BacktestEngine.run` would. Checkpoints/`--resume` and `--workers` are not
+used by batch runs.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ybi_strategy.backtest.engine import BacktestEngine, DayInputs
+from ybi_strategy.backtest.result_cache import ResultCache
+from ybi_strategy.calendar import is_market_holiday, is_weekend
+from ybi_strategy.config import Config
+from ybi_strategy.data import MinuteBarStore
+from ybi_strategy.reporting.summary import AnalysisSettings
+
+# Config sections that change which tickers/bars a day loads
+LOAD_SECTIONS = ("timezone", "calendar", "universe", "watchlist")
+# ...plus the premarket window used by the screener
+_LOAD_SESSION_KEYS = ("premarket_start", "premarket_end")
+# Keys inside load sections that only affect speed
+_NON_SEMANTIC_KEYS = {("watchlist", "fetch_concurrency")}
+
+
+def load_config_key(config: Config) -> str:
+    """sha256 over the config values that determine a day's loaded inputs."""
+    sections = {name: copy.deepcopy(config.raw.get(name)) for name in LOAD_SECTIONS}
+    for section, key in _NON_SEMANTIC_KEYS:
+        if isinstance(sections.get(section), dict):
+            sections[section].pop(key, None)
+    session = config.raw.get("session") or {}
+    sections["session"] = {k: session.get(k) for k in _LOAD_SESSION_KEYS}
+    payload = json.dumps(sections, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class BacktestVariant:
+    config: Config
+    output_dir: Path
+
+
+class BatchBacktestEngine:
+    def __init__(
+        self,
+        *,
+        variants: list[BacktestVariant],
+        polygon: Any,
+        bar_store: MinuteBarStore | None = None,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        if not variants:
+            raise ValueError("BatchBacktestEngine needs at least one variant")
+        self.engines = [
+            BacktestEngine(
+                config=v.config,
+                polygon=polygon,
+                output_dir=v.output_dir,
+                bar_store=bar_store,
+                result_cache=result_cache,
+            )
+            for v in variants
+        ]
+        # load key -> indices of variants sharing that day's inputs (first one loads)
+        self.groups: dict[str, list[int]] = {}
+        for i, v in enumerate(variants):
+            self.groups.setdefault(load_config_key(v.config), []).append(i)
+        # Trading days loaded ahead on background threads (from the first variant's config)
+        self.prefetch_days = max(0, self.engines[0].prefetch_days)
+        self.days_loaded = 0
+
+    def run(
+        self,
+        *,
+        start_date: str,
+        end_date: str,
+        output_format: str = "csv",
+        analysis: str | None = None,
+    ) -> None:
+        """
+        Run every variant over [start_date, end_date], writing each variant's
+        outputs to its own directory.
+
+        Args:
+            start_date: First calendar day (YYYY-MM-DD).
+            end_date: Last calendar day (YYYY-MM-DD).
+            output_format: "csv" or "parquet" (see `BacktestEngine.run`).
+            analysis: Summary statistics level for all variants ("none", "core",
+                "full"); default is each variant's `analysis.level`.
+        """
+        if analysis is not None:
+            for engine in self.engines:
+                engine.analysis = replace(
+                    AnalysisSettings.from_config(engine.config, level=analysis), seed=engine.MONTE_CARLO_SEED
+                )
+        outputs = [engine._open_run(start_date, end_date, output_format) for engine in self.engines]
+        with ExitStack() as stack:
+            for out in outputs:
+                stack.enter_context(out.writers)
+            for d, loads in self._iter_day_loads(outputs[0].dates):
+                for key, members in self.groups.items():
+                    for i in members:
+                        result = self.engines[i]._process_day(d, load=loads.get(key))
+                        self.engines[i]._record_day(outputs[i], result)
+        for engine, out in zip(self.engines, outputs):
+            engine._finish_run(out)
+
+    def _all_cached(self, members: list[int], d: date) -> bool:
+        """True if every variant in a group will answer `d` from the result cache."""
+        return all(
+            self.engines[i].result_cache is not None
+            and not self.engines[i].verify_cached_inputs
+            and self.engines[i]._cached_day(d) is not None
+            for i in members
+        )
+
+    def _submit_loads(self, pool: ThreadPoolExecutor, d: date) -> dict[str, Future[DayInputs]]:
+        futures = {}
+        for key, members in self.groups.items():
+            if not self._all_cached(members, d):
+                futures[key] = pool.submit(self.engines[members[0]]._load_day, d)
+                self.days_loaded += 1
+        return futures
+
+    def _iter_day_loads(
+        self, dates: list[date]
+    ) -> Iterator[tuple[date, dict[str, Callable[[], DayInputs]]]]:
+        """
+        Yield each date with one input loader per group (empty for weekends and
+        holidays). Loads for the next `prefetch_days` trading days run on
+        background threads; at most prefetch_days + 1 days are held at once.
+        """
+        trading = [d for d in dates if not is_weekend(d) and not is_market_holiday(d)]
+        upcoming = iter(trading)
+        pending: deque[tuple[date, dict[str, Future[DayInputs]]]] = deque()
+        workers = (self.prefetch_days + 1) * len(self.groups)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ybi-batch") as pool:
+            try:
+                for d in dates:
+                    if is_weekend(d) or is_market_holiday(d):
+                        yield d, {}
+                        continue
+                    while len(pending) < self.prefetch_days + 1:
+                        nxt = next(upcoming, None)
+                        if nxt is None:
+                            break
+                        pending.append((nxt, self._submit_loads(pool, nxt)))
+                    day, futures = pending.popleft()
+                    assert day == d, "loads are queued in date order"
+                    yield d, {key: fut.result for key, fut in futures.items()}
+            finally:
+                for _, futures in pending:
+                    for fut in futures.values():
+                        fut.cancel()
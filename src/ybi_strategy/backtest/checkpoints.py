@@ -0,0 +1,71 @@
+"""Per-day result checkpoints for resumable backtests.
+
+Each completed trading day is written as
+`<output_dir>/checkpoints/<config_hash>/<YYYY-MM-DD>.json` as soon as it is
+simulated, so an interrupted run loses at most the day in progress and a rerun
+with `--resume` (or a later end date) only computes missing days.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class DayCheckpoints:
+    root: Path
+    config_hash: str
+
+    @staticmethod
+    def for_run(output_dir: Path, config_hash: str) -> "DayCheckpoints":
+        """Checkpoints for one config under `output_dir` (short hash keeps paths readable)."""
+        short = config_hash.split(":")[-1][:16]
+        return DayCheckpoints(root=output_dir / "checkpoints" / short, config_hash=config_hash)
+
+    def path(self, d: date) -> Path:
+        return self.root / f"{d.isoformat()}.json"
+
+    def exists(self, d: date) -> bool:
+        """Whether a checkpoint file exists for `d` (not validated)."""
+        return self.path(d).is_file()
+
+    def load(self, d: date) -> dict[str, Any] | None:
+        """
+        Return the stored day payload, or None if missing, unreadable, truncated
+        or from another config.
+        """
+        try:
+            data = json.loads(self.path(d).read_text(encoding="utf-8"))
+            if data.get("config_hash") != self.config_hash or data.get("date") != d.isoformat():
+                return None
+            result = data["result"]
+        except (FileNotFoundError, ValueError, KeyError, AttributeError):
+            return None
+        return result if isinstance(result, dict) else None
+
+    def save(self, d: date, result: dict[str, Any]) -> None:
+        """Atomically write one day's payload."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path(d)
+        body = json.dumps({"date": d.isoformat(), "config_hash": self.config_hash, "result": result})
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{d.isoformat()}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def completed(self) -> list[date]:
+        """Dates with a checkpoint on disk (not validated)."""
+        return sorted(date.fromisoformat(p.stem) for p in self.root.glob("????-??-??.json"))
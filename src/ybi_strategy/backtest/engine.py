@@ -1,52 +1,149 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 from datetime import date, datetime, timedelta
+import cProfile
 import hashlib
 import json
 import os
+import pickle
 import platform
 import subprocess
 import sys
+import time
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 import numpy as np
 import pandas as pd
 from zoneinfo import ZoneInfo
 
 from ybi_strategy.config import Config
+from ybi_strategy.data.bar_store import DayBarContext, MinuteBarStore, array_to_frame, bars_to_array, load_minute_array
 from ybi_strategy.features.indicators import compute_session_indicators, compute_trend_indicators
-from ybi_strategy.polygon.client import PolygonClient
+from ybi_strategy.features.kernels import trend_indicator_arrays
+from ybi_strategy.features.panel import BarPanel, session_vwap, window_stats
+from ybi_strategy.features.registry import FeaturePlan
+from ybi_strategy.polygon.client import PolygonClient, merge_stats
+from ybi_strategy.profiling import CPROFILE_FILE, Profiler
+from ybi_strategy.backtest.checkpoints import DayCheckpoints
 from ybi_strategy.backtest.fills import FillModel
 from ybi_strategy.backtest.portfolio import simulate_portfolio_day
+from ybi_strategy.backtest.result_cache import CachedDay, ResultCache, simulation_config_hash
+from ybi_strategy.backtest.writers import DayOutputWriters, output_path, read_output_frame, write_output_frame
 from ybi_strategy.strategy.ybi_small_caps import simulate_ybi_small_caps, DayRiskState
 from ybi_strategy.timeutils import SessionTimes, parse_hhmm
+from ybi_strategy.universe.reference import ReferenceUniverse
 from ybi_strategy.universe.watchlist import (
     build_watchlist_open_gap,
     build_watchlist_premarket_gappers,
     WatchlistItem,
     PremarketWatchlistItem,
 )
-from ybi_strategy.calendar import is_market_holiday, is_weekend
-from ybi_strategy.reporting.metrics import compute_metrics, compute_daily_metrics
-from ybi_strategy.reporting.analysis import (
-    stratified_analysis,
-    monte_carlo_simulation,
-    walk_forward_validation,
-    block_bootstrap_test,
-    time_shift_negative_control,
-    shuffle_dates_negative_control,
-    leakage_audit,
-    daily_series_inference,
+from ybi_strategy.calendar import is_market_holiday, is_weekend, market_close_time, prev_trading_day
+from ybi_strategy.reporting.metrics import compute_daily_metrics
+from ybi_strategy.reporting.summary import (
+    SUMMARY_WATCHLIST_COLUMNS,
+    AnalysisSettings,
+    eligible_trading_days,
+    summarize_trades,
 )
 
 
+@dataclass
+class DayResult:
+    """Outputs of one calendar day: its day_audit row plus fills/trades/watchlist rows."""
+    audit: dict[str, Any]
+    fills: list[dict[str, Any]] = field(default_factory=list)
+    trades: list[dict[str, Any]] = field(default_factory=list)
+    watchlist: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class RunOutputs:
+    """Open outputs of one run: metadata, streaming writers and the day_audit rows so far."""
+    run_metadata: dict[str, Any]
+    metadata_path: Path
+    dates: list[date]
+    output_format: str
+    tz: str
+    writers: DayOutputWriters
+    day_audit: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class DayInputs:
+    """Everything `_simulate_day` needs from the API for one trading day."""
+    watchlist_rows: list[dict[str, Any]]
+    # ticker -> (minute-bar array, previous day's daily bar or None), in watchlist order
+    bars: dict[str, tuple[np.ndarray, dict[str, Any] | None]] = field(default_factory=dict)
+    # Indicator frames per BacktestEngine.prepare_key, shared by engines simulating these inputs
+    prepared: dict[str, dict[str, pd.DataFrame]] = field(default_factory=dict, repr=False)
+
+    def fingerprint(self) -> str:
+        """sha256 over the watchlist rows, raw bar arrays and PDH/PDL bars."""
+        h = hashlib.sha256(json.dumps(self.watchlist_rows, sort_keys=True, default=str).encode("utf-8"))
+        for ticker, (arr, prev_daily) in self.bars.items():
+            h.update(ticker.encode("utf-8"))
+            h.update(np.ascontiguousarray(arr).tobytes())
+            h.update(json.dumps(prev_daily, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+
+# Per-process engine used by `_process_day_in_worker` (set by the pool initializer)
+_WORKER_ENGINE: "BacktestEngine | None" = None
+
+
+def _init_day_worker(engine_state: bytes) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = pickle.loads(engine_state)
+
+
+def _process_day_in_worker(
+    d: date,
+) -> tuple[int, DayResult, dict[str, Any] | None, dict[str, Any]]:
+    engine = _WORKER_ENGINE
+    assert engine is not None, "worker not initialized"
+    result = engine._process_day(d)
+    # Cumulative per-process API usage; the parent keeps the latest per pid and merges
+    stats = getattr(engine.polygon, "stats", None)
+    # Stage timings for this day only; the parent adds them to its profiler
+    return os.getpid(), result, stats() if callable(stats) else None, engine.profiler.drain()
+
+
 class BacktestEngine:
-    def __init__(self, *, config: Config, polygon: PolygonClient, output_dir: Path) -> None:
+    def __init__(
+        self,
+        *,
+        config: Config,
+        polygon: PolygonClient,
+        output_dir: Path,
+        bar_store: MinuteBarStore | None = None,
+        result_cache: ResultCache | None = None,
+        profiler: Profiler | None = None,
+    ) -> None:
         self.config = config
         self.polygon = polygon
         self.output_dir = output_dir
+        self.bar_store = bar_store
+        # Optional cache of per-day outputs keyed by simulation config + input fingerprint
+        self.result_cache = result_cache
+        # Stage timers/counters written to profile.json when enabled (no-ops otherwise)
+        self.profiler = profiler if profiler is not None else Profiler.disabled()
+        self.sim_config_hash = simulation_config_hash(config)
+        # True: re-load each cached day's inputs and only reuse the result if they are unchanged
+        self.verify_cached_inputs = bool(config.get("result_cache", "verify_inputs", default=False))
+        # Optional point-in-time reference universe (replaces per-ticker details lookups)
+        self.reference_universe = ReferenceUniverse.from_config(config)
+        # Previous sessions come from the market calendar; optionally confirmed via grouped_daily
+        self.verify_calendar_with_api = bool(config.get("calendar", "verify_with_api", default=False))
+        # Trading days whose API data is loaded on background threads ahead of simulation
+        self.prefetch_days = int(config.get("engine", "prefetch_days", default=0))
+        # Compute all tickers' indicators as one (ticker x bar) panel per day (same frames)
+        self.panel_indicators = bool(config.get("engine", "panel_indicators", default=False))
 
         tz_name = str(config.get("timezone", default="America/New_York"))
         self.session = SessionTimes(
@@ -57,6 +154,16 @@ class BacktestEngine:
         )
         self.premarket_start = parse_hhmm(str(config.get("session", "premarket_start", default="04:00")))
         self.premarket_end = parse_hhmm(str(config.get("session", "premarket_end", default="09:29")))
+        # Indicator columns the strategy config reads (others are skipped)
+        self.feature_plan = FeaturePlan.from_config(config)
+        # Identifies the indicator frames built from a day's inputs (see _prepare_bars)
+        self.prepare_key = hashlib.sha256(json.dumps(
+            {
+                **{k: config.raw.get(k) for k in ("timezone", "session", "features")},
+                "columns": self.feature_plan.columns,
+            },
+            sort_keys=True, default=str,
+        ).encode("utf-8")).hexdigest()
 
         slip_model = str(config.get("execution", "slippage", "model", default="fixed_cents"))
         cents = float(config.get("execution", "slippage", "cents", default=0.02))
@@ -90,9 +197,17 @@ class BacktestEngine:
         self.risk_per_trade_pct = float(config.get("portfolio", "risk_per_trade_pct", default=0.01))
         self.use_portfolio_mode = bool(config.get("portfolio", "enabled", default=True))
 
+        # Which summary statistics run (and their simulation counts)
+        self.analysis = replace(AnalysisSettings.from_config(config), seed=self.MONTE_CARLO_SEED)
+
     # Monte Carlo seed for reproducibility
     MONTE_CARLO_SEED = 42
 
+    def _config_hash(self) -> str:
+        """sha256 of the full config (sorted JSON); keys run metadata and day checkpoints."""
+        config_str = json.dumps(self.config.raw, sort_keys=True)
+        return f"sha256:{hashlib.sha256(config_str.encode()).hexdigest()}"
+
     def _generate_run_metadata(self, start_date: str, end_date: str) -> dict[str, Any]:
         """Generate run metadata for reproducibility."""
         # Get git commit hash if available
@@ -105,8 +220,7 @@ class BacktestEngine:
             git_commit = "unknown"
 
         # Get full config hash (not truncated)
-        config_str = json.dumps(self.config.raw, sort_keys=True)
-        config_hash = hashlib.sha256(config_str.encode()).hexdigest()
+        config_hash = self._config_hash()
 
         run_id = str(uuid.uuid4())
 
@@ -117,7 +231,7 @@ class BacktestEngine:
             "start_date": start_date,
             "end_date": end_date,
             "timezone": str(self.config.get("timezone", default="America/New_York")),
-            "config_hash": f"sha256:{config_hash}",
+            "config_hash": config_hash,
             "config_content": self.config.raw,  # Full config for reproducibility
             "git_commit": git_commit,
             "python_version": platform.python_version(),
@@ -141,94 +255,104 @@ class BacktestEngine:
             "monte_carlo_seed": self.MONTE_CARLO_SEED,
         }
 
-    def run(self, *, start_date: str, end_date: str) -> None:
+    def run(
+        self,
+        *,
+        start_date: str,
+        end_date: str,
+        workers: int = 1,
+        resume: bool = False,
+        output_format: str = "csv",
+        analysis: str | None = None,
+    ) -> None:
+        """
+        Run the backtest over [start_date, end_date] and write all outputs.
+
+        Args:
+            start_date: First calendar day (YYYY-MM-DD).
+            end_date: Last calendar day (YYYY-MM-DD).
+            workers: Number of processes simulating days in parallel. Days are
+                independent, and results are gathered in date order, so outputs
+                are identical to a serial run (workers=1).
+            resume: Reuse per-day checkpoints written by an earlier run with the
+                same config; only missing days are simulated. Checkpoints are
+                always written as days complete.
+            output_format: "csv" or "parquet" (typed columns; requires pyarrow)
+                for trades, fills, watchlist, day_audit and daily_metrics.
+            analysis: Summary statistics level ("none", "core", "full");
+                overrides `analysis.level` from the config.
+        """
+        if analysis is not None:
+            self.analysis = replace(
+                AnalysisSettings.from_config(self.config, level=analysis), seed=self.MONTE_CARLO_SEED
+            )
+        started = time.perf_counter()
+        cprofile = cProfile.Profile() if self.profiler.cprofile else None
+        if cprofile is not None:
+            cprofile.enable()
+
+        outputs = self._open_run(start_date, end_date, output_format)
+        checkpoints = DayCheckpoints.for_run(self.output_dir, outputs.run_metadata["config_hash"])
+        day_results = self._iter_checkpointed(outputs.dates, checkpoints, workers=workers, resume=resume)
+        with outputs.writers:
+            for result in day_results:
+                self._record_day(outputs, result)
+        self._finish_run(outputs)
+
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(str(self.output_dir / CPROFILE_FILE))
+        if self.profiler.enabled:
+            # Stage/day breakdown next to summary.json; API counters come from the client stats
+            self.profiler.write(
+                self.output_dir / "profile.json",
+                elapsed_seconds=time.perf_counter() - started,
+                extra={"api_usage": outputs.run_metadata.get("api_usage")},
+            )
+
+    def _open_run(self, start_date: str, end_date: str, output_format: str) -> RunOutputs:
+        """Write run metadata and open the streaming output writers."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._worker_usage: dict[int, dict[str, Any]] = {}
+        self.resumed_days = 0
 
         # Generate and save run metadata first (for provenance)
         run_metadata = self._generate_run_metadata(start_date, end_date)
         metadata_path = self.output_dir / "run_metadata.json"
         metadata_path.write_text(json.dumps(run_metadata, indent=2), encoding="utf-8")
 
-        days = pd.date_range(start=start_date, end=end_date, freq="D", tz=str(self.config.get("timezone")))
-        all_trades: list[dict[str, Any]] = []
-        all_fills: list[dict[str, Any]] = []
-        all_watchlist: list[dict[str, Any]] = []
-        day_audit: list[dict[str, Any]] = []  # Track day-by-day status
-
-        for day_ts in days:
-            d = day_ts.date()
-
-            # Skip weekends
-            if is_weekend(d):
-                day_audit.append({
-                    "date": d.isoformat(),
-                    "status": "weekend",
-                    "reason": "Saturday" if d.weekday() == 5 else "Sunday",
-                    "watchlist_count": 0,
-                    "trades": 0,
-                })
-                continue
-
-            # CRITICAL FIX: Skip market holidays (must be excluded from daily series)
-            if is_market_holiday(d):
-                day_audit.append({
-                    "date": d.isoformat(),
-                    "status": "holiday_closed",
-                    "reason": "US market holiday - market closed",
-                    "watchlist_count": 0,
-                    "trades": 0,
-                })
-                continue
+        tz = str(self.config.get("timezone"))
+        days = pd.date_range(start=start_date, end=end_date, freq="D", tz=tz)
+        return RunOutputs(
+            run_metadata=run_metadata,
+            metadata_path=metadata_path,
+            dates=[day_ts.date() for day_ts in days],
+            output_format=output_format,
+            tz=tz,
+            # Trades, fills and watchlist rows are flushed to disk day by day
+            writers=DayOutputWriters(self.output_dir, output_format, tz=tz),
+        )
 
-            # Run the day and capture results
-            try:
-                fills, trades, watchlist_rows = self._run_day(d)
-
-                # Determine status based on results
-                if not watchlist_rows:
-                    status = "no_watchlist"
-                    reason = "No stocks met watchlist criteria"
-                elif not trades:
-                    status = "no_trades"
-                    reason = "Watchlist found but no trades generated"
-                else:
-                    status = "ok"
-                    reason = ""
-
-                day_audit.append({
-                    "date": d.isoformat(),
-                    "status": status,
-                    "reason": reason,
-                    "watchlist_count": len(watchlist_rows),
-                    "trades": len(trades),
-                })
-
-                all_trades.extend(trades)
-                all_fills.extend(fills)
-                all_watchlist.extend(watchlist_rows)
-
-            except Exception as e:
-                # Capture any API errors or data issues
-                day_audit.append({
-                    "date": d.isoformat(),
-                    "status": "error",
-                    "reason": str(e)[:200],  # Truncate long error messages
-                    "watchlist_count": 0,
-                    "trades": 0,
-                })
-
-        out_path = self.output_dir / "trades.csv"
-        trades_df = pd.DataFrame(all_trades)
-        trades_df.to_csv(out_path, index=False)
-        fills_path = self.output_dir / "fills.csv"
-        pd.DataFrame(all_fills).to_csv(fills_path, index=False)
-        watchlist_path = self.output_dir / "watchlist.csv"
-        watchlist_df = pd.DataFrame(all_watchlist)
-        watchlist_df.to_csv(watchlist_path, index=False)
+    def _record_day(self, outputs: RunOutputs, result: DayResult) -> None:
+        outputs.day_audit.append(result.audit)  # Track day-by-day status
+        with self.profiler.stage("write"):
+            outputs.writers.write_day(trades=result.trades, fills=result.fills, watchlist=result.watchlist)
+
+    def _finish_run(self, outputs: RunOutputs) -> None:
+        """Write day_audit, summary.json and daily_metrics once all days are recorded."""
+        output_format, tz, day_audit = outputs.output_format, outputs.tz, outputs.day_audit
+        run_metadata = outputs.run_metadata
+
+        # Read back only what the summary needs
+        with self.profiler.stage("read_outputs"):
+            trades_df = read_output_frame(output_path(self.output_dir, "trades", output_format))
+            watchlist_df = read_output_frame(
+                output_path(self.output_dir, "watchlist", output_format), columns=SUMMARY_WATCHLIST_COLUMNS
+            )
 
         # Save day audit for data completeness tracking
-        day_audit_path = self.output_dir / "day_audit.csv"
-        pd.DataFrame(day_audit).to_csv(day_audit_path, index=False)
+        day_audit_path = output_path(self.output_dir, "day_audit", output_format)
+        write_output_frame(pd.DataFrame(day_audit), day_audit_path, tz=tz)
 
         # Compute day audit summary
         audit_df = pd.DataFrame(day_audit)
@@ -241,20 +365,14 @@ class BacktestEngine:
         days_with_trades = ok_days
         days_with_errors = len(audit_df[audit_df["status"] == "error"])
 
-        # CRITICAL: Extract ELIGIBLE trading days (exclude error days AND holidays)
-        # Error days are MISSING DATA, not "flat performance" - they must be excluded
-        # from the daily P&L series to avoid biasing Sharpe/significance statistics.
-        # Holidays (market closed) must also be excluded - no trading could occur.
-        # Valid statuses for inclusion: ok, no_trades, no_watchlist
-        eligible_statuses = ["ok", "no_trades", "no_watchlist"]
-        eligible_trading_days = audit_df[audit_df["status"].isin(eligible_statuses)]["date"].tolist()
-
-        # all_trading_days is now only eligible days (error days and holidays excluded)
-        all_trading_days = eligible_trading_days
+        # CRITICAL: Only ELIGIBLE trading days (ok, no_trades, no_watchlist) enter the
+        # daily P&L series; error days (missing data) and holidays are excluded
+        all_trading_days = eligible_trading_days(audit_df)
 
         # Compute comprehensive metrics
         summary_path = self.output_dir / "summary.json"
-        summary = self._summarize(trades_df, watchlist_df, all_trading_days=all_trading_days)
+        with self.profiler.stage("summarize"):
+            summary = self._summarize(trades_df, watchlist_df, all_trading_days=all_trading_days)
 
         # Compute eligible trading days (excluding errors and holidays)
         days_no_trades = len(audit_df[audit_df["status"] == "no_trades"])
@@ -281,10 +399,24 @@ class BacktestEngine:
         summary_path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
 
         # Compute daily metrics (including 0-trade days)
-        daily_metrics = compute_daily_metrics(trades_df, all_trading_days=all_trading_days)
+        with self.profiler.stage("daily_metrics"):
+            daily_metrics = compute_daily_metrics(trades_df, all_trading_days=all_trading_days)
         if not daily_metrics.empty:
-            daily_path = self.output_dir / "daily_metrics.csv"
-            daily_metrics.to_csv(daily_path, index=False)
+            daily_path = output_path(self.output_dir, "daily_metrics", output_format)
+            write_output_frame(daily_metrics, daily_path, tz=tz)
+
+        # Record days restored from checkpoints and API usage (requests, fetch vs.
+        # rate-limit throttle time) for this run
+        run_metadata["resumed_days"] = self.resumed_days
+        run_metadata["output_format"] = output_format
+        run_metadata["analysis_level"] = self.analysis.level
+        run_metadata["features"] = self.feature_plan.to_dict()
+        if callable(getattr(self.polygon, "stats", None)):
+            usage = self.polygon.stats()
+            if self._worker_usage:
+                usage = merge_stats([usage, *self._worker_usage.values()])
+            run_metadata["api_usage"] = usage
+        outputs.metadata_path.write_text(json.dumps(run_metadata, indent=2), encoding="utf-8")
 
     def _summarize(
         self,
@@ -292,245 +424,452 @@ class BacktestEngine:
         watchlist_df: pd.DataFrame | None = None,
         all_trading_days: list[str] | None = None,
     ) -> dict[str, Any]:
-        if trades_df.empty:
-            return {"trades": 0}
-
-        # Compute comprehensive metrics with all trading days for proper Sharpe/Sortino
-        metrics = compute_metrics(
+        return summarize_trades(
             trades_df,
+            settings=self.analysis,
             account_equity=self.account_equity,
-            all_trading_days=all_trading_days,
-        )
-
-        # Compute stratified analysis
-        strat_analysis = stratified_analysis(
-            trades_df,
             watchlist_df=watchlist_df,
-            account_equity=self.account_equity,
-        )
-
-        # Run Monte Carlo simulation
-        mc_result = monte_carlo_simulation(
-            trades_df,
-            n_simulations=10000,
-            account_equity=self.account_equity,
-            random_seed=self.MONTE_CARLO_SEED,
+            all_trading_days=all_trading_days,
         )
 
-        # Run walk-forward validation
-        wf_result = walk_forward_validation(
-            trades_df,
-            n_folds=5,
-            train_pct=0.7,
-            account_equity=self.account_equity,
-        )
+    def _process_day(self, d: date, load: Callable[[], DayInputs] | None = None) -> DayResult:
+        """
+        Classify one calendar day and, for trading days, simulate it.
 
-        # Run bootstrap hypothesis test on daily P&L
-        # NOTE: This is an INFERENCE method testing H0: E[daily P&L] = 0,
-        # NOT a leakage-detecting negative control.
-        # Pass all_trading_days for consistency with compute_metrics()
-        bootstrap_result = block_bootstrap_test(
-            trades_df,
-            n_bootstrap=10000,
-            random_seed=self.MONTE_CARLO_SEED,
-            all_trading_days=all_trading_days,  # Include 0-trade days for consistency
+        `load` supplies the day's inputs (e.g. a prefetch future's result); by
+        default they are loaded inline. Load errors are recorded like any other.
+        """
+        # Skip weekends
+        if is_weekend(d):
+            return DayResult(audit={
+                "date": d.isoformat(),
+                "status": "weekend",
+                "reason": "Saturday" if d.weekday() == 5 else "Sunday",
+                "watchlist_count": 0,
+                "trades": 0,
+            })
+
+        # CRITICAL FIX: Skip market holidays (must be excluded from daily series)
+        if is_market_holiday(d):
+            return DayResult(audit={
+                "date": d.isoformat(),
+                "status": "holiday_closed",
+                "reason": "US market holiday - market closed",
+                "watchlist_count": 0,
+                "trades": 0,
+            })
+
+        # Reuse a cached result without touching the API (unless inputs must be verified)
+        cached = self._cached_day(d)
+        if cached is not None and not self.verify_cached_inputs:
+            self.profiler.count("result_cache_hits", day=d)
+            return DayResult(**cached.result)
+
+        # Run the day and capture results
+        try:
+            # With prefetching this is the time spent waiting on the background load
+            with self.profiler.stage("load", d):
+                inputs = load() if load is not None else self._load_day(d)
+            fingerprint = inputs.fingerprint() if self.result_cache is not None else ""
+            if cached is not None and cached.input_fingerprint == fingerprint:
+                self.profiler.count("result_cache_hits", day=d)
+                return DayResult(**cached.result)
+            self.profiler.count("days_simulated", day=d)
+            fills, trades, watchlist_rows = self._simulate_day(d, inputs)
+        except Exception as e:
+            # Capture any API errors or data issues
+            return DayResult(audit={
+                "date": d.isoformat(),
+                "status": "error",
+                "reason": str(e)[:200],  # Truncate long error messages
+                "watchlist_count": 0,
+                "trades": 0,
+            })
+
+        # Determine status based on results
+        if not watchlist_rows:
+            status = "no_watchlist"
+            reason = "No stocks met watchlist criteria"
+        elif not trades:
+            status = "no_trades"
+            reason = "Watchlist found but no trades generated"
+        else:
+            status = "ok"
+            reason = ""
+
+        result = DayResult(
+            audit={
+                "date": d.isoformat(),
+                "status": status,
+                "reason": reason,
+                "watchlist_count": len(watchlist_rows),
+                "trades": len(trades),
+            },
+            fills=fills,
+            trades=trades,
+            watchlist=watchlist_rows,
         )
+        if self.result_cache is not None:
+            self.result_cache.put(self.sim_config_hash, d, fingerprint, asdict(result))
+        return result
+
+    def _cached_day(self, d: date) -> CachedDay | None:
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(self.sim_config_hash, d)
+
+    def _iter_checkpointed(
+        self, dates: list[date], checkpoints: DayCheckpoints, *, workers: int = 1, resume: bool = False
+    ) -> Iterator[DayResult]:
+        """
+        `_iter_day_results` with per-day checkpoints.
+
+        Each simulated trading day is checkpointed as soon as it is yielded.
+        With `resume`, checkpointed days are read back (one at a time, as they
+        are yielded) instead of recomputed; a checkpoint that cannot be read
+        back is treated as missing and its day is recomputed. Weekends,
+        holidays and error days are never checkpointed (errors are retried on
+        resume).
+        """
+        checkpointed = {d for d in dates if resume and checkpoints.exists(d)}
+        self.resumed_days = 0
+
+        computed = self._iter_day_results([d for d in dates if d not in checkpointed], workers=workers)
+        for d in dates:
+            if d in checkpointed:
+                restored = self._load_checkpoint(checkpoints, d)
+                if restored is not None:
+                    self.resumed_days += 1
+                    yield restored
+                    continue
+                result = self._process_day(d)
+            else:
+                result = next(computed)
+            if result.audit["status"] not in ("weekend", "holiday_closed", "error"):
+                checkpoints.save(d, asdict(result))
+            yield result
+
+    @staticmethod
+    def _load_checkpoint(checkpoints: DayCheckpoints, d: date) -> DayResult | None:
+        """Checkpointed result for `d`, or None if missing or not a valid `DayResult` payload."""
+        payload = checkpoints.load(d)
+        if payload is None:
+            return None
+        try:
+            return DayResult(**payload)
+        except TypeError:
+            return None
 
-        # Run heuristic stress tests (perturb realized P&L)
-        # IMPORTANT: These are NOT true negative controls for leakage detection.
-        # They operate on already-realized P&L values, not resimulated backtests.
-        # They can detect some anomalies but CANNOT reliably detect lookahead bias.
-        time_shift_result = time_shift_negative_control(
-            trades_df,
-            shift_minutes=5,
-            n_simulations=1000,
-            random_seed=self.MONTE_CARLO_SEED,
-        )
-        shuffle_result = shuffle_dates_negative_control(
-            trades_df,
-            n_simulations=1000,
-            random_seed=self.MONTE_CARLO_SEED,
-        )
+    def _iter_day_results(self, dates: list[date], *, workers: int = 1) -> Iterator[DayResult]:
+        """
+        Yield `_process_day` results in date order, serially or from a process pool.
 
-        # Run leakage audit - verifies signal_ts < entry_ts for all trades
-        leakage_result = leakage_audit(trades_df)
+        Only trading days are sent to workers; each worker unpickles its own copy
+        of the engine (fresh HTTP sessions and cache connections).
+        """
+        trading = [d for d in dates if not is_weekend(d) and not is_market_holiday(d)]
+        if workers <= 1 or len(trading) <= 1:
+            if self.prefetch_days > 0 and len(trading) > 1:
+                yield from self._iter_prefetched(dates, trading)
+            else:
+                yield from (self._process_day(d) for d in dates)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(trading)),
+            initializer=_init_day_worker,
+            initargs=(pickle.dumps(self),),
+        ) as pool:
+            simulated = pool.map(_process_day_in_worker, trading)
+            trading_set = set(trading)
+            for d in dates:
+                if d not in trading_set:
+                    yield self._process_day(d)
+                    continue
+                pid, result, usage, profile = next(simulated)
+                if usage is not None:
+                    self._worker_usage[pid] = usage
+                self.profiler.merge(profile)
+                yield result
+
+    def _iter_prefetched(self, dates: list[date], trading: list[date]) -> Iterator[DayResult]:
+        """
+        Serial simulation with the next `prefetch_days` trading days loading on
+        background threads. At most prefetch_days + 1 days of inputs are held at
+        once, so memory stays flat over long ranges.
+        """
+        # Days answered from the result cache need no inputs, so are not prefetched
+        cache_hits: set[date] = set()
+        if self.result_cache is not None and not self.verify_cached_inputs:
+            cache_hits = {d for d in trading if self._cached_day(d) is not None}
+        upcoming = iter([d for d in trading if d not in cache_hits])
+        pending: deque[Future[DayInputs]] = deque()
+        with ThreadPoolExecutor(max_workers=self.prefetch_days, thread_name_prefix="ybi-prefetch") as pool:
+            try:
+                for d in dates:
+                    if is_weekend(d) or is_market_holiday(d) or d in cache_hits:
+                        yield self._process_day(d)
+                        continue
+                    while len(pending) < self.prefetch_days + 1:
+                        nxt = next(upcoming, None)
+                        if nxt is None:
+                            break
+                        pending.append(pool.submit(self._load_day, nxt))
+                    yield self._process_day(d, load=pending.popleft().result)
+            finally:
+                for fut in pending:
+                    fut.cancel()
 
-        # Run daily series inference with HAC (Newey-West) standard errors
-        # This is the PRIMARY inference method that accounts for autocorrelation
-        hac_inference_result = daily_series_inference(
-            trades_df,
-            all_trading_days=all_trading_days,
-        )
+    def _run_day(self, d: date) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        return self._simulate_day(d, self._load_day(d))
 
-        return {
-            "metrics": metrics.to_dict(),
-            "stratified_analysis": strat_analysis.to_dict(),
-            "monte_carlo": mc_result.to_dict(),
-            "walk_forward": wf_result.to_dict(),
-            # Statistical inference (hypothesis tests)
-            "statistical_inference": {
-                "daily_series_hac": {
-                    "description": "PRIMARY inference method using HAC (Newey-West) standard errors to account for autocorrelation in daily returns.",
-                    **hac_inference_result.to_dict(),
-                },
-                "bootstrap_mean_test": {
-                    "description": "Day-level block bootstrap testing H0: E[daily P&L] = 0. This is a HYPOTHESIS TEST for edge detection, not a leakage control.",
-                    "note": "observed_mean_daily_pnl should match metrics.mean_daily_pnl (same day set)",
-                    **bootstrap_result.to_dict(),
-                },
-            },
-            # Leakage audit - MUST pass for valid backtest
-            "leakage_audit": {
-                "description": "Verifies signal_ts < entry_ts for all trades. ANY violations indicate potential lookahead bias.",
-                **leakage_result.to_dict(),
-            },
-            # Heuristic stress tests (NOT true negative controls)
-            "stress_tests": {
-                "description": "Heuristic tests that perturb realized P&L values. LIMITATION: These do NOT resimulate the backtest with modified entries, so they CANNOT reliably detect lookahead bias. They are useful for sanity checks but are not rigorous leakage controls.",
-                "time_shift_5min": time_shift_result.to_dict(),
-                "shuffle_dates": shuffle_result.to_dict(),
-            },
-        }
+    def _load_day(self, d: date) -> DayInputs:
+        """
+        Network-bound half of a day: screening, minute bars and PDH/PDL daily bars.
 
-    def _run_day(self, d: date) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        Safe to run on a background thread while another day is simulated.
+        """
         # Get watchlist method from config (default: open_gap for backwards compatibility)
         wl_method = str(self.config.get("watchlist", "method", default="open_gap"))
 
         wl: list[WatchlistItem] | list[PremarketWatchlistItem]
         watchlist_rows: list[dict[str, Any]] = []
-
-        if wl_method == "premarket_gap":
-            # Premarket gappers screener (04:00-09:29 behavior)
-            # Candidates prioritized by prev day volume, then filtered by premarket metrics
-            wl = build_watchlist_premarket_gappers(
-                polygon=self.polygon,
-                day=d,
-                top_n=int(self.config.get("watchlist", "top_n", default=20)),
-                min_premarket_pct=float(self.config.get("watchlist", "min_premarket_pct", default=0.05)),
-                min_prev_close=float(self.config.get("watchlist", "min_prev_close", default=0.5)),
-                max_prev_close=float(self.config.get("watchlist", "max_prev_close", default=20.0)),
-                min_premarket_volume=int(self.config.get("watchlist", "min_premarket_volume", default=50000)),
-                min_premarket_dollar_volume=float(self.config.get("watchlist", "min_premarket_dollar_volume", default=100000.0)),
-                premarket_start=str(self.config.get("session", "premarket_start", default="04:00")),
-                premarket_end=str(self.config.get("session", "premarket_end", default="09:29")),
-                max_candidates_to_scan=int(self.config.get("watchlist", "max_candidates_to_scan", default=200)),
-            )
-            watchlist_rows = [
-                {
-                    "date": d.isoformat(),
-                    "ticker": i.ticker,
-                    "prev_close": i.prev_close,
-                    "premarket_pct": i.premarket_pct,
-                    "premarket_last": i.premarket_last,
-                    "premarket_high": i.premarket_high,
-                    "premarket_volume": i.premarket_volume,
-                    "premarket_dollar_volume": i.premarket_dollar_volume,
-                    "premarket_vwap": i.premarket_vwap,
-                }
-                for i in wl
-            ]
-        else:
-            # Legacy open-gap screener (default)
-            wl = build_watchlist_open_gap(
-                polygon=self.polygon,
-                day=d,
-                top_n=int(self.config.get("watchlist", "top_n", default=20)),
-                min_gap_pct=float(self.config.get("watchlist", "min_gap_pct", default=0.05)),
-                min_prev_close=float(self.config.get("watchlist", "min_prev_close", default=0.5)),
-                max_prev_close=float(self.config.get("watchlist", "max_prev_close", default=20.0)),
-            )
-            watchlist_rows = [
-                {"date": d.isoformat(), "ticker": i.ticker, "gap_pct": i.gap_pct, "prev_close": i.prev_close, "open_price": i.open_price}
-                for i in wl
-            ]
-
-        # Compute previous trading day for PDH/PDL
+        # Bars parsed during screening are reused below instead of being fetched again
+        day_bars = DayBarContext(day=d)
+        # Compute previous trading day (screeners' prev_close and PDH/PDL)
         prev_day = self._prev_trading_day(d)
+        with self.profiler.stage("screen", d):
+            universe = (
+                self.reference_universe.snapshot(self.polygon, d)
+                if self.reference_universe is not None else None
+            )
 
-        # Prepare bars for all tickers
-        ticker_bars: dict[str, pd.DataFrame] = {}
-        for item in wl:
-            bars = self.polygon.minute_bars(item.ticker, d)
-            if not bars:
-                continue
-
-            df_full = self._bars_to_frame(bars)
-            df_full = self._add_premarket_stats(df_full, d)
-            df_full = compute_trend_indicators(df_full)
-
-            # Fetch previous day's bar for PDH/PDL
-            prev_daily = self.polygon.daily_bar(item.ticker, prev_day)
-            if prev_daily:
-                df_full["pdh"] = float(prev_daily["h"])
-                df_full["pdl"] = float(prev_daily["l"])
+            if wl_method == "premarket_gap":
+                # Premarket gappers screener (04:00-09:29 behavior)
+                # Candidates prioritized by prev day volume, then filtered by premarket metrics
+                wl = build_watchlist_premarket_gappers(
+                    polygon=self.polygon,
+                    day=d,
+                    prev_day=prev_day,
+                    top_n=int(self.config.get("watchlist", "top_n", default=20)),
+                    min_premarket_pct=float(self.config.get("watchlist", "min_premarket_pct", default=0.05)),
+                    min_prev_close=float(self.config.get("watchlist", "min_prev_close", default=0.5)),
+                    max_prev_close=float(self.config.get("watchlist", "max_prev_close", default=20.0)),
+                    min_premarket_volume=int(self.config.get("watchlist", "min_premarket_volume", default=50000)),
+                    min_premarket_dollar_volume=float(self.config.get("watchlist", "min_premarket_dollar_volume", default=100000.0)),
+                    premarket_start=str(self.config.get("session", "premarket_start", default="04:00")),
+                    premarket_end=str(self.config.get("session", "premarket_end", default="09:29")),
+                    max_candidates_to_scan=int(self.config.get("watchlist", "max_candidates_to_scan", default=200)),
+                    fetch_concurrency=int(self.config.get("watchlist", "fetch_concurrency", default=1)),
+                    bar_store=self.bar_store,
+                    bar_context=day_bars,
+                    universe=universe,
+                )
+                watchlist_rows = [
+                    {
+                        "date": d.isoformat(),
+                        "ticker": i.ticker,
+                        "prev_close": i.prev_close,
+                        "premarket_pct": i.premarket_pct,
+                        "premarket_last": i.premarket_last,
+                        "premarket_high": i.premarket_high,
+                        "premarket_volume": i.premarket_volume,
+                        "premarket_dollar_volume": i.premarket_dollar_volume,
+                        "premarket_vwap": i.premarket_vwap,
+                    }
+                    for i in wl
+                ]
             else:
-                df_full["pdh"] = np.nan
-                df_full["pdl"] = np.nan
-
-            df = self._filter_session(df_full, d)
-            if df.empty:
-                continue
-
-            df = compute_session_indicators(df)
-            ticker_bars[item.ticker] = df
+                # Legacy open-gap screener (default)
+                wl = build_watchlist_open_gap(
+                    polygon=self.polygon,
+                    day=d,
+                    prev_day=prev_day,
+                    top_n=int(self.config.get("watchlist", "top_n", default=20)),
+                    min_gap_pct=float(self.config.get("watchlist", "min_gap_pct", default=0.05)),
+                    min_prev_close=float(self.config.get("watchlist", "min_prev_close", default=0.5)),
+                    max_prev_close=float(self.config.get("watchlist", "max_prev_close", default=20.0)),
+                    universe=universe,
+                )
+                watchlist_rows = [
+                    {"date": d.isoformat(), "ticker": i.ticker, "gap_pct": i.gap_pct, "prev_close": i.prev_close, "open_price": i.open_price}
+                    for i in wl
+                ]
+        self.profiler.count("watchlist_tickers", len(wl), day=d)
+
+        # Minute bars and previous day's bar (PDH/PDL) for every watchlisted ticker
+        bars: dict[str, tuple[np.ndarray, dict[str, Any] | None]] = {}
+        with self.profiler.stage("bars", d):
+            for item in wl:
+                arr = load_minute_array(self.polygon, item.ticker, d, self.bar_store, context=day_bars)
+                if len(arr) == 0:
+                    continue
+                bars[item.ticker] = (arr, self.polygon.daily_bar(item.ticker, prev_day))
+
+        return DayInputs(watchlist_rows=watchlist_rows, bars=bars)
+
+    def _simulate_day(
+        self, d: date, inputs: DayInputs
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        """CPU-bound half of a day: indicators and trade simulation on loaded inputs."""
+        watchlist_rows = inputs.watchlist_rows
+
+        ticker_bars = self._prepare_bars(d, inputs)
+        self.profiler.count("tickers_simulated", len(ticker_bars), day=d)
 
         if not ticker_bars:
             return [], [], watchlist_rows
 
-        # Use portfolio mode or legacy per-ticker mode
-        if self.use_portfolio_mode:
-            # Portfolio-level simulation (processes all tickers minute-by-minute)
-            fills_list, trades_list, _ = simulate_portfolio_day(
-                day=d,
-                ticker_bars=ticker_bars,
-                config=self.config,
-                fills=self.fills,
-                starting_equity=self.account_equity,
-                max_trades_per_day=self.max_trades_per_day,
-                max_daily_loss_pct=self.max_daily_loss_pct,
-                cooldown_minutes=self.cooldown_minutes,
-                force_flat_time=self.session.force_flat,
-                max_positions=self.max_positions,
-                max_position_pct=self.max_position_pct,
-                risk_per_trade_pct=self.risk_per_trade_pct,
-            )
-            fills = [f.__dict__ for f in fills_list]
-            trades = trades_list
-        else:
-            # Legacy per-ticker simulation (for backward compatibility)
-            trades: list[dict[str, Any]] = []
-            fills: list[dict[str, Any]] = []
-            day_risk_state = DayRiskState()
-
-            for ticker, df in ticker_bars.items():
-                fills_i, trades_i = simulate_ybi_small_caps(
-                    ticker=ticker,
+        # Early-close sessions (13:00 ET) pull the force-flat time forward
+        force_flat = min(self.session.force_flat, market_close_time(d))
+
+        with self.profiler.stage("simulate", d):
+            # Use portfolio mode or legacy per-ticker mode
+            if self.use_portfolio_mode:
+                # Portfolio-level simulation (processes all tickers minute-by-minute)
+                fills_list, trades_list, _ = simulate_portfolio_day(
                     day=d,
-                    df=df,
+                    ticker_bars=ticker_bars,
                     config=self.config,
                     fills=self.fills,
+                    starting_equity=self.account_equity,
                     max_trades_per_day=self.max_trades_per_day,
                     max_daily_loss_pct=self.max_daily_loss_pct,
                     cooldown_minutes=self.cooldown_minutes,
-                    account_equity=self.account_equity,
-                    force_flat_time=self.session.force_flat,
-                    day_risk_state=day_risk_state,
+                    force_flat_time=force_flat,
+                    max_positions=self.max_positions,
+                    max_position_pct=self.max_position_pct,
+                    risk_per_trade_pct=self.risk_per_trade_pct,
                 )
-                fills.extend([f.__dict__ for f in fills_i])
-                trades.extend(trades_i)
+                fills = [f.__dict__ for f in fills_list]
+                trades = trades_list
+            else:
+                # Legacy per-ticker simulation (for backward compatibility)
+                trades: list[dict[str, Any]] = []
+                fills: list[dict[str, Any]] = []
+                day_risk_state = DayRiskState()
+
+                for ticker, df in ticker_bars.items():
+                    fills_i, trades_i = simulate_ybi_small_caps(
+                        ticker=ticker,
+                        day=d,
+                        df=df,
+                        config=self.config,
+                        fills=self.fills,
+                        max_trades_per_day=self.max_trades_per_day,
+                        max_daily_loss_pct=self.max_daily_loss_pct,
+                        cooldown_minutes=self.cooldown_minutes,
+                        account_equity=self.account_equity,
+                        force_flat_time=force_flat,
+                        day_risk_state=day_risk_state,
+                    )
+                    fills.extend([f.__dict__ for f in fills_i])
+                    trades.extend(trades_i)
 
         return fills, trades, watchlist_rows
 
+    def _prepare_bars(self, d: date, inputs: DayInputs) -> dict[str, pd.DataFrame]:
+        """
+        Session frames with indicators for every ticker with bars.
+
+        Frames depend only on the inputs and `prepare_key` (timezone, session,
+        features), so they are stored on `inputs` and reused by other engines
+        simulating the same day (batch variants). Simulation never mutates them.
+        """
+        cached = inputs.prepared.get(self.prepare_key)
+        if cached is not None:
+            return cached
+
+        ticker_bars: dict[str, pd.DataFrame] = {}
+        with self.profiler.stage("indicators", d):
+            if self.panel_indicators:
+                ticker_bars = self._prepare_bars_panel(d, inputs)
+            else:
+                for ticker, (arr, prev_daily) in inputs.bars.items():
+                    df_full = self._array_to_frame(arr)
+                    df_full = self._add_premarket_stats(df_full, d)
+                    df_full = compute_trend_indicators(df_full, columns=self.feature_plan.trend_columns())
+
+                    # Previous day's bar for PDH/PDL
+                    if prev_daily:
+                        df_full["pdh"] = float(prev_daily["h"])
+                        df_full["pdl"] = float(prev_daily["l"])
+                    else:
+                        df_full["pdh"] = np.nan
+                        df_full["pdl"] = np.nan
+
+                    df = self._filter_session(df_full, d)
+                    if df.empty:
+                        continue
+
+                    df = compute_session_indicators(df, columns=self.feature_plan.session_columns())
+                    ticker_bars[ticker] = df
+        self.profiler.count("bars_processed", sum(len(arr) for arr, _ in inputs.bars.values()), day=d)
+        inputs.prepared[self.prepare_key] = ticker_bars
+        return ticker_bars
+
+    def _prepare_bars_panel(self, d: date, inputs: DayInputs) -> dict[str, pd.DataFrame]:
+        """
+        `_prepare_bars` for all tickers at once: premarket stats, trend
+        indicators and session VWAP are computed on one (ticker x bar) panel,
+        then each ticker's session slice becomes a frame with the same columns
+        and values as the per-ticker path.
+        """
+        panel = BarPanel.from_arrays({ticker: arr for ticker, (arr, _) in inputs.bars.items()})
+        pm_start = self._local_ms(d, self.premarket_start.hour, self.premarket_start.minute)
+        pm_end = self._local_ms(d, self.premarket_end.hour, self.premarket_end.minute)
+        start = self._local_ms(d, self.session.trade_start.hour, self.session.trade_start.minute)
+        end = self._local_ms(d, self.session.trade_end.hour, self.session.trade_end.minute)
+
+        premarket = window_stats(panel, pm_start, pm_end)
+        trend = trend_indicator_arrays(panel.h, panel.l, panel.c, columns=self.feature_plan.trend_columns())
+        session: dict[str, np.ndarray] = {}
+        wanted = self.feature_plan.session_columns()
+        if "vwap" in wanted:
+            session["vwap"] = session_vwap(panel, start, end)
+        if "extension_from_ema8_pct" in wanted:
+            session["extension_from_ema8_pct"] = (panel.h - trend["ema_8"]) / trend["ema_8"]
+        first, stop = panel.bounds(start, end)
+
+        tz_name = str(self.config.get("timezone", default="America/New_York"))
+        ticker_bars: dict[str, pd.DataFrame] = {}
+        for i, ticker in enumerate(panel.tickers):
+            a, b = int(first[i]), int(stop[i])
+            if a >= b:
+                continue
+            n = b - a
+            prev_daily = inputs.bars[ticker][1]
+            index = pd.DatetimeIndex(
+                pd.to_datetime(panel.t[i, a:b], unit="ms", utc=True).tz_convert(tz_name), name="ts"
+            )
+            columns: dict[str, Any] = {name: getattr(panel, name)[i, a:b] for name in ("o", "h", "l", "c", "v")}
+            for name, values in premarket.items():
+                columns[name] = np.full(n, values[i])
+            for name, panel_values in trend.items():
+                values = panel_values[i, a:b]
+                # object arrays (ttm_state) keep object dtype rather than being inferred as str
+                columns[name] = pd.Series(values, index=index, dtype=object) if values.dtype == object else values
+            columns["pdh"] = np.full(n, float(prev_daily["h"]) if prev_daily else np.nan)
+            columns["pdl"] = np.full(n, float(prev_daily["l"]) if prev_daily else np.nan)
+            for name, values in session.items():
+                columns[name] = values[i, a:b]
+            ticker_bars[ticker] = pd.DataFrame(columns, index=index)
+        return ticker_bars
+
+    def _local_ms(self, d: date, hour: int, minute: int) -> int:
+        """Epoch milliseconds of hour:minute on `d` in the configured timezone."""
+        # CRITICAL: Use pd.Timestamp with tz_localize to avoid pytz LMT offset bug
+        tz_name = str(self.config.get("timezone", default="America/New_York"))
+        ts = pd.Timestamp(year=d.year, month=d.month, day=d.day, hour=hour, minute=minute).tz_localize(tz_name)
+        return int(ts.value // 1_000_000)
+
     def _bars_to_frame(self, bars: list[dict[str, Any]]) -> pd.DataFrame:
-        df = pd.DataFrame(bars)
-        # Polygon aggregate fields: o,h,l,c,v,t (ms since epoch)
-        df = df.rename(columns={"o": "o", "h": "h", "l": "l", "c": "c", "v": "v", "t": "t"})
-        df = df[["t", "o", "h", "l", "c", "v"]]
+        return self._array_to_frame(bars_to_array(bars))
 
+    def _array_to_frame(self, arr: np.ndarray) -> pd.DataFrame:
+        # Polygon aggregate fields: o,h,l,c,v,t (ms since epoch); array is sorted by t
         tz_name = str(self.config.get("timezone", default="America/New_York"))
-        df["ts"] = pd.to_datetime(df["t"], unit="ms", utc=True).dt.tz_convert(tz_name)
-        df = df.drop(columns=["t"]).set_index("ts").sort_index()
-        return df
+        return array_to_frame(arr, tz_name)[["o", "h", "l", "c", "v"]]
 
     def _filter_session(self, df: pd.DataFrame, d: date) -> pd.DataFrame:
         # CRITICAL: Use pd.Timestamp with tz_localize to avoid pytz LMT offset bug
@@ -580,12 +919,25 @@ class BacktestEngine:
 
     def _prev_trading_day(self, d: date) -> date:
         """
-        Get previous trading day using actual market data availability.
+        Get previous trading day from the market calendar (no API calls).
+
+        With `calendar.verify_with_api` enabled, the calendar's answer is checked
+        against Polygon grouped_daily data; if that day has no data (e.g. an
+        unscheduled closure missing from the calendar), earlier days are probed.
+        """
+        prev = prev_trading_day(d)
+        if not self.verify_calendar_with_api:
+            return prev
+        return self._probe_prev_trading_day(prev)
+
+    def _probe_prev_trading_day(self, start: date) -> date:
+        """
+        Find the latest day on or before `start` with actual market data.
 
         This handles both weekends AND market holidays correctly by checking
         for actual data from Polygon's grouped_daily endpoint.
         """
-        prev = d - timedelta(days=1)
+        prev = start
         max_lookback = 10  # Max days to look back (handles long holiday weekends)
 
         for _ in range(max_lookback):
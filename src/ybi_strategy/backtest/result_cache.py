@@ -0,0 +1,189 @@
+"""Content-addressed cache of per-day simulation results.
+
+Layout under the cache root:
+
+- `index/<sim_hash>/<YYYY-MM-DD>.json`: which result a (config, day) maps to,
+  plus the fingerprint of the input data it was computed from.
+- `objects/<k[0:2]>/<k>.json.gz`: the day's outputs, keyed by
+  sha256(sim_hash + input fingerprint).
+
+`sim_hash` covers only the config sections that affect screening and
+simulation, so reruns that change reporting/analysis/transport settings hit
+the cache. Strategy code changes are NOT detected beyond the package version;
+prune the cache after changing simulation code.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from ybi_strategy import __version__
+from ybi_strategy.config import Config
+
+# Config sections whose values can change a day's watchlist, fills or trades
+SIMULATION_SECTIONS = (
+    "timezone",
+    "calendar",
+    "universe",
+    "watchlist",
+    "session",
+    "execution",
+    "risk",
+    "portfolio",
+    "strategy_small_caps",
+    "features",
+)
+
+# Keys inside simulation sections that only affect speed, never results
+_NON_SEMANTIC_KEYS = {("watchlist", "fetch_concurrency"), ("features", "compute"), ("features", "include")}
+
+# Bump when the stored result format or its semantics change
+_SCHEMA_VERSION = 1
+
+
+def simulation_config_hash(config: Config) -> str:
+    """sha256 over the simulation-relevant config sections (and package version)."""
+    sections = {name: copy.deepcopy(config.raw.get(name)) for name in SIMULATION_SECTIONS}
+    for section, key in _NON_SEMANTIC_KEYS:
+        if isinstance(sections.get(section), dict):
+            sections[section].pop(key, None)
+    payload = json.dumps(
+        {"schema": _SCHEMA_VERSION, "version": __version__, "sections": sections},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name[:12]}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass(frozen=True)
+class CachedDay:
+    result: dict[str, Any]
+    input_fingerprint: str
+
+
+@dataclass(frozen=True)
+class ResultCache:
+    root: Path
+
+    @staticmethod
+    def from_dir(path: str | Path) -> "ResultCache":
+        p = Path(path)
+        p.mkdir(parents=True, exist_ok=True)
+        return ResultCache(root=p)
+
+    @staticmethod
+    def from_env() -> "ResultCache | None":
+        path = os.environ.get("YBI_RESULT_CACHE_DIR", "").strip()
+        return ResultCache.from_dir(path) if path else None
+
+    def _index_path(self, sim_hash: str, d: date) -> Path:
+        return self.root / "index" / sim_hash[:32] / f"{d.isoformat()}.json"
+
+    def _object_path(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}.json.gz"
+
+    def get(self, sim_hash: str, d: date) -> CachedDay | None:
+        """Cached outputs for (config, day), or None on a miss or unreadable entry."""
+        try:
+            entry = json.loads(self._index_path(sim_hash, d).read_text(encoding="utf-8"))
+            raw = self._object_path(entry["content_key"]).read_bytes()
+            result = json.loads(gzip.decompress(raw).decode("utf-8"))
+        except (FileNotFoundError, KeyError, ValueError, OSError, EOFError):
+            return None
+        if entry.get("sim_hash") != sim_hash:
+            return None
+        return CachedDay(result=result, input_fingerprint=entry["input_fingerprint"])
+
+    def put(self, sim_hash: str, d: date, input_fingerprint: str, result: dict[str, Any]) -> str:
+        """Store a day's outputs; returns the content key."""
+        key = hashlib.sha256(f"{sim_hash}:{input_fingerprint}".encode("utf-8")).hexdigest()
+        obj = self._object_path(key)
+        if not obj.exists():
+            _write_atomic(obj, gzip.compress(json.dumps(result).encode("utf-8"), compresslevel=6, mtime=0))
+        entry = {
+            "date": d.isoformat(),
+            "sim_hash": sim_hash,
+            "input_fingerprint": input_fingerprint,
+            "content_key": key,
+            "created_at": time.time(),
+        }
+        _write_atomic(self._index_path(sim_hash, d), json.dumps(entry).encode("utf-8"))
+        return key
+
+    def _index_entries(self) -> list[tuple[Path, dict[str, Any]]]:
+        entries = []
+        for path in sorted((self.root / "index").glob("*/*.json")):
+            try:
+                entries.append((path, json.loads(path.read_text(encoding="utf-8"))))
+            except ValueError:
+                entries.append((path, {}))
+        return entries
+
+    def stats(self) -> dict[str, Any]:
+        entries = self._index_entries()
+        objects = list((self.root / "objects").glob("*/*.json.gz"))
+        return {
+            "configs": len({p.parent.name for p, _ in entries}),
+            "entries": len(entries),
+            "objects": len(objects),
+            "object_bytes": sum(p.stat().st_size for p in objects),
+        }
+
+    def prune(self, *, older_than_days: float | None = None, sim_hash: str | None = None) -> dict[str, int]:
+        """
+        Drop index entries (all, or those matching the filters), then delete
+        objects no remaining entry references.
+
+        Args:
+            older_than_days: Only drop entries created more than N days ago.
+            sim_hash: Only drop entries for this simulation config hash (prefix ok).
+
+        Returns:
+            Counts of removed entries and objects.
+        """
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        removed_entries = 0
+        live: set[str] = set()
+        for path, entry in self._index_entries():
+            matches = (
+                (sim_hash is None or path.parent.name.startswith(sim_hash[:32]))
+                and (cutoff is None or entry.get("created_at", 0) < cutoff)
+            )
+            if matches or not entry:
+                path.unlink(missing_ok=True)
+                removed_entries += 1
+            else:
+                live.add(entry.get("content_key", ""))
+        removed_objects = 0
+        for obj in (self.root / "objects").glob("*/*.json.gz"):
+            if obj.name[: -len(".json.gz")] not in live:
+                obj.unlink(missing_ok=True)
+                removed_objects += 1
+        for d in (self.root / "index").glob("*"):
+            if d.is_dir() and not any(d.iterdir()):
+                d.rmdir()
+        return {"entries": removed_entries, "objects": removed_objects}
@@ -0,0 +1,253 @@
+"""Append-only writers for per-day backtest outputs.
+
+Trades, fills and watchlist rows are flushed to disk as each day completes
+instead of being accumulated for the whole run, so peak memory no longer grows
+with the backtest length. The files are read back (only the needed columns)
+for the summary phase.
+
+Outputs are CSV by default. With `output_format="parquet"` (requires
+`pyarrow`) they are typed, compressed Parquet files with one row group per day:
+`*_ts` columns are tz-aware timestamps and tickers/reasons/statuses are
+categorical (dictionary-encoded), so downstream analysis skips re-parsing
+ISO strings.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, TextIO
+
+import pandas as pd
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+# Outputs streamed day by day (day_audit and daily_metrics are written once at the end)
+STREAMED_OUTPUTS = ("trades", "fills", "watchlist")
+
+# Low-cardinality text columns stored as categoricals in Parquet
+CATEGORICAL_COLUMNS = frozenset({"ticker", "side", "entry_reason", "exit_reason", "reason", "status"})
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Output format 'parquet' requires the 'pyarrow' package.") from e
+    return pyarrow
+
+
+def output_path(output_dir: Path, name: str, output_format: str = "csv") -> Path:
+    """File for output `name` (e.g. "trades") in the given format."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {OUTPUT_FORMATS}")
+    return output_dir / f"{name}.{output_format}"
+
+
+def typed_frame(df: pd.DataFrame, tz: str) -> pd.DataFrame:
+    """
+    Convert ISO timestamp columns (`*_ts`) to tz-aware datetimes and
+    `CATEGORICAL_COLUMNS` to categoricals; other columns are left as they are.
+    """
+    out = df.copy()
+    for col in out.columns:
+        if col.endswith("_ts") and not isinstance(out[col].dtype, pd.DatetimeTZDtype):
+            out[col] = pd.to_datetime(out[col], utc=True).dt.tz_convert(tz)
+        elif col in CATEGORICAL_COLUMNS:
+            out[col] = out[col].astype("category")
+    return out
+
+
+class CsvRowWriter:
+    """
+    Append rows (dicts) to a CSV file, one batch per day.
+
+    Columns follow the same first-seen order as `pd.DataFrame(all_rows)`. If a
+    later batch introduces a new key, the rows already on disk are rewritten
+    with the widened header (rare; keys are normally fixed per output).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.columns: list[str] = []
+        self.rows_written = 0
+        self._fh: TextIO | None = None
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        seen = set(self.columns)
+        new = [k for k in dict.fromkeys(k for row in rows for k in row) if k not in seen]
+        if new:
+            if self.rows_written:
+                self._widen(self.columns + new)
+            self.columns = self.columns + new
+        if self._fh is None:
+            self._fh = self.path.open("w", encoding="utf-8", newline="")
+        pd.DataFrame(rows, columns=self.columns).to_csv(self._fh, header=self.rows_written == 0, index=False)
+        self._fh.flush()
+        self.rows_written += len(rows)
+
+    def _widen(self, columns: list[str]) -> None:
+        assert self._fh is not None
+        self._fh.close()
+        existing = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        existing.reindex(columns=columns, fill_value="").to_csv(self.path, index=False)
+        self._fh = self.path.open("a", encoding="utf-8", newline="")
+
+    def close(self) -> None:
+        if self._fh is None:
+            # Same content pandas writes for an empty frame
+            self.path.write_text(pd.DataFrame([]).to_csv(index=False), encoding="utf-8")
+        else:
+            self._fh.close()
+            self._fh = None
+
+
+class ParquetRowWriter:
+    """
+    Append rows (dicts) to a Parquet file as one row group per day.
+
+    The schema is taken from the first batch. A later batch with new keys or
+    types that cannot be cast safely (e.g. floats in a column first seen as
+    integers) triggers a rewrite of the file with the promoted schema.
+    """
+
+    def __init__(self, path: Path, tz: str) -> None:
+        _pyarrow()  # fail before any day is simulated
+        self.path = path
+        self.tz = tz
+        self.rows_written = 0
+        self._schema: Any = None
+        self._writer: Any = None
+
+    def write_rows(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        table = self._table(rows)
+        if self._writer is None:
+            self._open(table.schema)
+            self._writer.write_table(table)
+        else:
+            conformed = self._conform(table)
+            if conformed is None:
+                self._rewrite(table)
+            else:
+                self._writer.write_table(conformed)
+        self.rows_written += len(rows)
+
+    def _table(self, rows: list[dict[str, Any]]) -> Any:
+        pa = _pyarrow()
+        table = pa.Table.from_pandas(typed_frame(pd.DataFrame(rows), self.tz), preserve_index=False)
+        # Fixed index width so per-day dictionaries share one schema
+        fields = [
+            pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type)) if pa.types.is_dictionary(f.type) else f
+            for f in table.schema
+        ]
+        return table.cast(pa.schema(fields))
+
+    def _conform(self, table: Any) -> Any:
+        """`table` cast to the file schema, or None if that would lose columns or values."""
+        pa = _pyarrow()
+        if table.schema.equals(self._schema):
+            return table
+        if not set(table.schema.names) <= set(self._schema.names):
+            return None
+        for field in self._schema:
+            if field.name not in table.schema.names:
+                table = table.append_column(field.name, pa.nulls(len(table), field.type))
+        try:
+            return table.select(self._schema.names).cast(self._schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            return None
+
+    def _open(self, schema: Any) -> None:
+        pq = _pyarrow().parquet
+        self._schema = schema
+        self._writer = pq.ParquetWriter(self.path, schema, compression="zstd")
+
+    def _rewrite(self, table: Any) -> None:
+        pa = _pyarrow()
+        self._writer.close()
+        existing = pa.parquet.read_table(self.path)
+        merged = pa.concat_tables([existing, table], promote_options="permissive")
+        self._open(merged.schema)
+        self._writer.write_table(merged)
+
+    def close(self) -> None:
+        if self._writer is None:
+            pa = _pyarrow()
+            pa.parquet.write_table(pa.table({}), self.path)
+        else:
+            self._writer.close()
+            self._writer = None
+
+
+class DayOutputWriters:
+    """Streaming writers for the per-day outputs of one run (`STREAMED_OUTPUTS`)."""
+
+    def __init__(self, output_dir: Path, output_format: str = "csv", tz: str = "America/New_York") -> None:
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.writers: dict[str, CsvRowWriter | ParquetRowWriter] = {}
+        for name in STREAMED_OUTPUTS:
+            path = output_path(output_dir, name, output_format)
+            self.writers[name] = ParquetRowWriter(path, tz) if output_format == "parquet" else CsvRowWriter(path)
+
+    def write_day(self, *, trades: list[dict[str, Any]], fills: list[dict[str, Any]],
+                  watchlist: list[dict[str, Any]]) -> None:
+        self.writers["trades"].write_rows(trades)
+        self.writers["fills"].write_rows(fills)
+        self.writers["watchlist"].write_rows(watchlist)
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+    def __enter__(self) -> "DayOutputWriters":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_output_frame(df: pd.DataFrame, path: Path, tz: str = "America/New_York") -> None:
+    """Write a whole output frame (day_audit, daily_metrics) in the format given by `path`'s suffix."""
+    if path.suffix == ".parquet":
+        _pyarrow()
+        typed_frame(df, tz).to_parquet(path, index=False, compression="zstd")
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_output_frame(path: Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """
+    Read a streamed output back as a DataFrame (CSV or Parquet, by suffix).
+
+    CSV floats are parsed round-trip exact and only empty fields become NaN
+    (so tickers such as "NA" survive), making the frame match the rows written.
+    Parquet columns come back typed (tz-aware timestamps, categoricals).
+
+    Args:
+        path: File written by `CsvRowWriter`/`ParquetRowWriter`/`write_output_frame`.
+        columns: Optional subset of columns to load (missing ones are ignored).
+
+    Returns:
+        DataFrame, empty when the file has no rows.
+    """
+    wanted = set(columns) if columns is not None else None
+    if path.suffix == ".parquet":
+        if not path.exists():
+            return pd.DataFrame()
+        pq = _pyarrow().parquet
+        names = pq.read_schema(path).names
+        return pd.read_parquet(path, columns=[c for c in names if c in wanted] if wanted is not None else None)
+    if not path.exists() or path.stat().st_size <= 1:
+        return pd.DataFrame()
+    return pd.read_csv(
+        path,
+        keep_default_na=False,
+        na_values=[""],
+        float_precision="round_trip",
+        usecols=(lambda c: c in wanted) if wanted is not None else None,
+    )
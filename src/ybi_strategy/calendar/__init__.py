@@ -5,7 +5,17 @@ from ybi_strategy.calendar.market_calendar import (
     is_weekend,
     is_trading_day,
     get_trading_days,
+    market_holidays,
+    early_closes,
+    market_close_time,
+    is_early_close,
+    prev_trading_day,
+    next_trading_day,
+    trading_day_index,
+    TradingDayIndex,
     US_MARKET_HOLIDAYS,
+    SPECIAL_CLOSURES,
+    EARLY_CLOSE_TIME,
 )
 
 __all__ = [
@@ -13,5 +23,15 @@ __all__ = [
     "is_weekend",
     "is_trading_day",
     "get_trading_days",
+    "market_holidays",
+    "early_closes",
+    "market_close_time",
+    "is_early_close",
+    "prev_trading_day",
+    "next_trading_day",
+    "trading_day_index",
+    "TradingDayIndex",
     "US_MARKET_HOLIDAYS",
+    "SPECIAL_CLOSURES",
+    "EARLY_CLOSE_TIME",
 ]
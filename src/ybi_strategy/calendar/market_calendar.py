@@ -1,53 +1,145 @@
 """US Stock Market Calendar.
 
-Defines market holidays and trading day validation.
+Defines market holidays, early closes and trading day validation.
 """
 
 from __future__ import annotations
 
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+from functools import lru_cache
 from typing import Set
 
+import numpy as np
+
 # US Stock Market Holidays (NYSE/NASDAQ)
 # Source: https://www.nyse.com/markets/hours-calendars
 #
-# Note: This covers the date range 2024-2025. Extend as needed.
+# Holidays are generated by rule for any year (see `market_holidays`); early
+# closes (13:00 ET) likewise (see `early_closes`). One-off closures that no rule
+# can produce are listed in SPECIAL_CLOSURES.
+
+EARLY_CLOSE_TIME = time(13, 0)
+
+# Unscheduled full-day closures (national days of mourning, weather, 9/11)
+SPECIAL_CLOSURES: dict[date, str] = {
+    date(1994, 4, 27): "National Day of Mourning (Nixon)",
+    date(2001, 9, 11): "September 11",
+    date(2001, 9, 12): "September 11",
+    date(2001, 9, 13): "September 11",
+    date(2001, 9, 14): "September 11",
+    date(2004, 6, 11): "National Day of Mourning (Reagan)",
+    date(2007, 1, 2): "National Day of Mourning (Ford)",
+    date(2012, 10, 29): "Hurricane Sandy",
+    date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "National Day of Mourning (G.H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Carter)",
+}
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th (1-based) given weekday of a month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year + month // 12, month % 12 + 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    """Weekend holidays are observed on the adjacent Friday (Saturday) or Monday (Sunday)."""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=None)
+def market_holidays(year: int) -> dict[date, str]:
+    """
+    Full-day NYSE closures for a year, generated by rule.
+
+    Args:
+        year: Calendar year.
+
+    Returns:
+        Mapping of closed date -> holiday name.
+    """
+    holidays: dict[date, str] = {}
+
+    # New Year's Day: Sunday -> Monday; a Saturday holiday is NOT moved to Dec 31
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        holidays[_nth_weekday(year, 1, 0, 3)] = "MLK Day"
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Presidents Day"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving"
+    holidays[_observed(date(year, 12, 25))] = "Christmas"
+
+    for d, name in SPECIAL_CLOSURES.items():
+        if d.year == year:
+            holidays[d] = name
+    return holidays
+
+
+@lru_cache(maxsize=None)
+def early_closes(year: int) -> dict[date, time]:
+    """
+    Scheduled early-close sessions (13:00 ET) for a year.
+
+    - July 3 when it falls Monday-Thursday
+    - The Friday after Thanksgiving
+    - December 24 when it falls Monday-Thursday
+
+    Args:
+        year: Calendar year.
+
+    Returns:
+        Mapping of date -> market close time.
+    """
+    closes: dict[date, time] = {}
+    july3 = date(year, 7, 3)
+    if july3.weekday() <= 3:
+        closes[july3] = EARLY_CLOSE_TIME
+    closes[_nth_weekday(year, 11, 3, 4) + timedelta(days=1)] = EARLY_CLOSE_TIME
+    xmas_eve = date(year, 12, 24)
+    if xmas_eve.weekday() <= 3:
+        closes[xmas_eve] = EARLY_CLOSE_TIME
+    holidays = market_holidays(year)
+    return {d: t for d, t in closes.items() if d not in holidays}
+
+
+# Span covered by the precomputed trading-day index; dates outside it fall back
+# to stepping day by day with is_trading_day().
+_INDEX_START = date(1990, 1, 1)
+_INDEX_END = date(2040, 12, 31)
+
+# All generated holidays within the index span (kept for backward compatibility)
 US_MARKET_HOLIDAYS: Set[date] = {
-    # 2024 Holidays
-    date(2024, 1, 1),    # New Year's Day
-    date(2024, 1, 15),   # MLK Day
-    date(2024, 2, 19),   # Presidents Day
-    date(2024, 3, 29),   # Good Friday
-    date(2024, 5, 27),   # Memorial Day
-    date(2024, 6, 19),   # Juneteenth
-    date(2024, 7, 4),    # Independence Day
-    date(2024, 9, 2),    # Labor Day
-    date(2024, 11, 28),  # Thanksgiving
-    date(2024, 12, 25),  # Christmas
-
-    # 2025 Holidays
-    date(2025, 1, 1),    # New Year's Day
-    date(2025, 1, 20),   # MLK Day
-    date(2025, 2, 17),   # Presidents Day
-    date(2025, 4, 18),   # Good Friday
-    date(2025, 5, 26),   # Memorial Day
-    date(2025, 6, 19),   # Juneteenth
-    date(2025, 7, 4),    # Independence Day
-    date(2025, 9, 1),    # Labor Day
-    date(2025, 11, 27),  # Thanksgiving
-    date(2025, 12, 25),  # Christmas
-
-    # 2026 Holidays (for future-proofing)
-    date(2026, 1, 1),    # New Year's Day
-    date(2026, 1, 19),   # MLK Day
-    date(2026, 2, 16),   # Presidents Day
-    date(2026, 4, 3),    # Good Friday
-    date(2026, 5, 25),   # Memorial Day
-    date(2026, 6, 19),   # Juneteenth
-    date(2026, 7, 3),    # Independence Day (observed)
-    date(2026, 9, 7),    # Labor Day
-    date(2026, 11, 26),  # Thanksgiving
-    date(2026, 12, 25),  # Christmas
+    d for year in range(_INDEX_START.year, _INDEX_END.year + 1) for d in market_holidays(year)
 }
 
 
@@ -61,7 +153,7 @@ def is_market_holiday(d: date) -> bool:
     Returns:
         True if the market is closed for a holiday, False otherwise.
     """
-    return d in US_MARKET_HOLIDAYS
+    return d in market_holidays(d.year)
 
 
 def is_weekend(d: date) -> bool:
@@ -103,7 +195,9 @@ def get_trading_days(start: date, end: date) -> list[date]:
     Returns:
         List of dates where the market is open.
     """
-    from datetime import timedelta
+    index = trading_day_index()
+    if index.start <= start and end <= index.end:
+        return index.between(start, end)
 
     days = []
     current = start
@@ -112,3 +206,125 @@ def get_trading_days(start: date, end: date) -> list[date]:
             days.append(current)
         current += timedelta(days=1)
     return days
+
+
+def market_close_time(d: date) -> time:
+    """
+    Regular close (16:00 ET) or early close (13:00 ET) for a trading day.
+
+    Args:
+        d: The date to check.
+
+    Returns:
+        The market close time for `d`.
+    """
+    return early_closes(d.year).get(d, time(16, 0))
+
+
+def is_early_close(d: date) -> bool:
+    """
+    Check if a date is a scheduled early-close (half-day) session.
+
+    Args:
+        d: The date to check.
+
+    Returns:
+        True if the market closes early on `d`, False otherwise.
+    """
+    return d in early_closes(d.year)
+
+
+@dataclass(frozen=True)
+class TradingDayIndex:
+    """
+    Precomputed trading days over a fixed calendar span.
+
+    For every calendar day in the span it stores how many trading days fall
+    strictly before it, so previous/next trading day lookups are two array
+    reads (O(1)) with no API calls.
+    """
+    start: date
+    end: date
+    days: np.ndarray        # trading days in [start, end], ascending (datetime64[D])
+    n_before: np.ndarray    # per calendar-day offset: count of trading days strictly before it
+    is_open: np.ndarray     # per calendar-day offset: True if a trading day
+
+    @staticmethod
+    def build(start: date, end: date) -> "TradingDayIndex":
+        span = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        holidays = np.array(sorted(US_MARKET_HOLIDAYS), dtype="datetime64[D]")
+        is_open = np.is_busday(span, holidays=holidays)
+        n_before = np.concatenate(([0], np.cumsum(is_open)[:-1]))
+        return TradingDayIndex(start=start, end=end, days=span[is_open], n_before=n_before, is_open=is_open)
+
+    def between(self, start: date, end: date) -> list[date]:
+        """Trading days in [start, end] (both within the index) as a slice of `days`."""
+        lo = int(self.n_before[(start - self.start).days])
+        hi = int(self.n_before[(end - self.start).days] + self.is_open[(end - self.start).days])
+        return self.days[lo:hi].astype(date).tolist()
+
+    def _offset(self, d: date) -> int | None:
+        if not (self.start <= d <= self.end):
+            return None
+        return (d - self.start).days
+
+    def prev_trading_day(self, d: date) -> date | None:
+        """Last trading day strictly before `d`, or None if outside the index."""
+        off = self._offset(d)
+        if off is None or self.n_before[off] == 0:
+            return None
+        return self.days[self.n_before[off] - 1].astype(date)
+
+    def next_trading_day(self, d: date) -> date | None:
+        """First trading day strictly after `d`, or None if outside the index."""
+        off = self._offset(d)
+        if off is None:
+            return None
+        k = int(self.n_before[off] + self.is_open[off])
+        if k >= len(self.days):
+            return None
+        return self.days[k].astype(date)
+
+
+@lru_cache(maxsize=1)
+def trading_day_index() -> TradingDayIndex:
+    """Process-wide trading-day index (built once, ~50 years of days)."""
+    return TradingDayIndex.build(_INDEX_START, _INDEX_END)
+
+
+def prev_trading_day(d: date) -> date:
+    """
+    Get the previous trading day (weekends and market holidays skipped).
+
+    Args:
+        d: Reference date (need not itself be a trading day).
+
+    Returns:
+        The last trading day strictly before `d`.
+    """
+    found = trading_day_index().prev_trading_day(d)
+    if found is not None:
+        return found
+    prev = d - timedelta(days=1)
+    while not is_trading_day(prev):
+        prev -= timedelta(days=1)
+    return prev
+
+
+def next_trading_day(d: date) -> date:
+    """
+    Get the next trading day (weekends and market holidays skipped).
+
+    Args:
+        d: Reference date (need not itself be a trading day).
+
+    Returns:
+        The first trading day strictly after `d`.
+    """
+    found = trading_day_index().next_trading_day(d)
+    if found is not None:
+        return found
+    nxt = d + timedelta(days=1)
+    while not is_trading_day(nxt):
+        nxt += timedelta(days=1)
+    return nxt
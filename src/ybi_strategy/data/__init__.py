@@ -0,0 +1,21 @@
+"""Local market-data stores."""
+
+from ybi_strategy.data.bar_store import (
+    BAR_DTYPE,
+    DayBarContext,
+    MinuteBarStore,
+    array_to_frame,
+    bars_to_array,
+    load_minute_array,
+    load_minute_arrays,
+)
+
+__all__ = [
+    "BAR_DTYPE",
+    "DayBarContext",
+    "MinuteBarStore",
+    "array_to_frame",
+    "bars_to_array",
+    "load_minute_array",
+    "load_minute_arrays",
+]
@@ -0,0 +1,208 @@
+"""Columnar on-disk store for parsed minute bars.
+
+Each ticker-day is saved once as a typed NumPy structured array
+(`<root>/<YYYY-MM-DD>/<TICKER>.npy`) and memory-mapped on later reads, so repeat
+backtests skip both the HTTP cache and JSON decoding. Days with no bars are
+stored as zero-length arrays so empty screens are not re-fetched either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Polygon aggregate fields: t (ms since epoch), OHLC, volume, VWAP, trade count
+BAR_DTYPE = np.dtype([
+    ("t", "<i8"),
+    ("o", "<f8"),
+    ("h", "<f8"),
+    ("l", "<f8"),
+    ("c", "<f8"),
+    ("v", "<f8"),
+    ("vw", "<f8"),
+    ("n", "<i8"),
+])
+
+
+def bars_to_array(bars: list[dict[str, Any]]) -> np.ndarray:
+    """Convert Polygon aggregate rows to a `BAR_DTYPE` array sorted by timestamp."""
+    arr = np.empty(len(bars), dtype=BAR_DTYPE)
+    if not bars:
+        return arr
+    arr["t"] = [int(b["t"]) for b in bars]
+    for name in ("o", "h", "l", "c", "v", "vw"):
+        arr[name] = [b.get(name, np.nan) for b in bars]
+    arr["n"] = [b.get("n", 0) or 0 for b in bars]
+    if len(arr) > 1 and np.any(arr["t"][1:] < arr["t"][:-1]):
+        arr = arr[np.argsort(arr["t"], kind="stable")]
+    return arr
+
+
+def array_to_frame(arr: np.ndarray, tz: str) -> pd.DataFrame:
+    """Build a tz-aware, timestamp-indexed DataFrame (o,h,l,c,v,vw,n) from a bar array."""
+    index = pd.DatetimeIndex(pd.to_datetime(arr["t"], unit="ms", utc=True).tz_convert(tz), name="ts")
+    return pd.DataFrame({name: np.asarray(arr[name]) for name in BAR_DTYPE.names if name != "t"}, index=index)
+
+
+@dataclass(frozen=True)
+class MinuteBarStore:
+    root: Path
+
+    @staticmethod
+    def from_dir(path: str | Path) -> "MinuteBarStore":
+        p = Path(path)
+        p.mkdir(parents=True, exist_ok=True)
+        return MinuteBarStore(root=p)
+
+    @staticmethod
+    def from_env() -> "MinuteBarStore | None":
+        path = os.environ.get("YBI_BAR_STORE_DIR", "").strip()
+        return MinuteBarStore.from_dir(path) if path else None
+
+    def path(self, ticker: str, d: date) -> Path:
+        return self.root / d.isoformat() / f"{ticker}.npy"
+
+    def load(self, ticker: str, d: date, *, mmap: bool = True) -> np.ndarray | None:
+        """Return the stored array (memory-mapped by default), or None if absent."""
+        path = self.path(ticker, d)
+        if not path.exists():
+            return None
+        try:
+            arr = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        except ValueError:
+            # Zero-length arrays cannot be memory-mapped
+            arr = np.load(path, allow_pickle=False)
+        return arr if arr.dtype == BAR_DTYPE else None
+
+    def save(self, ticker: str, d: date, arr: np.ndarray) -> None:
+        """Atomically write a `BAR_DTYPE` array for one ticker-day."""
+        path = self.path(ticker, d)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{ticker}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, np.ascontiguousarray(arr, dtype=BAR_DTYPE), allow_pickle=False)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def frame(self, ticker: str, d: date, tz: str) -> pd.DataFrame | None:
+        arr = self.load(ticker, d)
+        return None if arr is None else array_to_frame(arr, tz)
+
+
+@dataclass
+class DayBarContext:
+    """
+    Minute-bar arrays already loaded for one trading day.
+
+    The screener registers every candidate it parses; the day simulation then
+    reuses those arrays instead of fetching the watchlisted tickers again.
+    """
+    day: date
+    arrays: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def get(self, ticker: str) -> np.ndarray | None:
+        return self.arrays.get(ticker)
+
+    def put(self, ticker: str, arr: np.ndarray) -> None:
+        self.arrays[ticker] = arr
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self.arrays
+
+    def __len__(self) -> int:
+        return len(self.arrays)
+
+
+def load_minute_array(
+    polygon: Any,
+    ticker: str,
+    d: date,
+    store: MinuteBarStore | None = None,
+    *,
+    context: DayBarContext | None = None,
+) -> np.ndarray:
+    """Minute bars for one ticker-day: from `context`, then `store`, else fetched and stored."""
+    if context is not None:
+        arr = context.get(ticker)
+        if arr is not None:
+            return arr
+    arr = store.load(ticker, d) if store is not None else None
+    if arr is None:
+        arr = bars_to_array(polygon.minute_bars(ticker, d))
+        if store is not None:
+            store.save(ticker, d, arr)
+    if context is not None:
+        context.put(ticker, arr)
+    return arr
+
+
+def load_minute_arrays(
+    polygon: Any,
+    tickers: Iterable[str],
+    d: date,
+    *,
+    store: MinuteBarStore | None = None,
+    context: DayBarContext | None = None,
+    concurrency: int = 1,
+) -> list[np.ndarray | BaseException]:
+    """
+    Batch form of `load_minute_array` for screening.
+
+    Returns arrays in `tickers` order; a failed fetch is returned in place as the
+    exception. Store misses are fetched concurrently when `concurrency > 1`.
+    Successfully loaded arrays are registered in `context`.
+    """
+    from ybi_strategy.polygon.async_client import AsyncPolygonClient
+
+    tickers = list(tickers)
+    out: list[np.ndarray | BaseException | None] = []
+    for t in tickers:
+        arr = context.get(t) if context is not None else None
+        if arr is None and store is not None:
+            arr = store.load(t, d)
+        out.append(arr)
+    missing = [i for i, arr in enumerate(out) if arr is None]
+
+    if not missing:
+        fetched = []
+    elif concurrency > 1:
+        client = AsyncPolygonClient(polygon, max_concurrency=concurrency)
+        fetched = asyncio.run(
+            client.minute_bars_many([tickers[i] for i in missing], d, return_exceptions=True)
+        )
+    else:
+        fetched = []
+        for i in missing:
+            try:
+                fetched.append(polygon.minute_bars(tickers[i], d))
+            except Exception as e:
+                fetched.append(e)
+
+    for i, bars in zip(missing, fetched):
+        if isinstance(bars, BaseException):
+            out[i] = bars
+            continue
+        arr = bars_to_array(bars)
+        if store is not None:
+            store.save(tickers[i], d, arr)
+        out[i] = arr
+
+    if context is not None:
+        for t, arr in zip(tickers, out):
+            if isinstance(arr, np.ndarray):
+                context.put(t, arr)
+    return out  # type: ignore[return-value]
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 import numpy as np
 import pandas as pd
 
+from ybi_strategy.features.kernels import (
+    rolling_linreg_last_array,
+    trend_indicator_arrays,
+    ttm_squeeze_arrays,
+)
+
+# Columns added by compute_session_indicators (trend columns: kernels.TREND_COLUMNS)
+SESSION_COLUMNS = ("vwap", "extension_from_ema8_pct")
+
 
 def ema(series: pd.Series, span: int) -> pd.Series:
     return series.ewm(span=span, adjust=False).mean()
@@ -33,13 +44,16 @@ def atr(df: pd.DataFrame, window: int) -> pd.Series:
     return tr.rolling(window=window, min_periods=window).mean()
 
 
-def _linreg_last(y: np.ndarray) -> float:
-    x = np.arange(len(y), dtype=float)
-    if np.all(np.isnan(y)):
-        return float("nan")
-    y = np.nan_to_num(y, nan=0.0)
-    slope, intercept = np.polyfit(x, y, 1)
-    return float(slope * x[-1] + intercept)
+def rolling_linreg_last(series: pd.Series, window: int) -> pd.Series:
+    """
+    Rolling least-squares line over the last `window` values, evaluated at the
+    window's last point (same as fitting `np.polyfit(arange(window), w, 1)` per
+    window, but O(n) from cumulative sums of y and x*y).
+
+    Windows containing a NaN (including the first window-1 rows) are NaN, as
+    with `rolling(window, min_periods=window)`.
+    """
+    return pd.Series(rolling_linreg_last_array(series.to_numpy(dtype=float), window), index=series.index)
 
 
 def ttm_squeeze_proxy(
@@ -59,34 +73,16 @@ def ttm_squeeze_proxy(
     linear regression to form a histogram-like series.
     """
     out = df.copy()
-    sma_mid = out["c"].rolling(window=length, min_periods=length).mean()
-    std = out["c"].rolling(window=length, min_periods=length).std(ddof=0)
-    bb_upper = sma_mid + bb_mult * std
-    bb_lower = sma_mid - bb_mult * std
-
-    ema_mid = ema(out["c"], length)
-    atr_val = atr(out, window=length)
-    kc_upper = ema_mid + kc_mult * atr_val
-    kc_lower = ema_mid - kc_mult * atr_val
-
-    squeeze_on = (bb_lower > kc_lower) & (bb_upper < kc_upper)
-
-    highest_high = out["h"].rolling(window=length, min_periods=length).max()
-    lowest_low = out["l"].rolling(window=length, min_periods=length).min()
-    m1 = (highest_high + lowest_low) / 2.0
-    m2 = (m1 + sma_mid) / 2.0
-    momentum_raw = out["c"] - m2
-    momentum = momentum_raw.rolling(window=length, min_periods=length).apply(
-        lambda w: _linreg_last(np.asarray(w, dtype=float)),
-        raw=False,
+    arrays = ttm_squeeze_arrays(
+        out["h"].to_numpy(dtype=float),
+        out["l"].to_numpy(dtype=float),
+        out["c"].to_numpy(dtype=float),
+        length=length,
+        bb_mult=bb_mult,
+        kc_mult=kc_mult,
     )
-
-    out["ttm_bb_upper"] = bb_upper
-    out["ttm_bb_lower"] = bb_lower
-    out["ttm_kc_upper"] = kc_upper
-    out["ttm_kc_lower"] = kc_lower
-    out["ttm_squeeze_on"] = squeeze_on
-    out["momentum"] = momentum
+    for name, values in arrays.items():
+        out[name] = values
     return out
 
 
@@ -107,33 +103,42 @@ def compute_intraday_levels(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
-def compute_trend_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def compute_trend_indicators(df: pd.DataFrame, columns: Iterable[str] | None = None) -> pd.DataFrame:
     """
     Trend + momentum indicators that can be computed on a broader window (e.g. include premarket)
     to avoid "cold start" during the open.
+
+    Thin wrapper over `kernels.trend_indicator_arrays`, which computes every column from
+    the OHLC arrays in one call; an existing column of the same name is replaced.
+    `columns` limits the output to a subset of `TREND_COLUMNS` (see `features.registry`).
     """
-    out = df.copy()
-    out["ema_8"] = ema(out["c"], 8)
-    out["ema_21"] = ema(out["c"], 21)
-    out["ema_34"] = ema(out["c"], 34)
-    out["ema_55"] = ema(out["c"], 55)
-    out["sma_200"] = sma(out["c"], 200)
-    out = ttm_squeeze_proxy(out)
-    out["ttm_state"] = ttm_color_state(out["momentum"])
-    out["momentum_sign"] = np.where(out["momentum"] >= 0, "bull", "bear")
-    out = compute_intraday_levels(out)
-    return out
+    arrays = trend_indicator_arrays(
+        df["h"].to_numpy(dtype=float),
+        df["l"].to_numpy(dtype=float),
+        df["c"].to_numpy(dtype=float),
+        columns=columns,
+    )
+    # Attach all columns at once (one allocation instead of a copy per helper);
+    # object arrays (ttm_state) keep object dtype rather than being inferred as str
+    added = pd.DataFrame(
+        {name: pd.Series(values, index=df.index, dtype=object if values.dtype == object else None)
+         for name, values in arrays.items()}
+    )
+    return pd.concat([df.drop(columns=[c for c in arrays if c in df.columns]), added], axis=1)
 
 
-def compute_session_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def compute_session_indicators(df: pd.DataFrame, columns: Iterable[str] | None = None) -> pd.DataFrame:
     """
     Session-only indicators (e.g., RTH VWAP). Intended to be called after slicing to the
-    trading window.
+    trading window. `columns` limits the output to a subset of `SESSION_COLUMNS`.
     """
+    want = set(SESSION_COLUMNS if columns is None else columns)
     out = df.copy()
-    typical = (out["h"] + out["l"] + out["c"]) / 3.0
-    out["vwap"] = vwap(typical, out["v"])
-    out["extension_from_ema8_pct"] = (out["h"] - out["ema_8"]) / out["ema_8"]
+    if "vwap" in want:
+        typical = (out["h"] + out["l"] + out["c"]) / 3.0
+        out["vwap"] = vwap(typical, out["v"])
+    if "extension_from_ema8_pct" in want:
+        out["extension_from_ema8_pct"] = (out["h"] - out["ema_8"]) / out["ema_8"]
     return out
 
 
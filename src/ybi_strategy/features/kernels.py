@@ -0,0 +1,262 @@
+"""Array-level indicator kernels.
+
+`trend_indicator_arrays` computes every trend column of
+`compute_trend_indicators` (EMAs, SMA-200, TTM Bollinger/Keltner bands, ATR,
+squeeze, momentum, color state, HOD/LOD) from the OHLC arrays in one call.
+Shared intermediates (the rolling close mean, momentum) are computed once,
+outputs are plain NumPy arrays, and the caller attaches them to its
+frame in a single concat instead of one `df.copy()` per helper.
+
+Rolling windows follow `rolling(window, min_periods=window)`: a window with
+any NaN yields NaN. EMAs follow `ewm(span, adjust=False)`.
+
+Every kernel works along the last axis, so a 2-D (ticker x bar) panel
+computes all tickers in one call (see `features.panel`). All operations are
+causal: values appended after a row's last bar do not change earlier outputs.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+EMA_SPANS = (8, 21, 34, 55)
+SMA_WINDOW = 200
+TTM_LENGTH = 20
+
+# Output columns of trend_indicator_arrays, in the order they are attached
+TREND_COLUMNS = (
+    "ema_8",
+    "ema_21",
+    "ema_34",
+    "ema_55",
+    "sma_200",
+    "ttm_bb_upper",
+    "ttm_bb_lower",
+    "ttm_kc_upper",
+    "ttm_kc_lower",
+    "ttm_squeeze_on",
+    "momentum",
+    "ttm_state",
+    "momentum_sign",
+    "hod_so_far",
+    "lod_so_far",
+)
+
+
+def ema_array(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA with alpha = 2/(span+1), seeded with the first value (pandas adjust=False)."""
+    x = np.asarray(x, dtype=float)
+    if x.shape[-1] == 0:
+        return x.copy()
+    if np.isnan(x).any():
+        # pandas carries the average across gaps; keep its exact semantics
+        return pd.DataFrame(np.atleast_2d(x).T).ewm(span=span, adjust=False).mean().to_numpy().T.reshape(x.shape)
+    alpha = 2.0 / (span + 1.0)
+    zi = (1.0 - alpha) * x[..., :1]
+    out, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)
+    return out
+
+
+def _rolling(x: np.ndarray, window: int, reduce: str) -> np.ndarray:
+    """`reduce` ("mean", "std", "max", "min") over trailing windows along the last axis."""
+    x = np.asarray(x, dtype=float)
+    out = np.full(x.shape, np.nan)
+    if window < 1 or x.shape[-1] < window:
+        return out
+    windows = sliding_window_view(x, window, axis=-1)
+    out[..., window - 1:] = getattr(windows, reduce)(axis=-1)
+    return out
+
+
+def rolling_mean_array(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(x, window, "mean")
+
+
+def rolling_std_array(x: np.ndarray, window: int) -> np.ndarray:
+    """Population (ddof=0) rolling standard deviation."""
+    return _rolling(x, window, "std")
+
+
+def rolling_max_array(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(x, window, "max")
+
+
+def rolling_min_array(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(x, window, "min")
+
+
+def rolling_linreg_last_array(y: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling least-squares line over the last `window` values, evaluated at the
+    window's last point, from cumulative sums of y and x*y (O(n)).
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    out = np.full(y.shape, np.nan)
+    if window < 1 or n < window:
+        return out
+    if window == 1:
+        return y.copy()
+
+    missing = np.isnan(y)
+    # The fit is shift-equivariant; centering on each row's first valid value
+    # keeps the cumulative sums small (and does not depend on later values)
+    first = np.argmax(~missing, axis=-1)[..., None]
+    center = np.where(missing.all(axis=-1, keepdims=True), 0.0, np.take_along_axis(y, first, axis=-1))
+    filled = np.where(missing, 0.0, y - center)
+    idx = np.arange(n, dtype=float)
+
+    def window_sum(values: np.ndarray) -> np.ndarray:
+        c = np.cumsum(values, axis=-1)
+        c = np.concatenate((np.zeros(c.shape[:-1] + (1,)), c), axis=-1)
+        return c[..., window:] - c[..., :-window]
+
+    sum_y = window_sum(filled)
+    # sum of x*y with x = 0..window-1 inside each window
+    sum_xy = window_sum(idx * filled) - idx[: n - window + 1] * sum_y
+    nan_count = window_sum(missing.astype(float))
+
+    x_mean = (window - 1) / 2.0
+    sxx = window * (window * window - 1) / 12.0
+    y_mean = sum_y / window
+    slope = (sum_xy - x_mean * sum_y) / sxx
+    last = center + y_mean + slope * (window - 1 - x_mean)
+    last[nan_count > 0] = np.nan
+    out[..., window - 1:] = last
+    return out
+
+
+def true_range_array(h: np.ndarray, l: np.ndarray, c: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate((np.full(c.shape[:-1] + (1,), np.nan), c[..., :-1]), axis=-1)
+    # fmax skips the missing previous close on the first bar, like DataFrame.max(axis=1)
+    return np.fmax(np.fmax(np.abs(h - l), np.abs(h - prev_close)), np.abs(l - prev_close))
+
+
+TTM_COLUMNS = ("ttm_bb_upper", "ttm_bb_lower", "ttm_kc_upper", "ttm_kc_lower", "ttm_squeeze_on", "momentum")
+
+
+def ttm_squeeze_arrays(
+    h: np.ndarray,
+    l: np.ndarray,
+    c: np.ndarray,
+    *,
+    length: int = TTM_LENGTH,
+    bb_mult: float = 2.0,
+    kc_mult: float = 1.5,
+    columns: Iterable[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    TTM squeeze components (see `indicators.ttm_squeeze_proxy`).
+
+    Args:
+        h, l, c: High/low/close arrays.
+        length: BB/KC/momentum window.
+        bb_mult: Bollinger band width in standard deviations.
+        kc_mult: Keltner channel width in ATRs.
+        columns: Subset of `TTM_COLUMNS` to compute (default all); bands
+            and rolling windows not needed for them are skipped.
+
+    Returns:
+        Dict with the requested columns, in `TTM_COLUMNS` order.
+    """
+    want = set(TTM_COLUMNS if columns is None else columns)
+    h, l, c = (np.asarray(a, dtype=float) for a in (h, l, c))
+    out: dict[str, np.ndarray] = {}
+    need_bb = bool(want & {"ttm_bb_upper", "ttm_bb_lower", "ttm_squeeze_on"})
+    need_kc = bool(want & {"ttm_kc_upper", "ttm_kc_lower", "ttm_squeeze_on"})
+    sma_mid = rolling_mean_array(c, length) if need_bb or "momentum" in want else None
+
+    if need_bb:
+        std = rolling_std_array(c, length)
+        out["ttm_bb_upper"] = sma_mid + bb_mult * std
+        out["ttm_bb_lower"] = sma_mid - bb_mult * std
+
+    if need_kc:
+        ema_mid = ema_array(c, length)
+        atr_val = rolling_mean_array(true_range_array(h, l, c), length)
+        out["ttm_kc_upper"] = ema_mid + kc_mult * atr_val
+        out["ttm_kc_lower"] = ema_mid - kc_mult * atr_val
+
+    if "ttm_squeeze_on" in want:
+        out["ttm_squeeze_on"] = (out["ttm_bb_lower"] > out["ttm_kc_lower"]) & (out["ttm_bb_upper"] < out["ttm_kc_upper"])
+
+    if "momentum" in want:
+        m1 = (rolling_max_array(h, length) + rolling_min_array(l, length)) / 2.0
+        m2 = (m1 + sma_mid) / 2.0
+        out["momentum"] = rolling_linreg_last_array(c - m2, length)
+
+    return {name: out[name] for name in TTM_COLUMNS if name in want}
+
+
+def ttm_color_state_array(momentum: np.ndarray) -> np.ndarray:
+    """Object array of strong/weak bull/bear states (NaN where momentum or its change is missing)."""
+    momentum = np.asarray(momentum, dtype=float)
+    delta = np.concatenate((np.full(momentum.shape[:-1] + (1,), np.nan), np.diff(momentum, axis=-1)), axis=-1)
+    state = np.full(momentum.shape, np.nan, dtype=object)
+    state[(momentum > 0) & (delta >= 0)] = "strong_bull"
+    state[(momentum > 0) & (delta < 0)] = "weak_bull"
+    state[(momentum < 0) & (delta < 0)] = "strong_bear"
+    state[(momentum < 0) & (delta >= 0)] = "weak_bear"
+    return state
+
+
+def running_max_array(x: np.ndarray) -> np.ndarray:
+    """Cumulative max that skips NaN (NaN stays NaN at its own position, like Series.cummax)."""
+    x = np.asarray(x, dtype=float)
+    out = np.fmax.accumulate(x, axis=-1) if x.size else x.copy()
+    out[np.isnan(x)] = np.nan
+    return out
+
+
+def running_min_array(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    out = np.fmin.accumulate(x, axis=-1) if x.size else x.copy()
+    out[np.isnan(x)] = np.nan
+    return out
+
+
+def trend_indicator_arrays(
+    h: np.ndarray,
+    l: np.ndarray,
+    c: np.ndarray,
+    columns: Iterable[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    `TREND_COLUMNS` from the high/low/close arrays (1-D, or 2-D with bars
+    along the last axis).
+
+    Args:
+        h, l, c: High/low/close arrays.
+        columns: Subset of `TREND_COLUMNS` to compute (default all); inputs
+            they depend on (e.g. momentum for ttm_state) are computed but not
+            returned unless requested.
+
+    Returns:
+        Dict of column name -> array, ordered as `TREND_COLUMNS`.
+    """
+    want = set(TREND_COLUMNS if columns is None else columns)
+    h, l, c = (np.asarray(a, dtype=float) for a in (h, l, c))
+    out: dict[str, np.ndarray] = {}
+    for span in EMA_SPANS:
+        if f"ema_{span}" in want:
+            out[f"ema_{span}"] = ema_array(c, span)
+    if "sma_200" in want:
+        out["sma_200"] = rolling_mean_array(c, SMA_WINDOW)
+    ttm = set(TTM_COLUMNS) & want
+    if want & {"ttm_state", "momentum_sign"}:
+        ttm.add("momentum")
+    out.update(ttm_squeeze_arrays(h, l, c, length=TTM_LENGTH, columns=ttm))
+    if "ttm_state" in want:
+        out["ttm_state"] = ttm_color_state_array(out["momentum"])
+    if "momentum_sign" in want:
+        out["momentum_sign"] = np.where(out["momentum"] >= 0, "bull", "bear")
+    if "hod_so_far" in want:
+        out["hod_so_far"] = running_max_array(h)
+    if "lod_so_far" in want:
+        out["lod_so_far"] = running_min_array(l)
+    return {name: out[name] for name in TREND_COLUMNS if name in want}
@@ -0,0 +1,109 @@
+"""One day's minute bars for many tickers as a (ticker x bar) panel.
+
+Rows are tickers and columns are each ticker's own bar sequence (bar i of a
+row is that ticker's i-th bar), so rolling windows and EMAs see exactly the
+bars they see when computed per ticker. Rows shorter than the longest are
+padded at the end: prices repeat the last bar, volume is 0 and the
+timestamp is `PAD_TS`. Padding never falls inside a time window and, because
+every kernel is causal, never changes a real bar's values. It is used
+instead of NaN so padded cells do not send the kernels down their
+NaN-handling paths.
+
+With the panel, `kernels.trend_indicator_arrays` and the session helpers
+below run once per day instead of once per watchlist ticker.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+# Timestamp of padded cells (after any session window)
+PAD_TS = np.iinfo(np.int64).max
+
+
+@dataclass(frozen=True)
+class BarPanel:
+    tickers: tuple[str, ...]
+    lengths: np.ndarray  # real bars per row
+    t: np.ndarray  # ms since epoch
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    @staticmethod
+    def from_arrays(bars: Mapping[str, np.ndarray]) -> "BarPanel":
+        """
+        Build from `BAR_DTYPE` arrays (sorted by timestamp) keyed by ticker.
+
+        Tickers without bars are left out.
+        """
+        rows = [(ticker, arr) for ticker, arr in bars.items() if len(arr)]
+        lengths = np.array([len(arr) for _, arr in rows], dtype=np.int64)
+        width = int(lengths.max()) if len(rows) else 0
+        t = np.full((len(rows), width), PAD_TS, dtype=np.int64)
+        prices = {name: np.empty((len(rows), width)) for name in ("o", "h", "l", "c")}
+        v = np.zeros((len(rows), width))
+        for i, (_, arr) in enumerate(rows):
+            n = len(arr)
+            t[i, :n] = arr["t"]
+            v[i, :n] = arr["v"]
+            for name, panel in prices.items():
+                panel[i, :n] = arr[name]
+                panel[i, n:] = arr[name][-1]
+        return BarPanel(tickers=tuple(ticker for ticker, _ in rows), lengths=lengths, t=t, v=v, **prices)
+
+    def between(self, start_ms: int, end_ms: int) -> np.ndarray:
+        """Mask of real bars with start_ms <= t <= end_ms."""
+        return (self.t >= start_ms) & (self.t <= end_ms)
+
+    def bounds(self, start_ms: int, end_ms: int) -> tuple[np.ndarray, np.ndarray]:
+        """Per row, [first, stop) column range of the bars in [start_ms, end_ms]."""
+        return (self.t < start_ms).sum(axis=1), (self.t <= end_ms).sum(axis=1)
+
+
+def forward_fill(x: np.ndarray) -> np.ndarray:
+    """NaNs replaced by the last earlier non-NaN value in the row (leading NaNs stay)."""
+    n = x.shape[-1]
+    idx = np.where(np.isnan(x), 0, np.arange(n))
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return np.take_along_axis(x, idx, axis=-1)
+
+
+def window_stats(panel: BarPanel, start_ms: int, end_ms: int) -> dict[str, np.ndarray]:
+    """
+    Per-ticker high, low, volume and last close of the bars in [start_ms, end_ms]
+    (the engine's premarket stats).
+
+    Returns:
+        Dict of per-row arrays: pmh, pml, premarket_vol, premarket_last
+        (NaN/0.0 for tickers without bars in the window).
+    """
+    mask = panel.between(start_ms, end_ms)
+    any_bar = mask.any(axis=1)
+    last = np.where(any_bar, mask.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1), 0)
+    rows = np.arange(len(panel.tickers))
+    return {
+        "pmh": np.where(any_bar, np.where(mask, panel.h, -np.inf).max(axis=1, initial=-np.inf), np.nan),
+        "pml": np.where(any_bar, np.where(mask, panel.l, np.inf).min(axis=1, initial=np.inf), np.nan),
+        "premarket_vol": np.where(mask, panel.v, 0.0).sum(axis=1),
+        "premarket_last": np.where(any_bar, panel.c[rows, last], np.nan),
+    }
+
+
+def session_vwap(panel: BarPanel, start_ms: int, end_ms: int) -> np.ndarray:
+    """
+    `indicators.vwap` of the typical price, accumulated from each ticker's
+    first bar in [start_ms, end_ms] (values outside the window are NaN or
+    carried forward and should not be read).
+    """
+    mask = panel.between(start_ms, end_ms)
+    typical = (panel.h + panel.l + panel.c) / 3.0
+    cum_pv = np.cumsum(np.where(mask, typical * panel.v, 0.0), axis=-1)
+    cum_v = np.cumsum(np.where(mask, panel.v, 0.0), axis=-1)
+    has_volume = cum_v != 0
+    return forward_fill(np.where(has_volume, cum_pv / np.where(has_volume, cum_v, 1.0), np.nan))
@@ -0,0 +1,127 @@
+"""Which indicator columns a config actually needs.
+
+Every column built for the simulator is registered as a `Feature` with its
+inputs (other features or raw bar fields) and its consumers: the strategy
+config switches under which `simulate_ybi_small_caps` / the portfolio
+simulator read it (no switch = always read). `FeaturePlan.from_config`
+keeps the consumed features plus everything they depend on; the engine
+computes only those and records the rest as skipped in `run_metadata.json`.
+
+Set `features.compute: all` to build every column (e.g. to inspect frames),
+or list extra columns under `features.include`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from ybi_strategy.config import Config
+from ybi_strategy.features.indicators import SESSION_COLUMNS
+from ybi_strategy.features.kernels import TREND_COLUMNS
+
+FEATURE_COMPUTE_MODES = ("required", "all")
+
+
+@dataclass(frozen=True)
+class Consumer:
+    """Strategy logic that reads a feature, active when its config switch is on (`key` None = always)."""
+
+    description: str
+    key: tuple[str, ...] | None = None
+    default: bool = True
+
+    def active(self, config: Config) -> bool:
+        return self.key is None or bool(config.get(*self.key, default=self.default))
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    inputs: tuple[str, ...] = ()
+    consumers: tuple[Consumer, ...] = ()
+
+
+def _flag(description: str, *key: str, default: bool = True) -> Consumer:
+    return Consumer(description, ("strategy_small_caps",) + key, default)
+
+
+FEATURES: dict[str, Feature] = {
+    f.name: f
+    for f in (
+        Feature("ema_8", ("c",), (_flag("exit on close below EMA8", "exits", "exit_on_close_below_ema8"),)),
+        Feature("ema_21", ("c",), (Consumer("micro filter, reclaim setups and stop base"),)),
+        Feature("ema_34", ("c",), (_flag("macro filter", "macro_filter", "require_above_ema_34"),)),
+        Feature("ema_55", ("c",), (_flag("macro filter", "macro_filter", "require_above_ema_55"),)),
+        Feature("sma_200", ("c",), (_flag("macro filter", "macro_filter", "require_above_sma_200", default=False),)),
+        Feature("ttm_bb_upper", ("c",)),
+        Feature("ttm_bb_lower", ("c",)),
+        Feature("ttm_kc_upper", ("h", "l", "c")),
+        Feature("ttm_kc_lower", ("h", "l", "c")),
+        Feature("ttm_squeeze_on", ("ttm_bb_upper", "ttm_bb_lower", "ttm_kc_upper", "ttm_kc_lower")),
+        Feature("momentum", ("h", "l", "c")),
+        Feature("ttm_state", ("momentum",), (Consumer("TTM entry gate and momentum exit"),)),
+        Feature("momentum_sign", ("momentum",), (
+            _flag("entry momentum filter", "entry", "require_momentum_bull"),
+            _flag("starter add-on", "allow_starter_entries"),
+            _flag("TTM momentum exit", "exits", "exit_on_ttm_momentum_bear"),
+        )),
+        Feature("hod_so_far", ("h",)),
+        Feature("lod_so_far", ("l",)),
+        Feature("vwap", ("h", "l", "c", "v"), (Consumer("reclaim setups and stop base"),)),
+        Feature("extension_from_ema8_pct", ("h", "ema_8"), (Consumer("max extension entry filter"),)),
+    )
+}
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    columns: tuple[str, ...]  # features to compute, in registry order
+    skipped: tuple[str, ...]
+
+    @staticmethod
+    def from_config(config: Config) -> "FeaturePlan":
+        """
+        Features read by the active strategy config, plus their inputs.
+
+        Returns:
+            FeaturePlan (every feature when `features.compute` is "all").
+        """
+        mode = str(config.get("features", "compute", default="required"))
+        if mode not in FEATURE_COMPUTE_MODES:
+            raise ValueError(f"Unknown features.compute {mode!r}; expected one of {FEATURE_COMPUTE_MODES}")
+        if mode == "all":
+            return FeaturePlan(columns=tuple(FEATURES), skipped=())
+
+        include = list(config.get("features", "include", default=None) or [])
+        unknown = sorted(set(include) - set(FEATURES))
+        if unknown:
+            raise ValueError(f"Unknown features in features.include: {unknown}")
+        wanted = [f.name for f in FEATURES.values() if any(c.active(config) for c in f.consumers)] + include
+        needed = resolve(wanted)
+        return FeaturePlan(
+            columns=tuple(name for name in FEATURES if name in needed),
+            skipped=tuple(name for name in FEATURES if name not in needed),
+        )
+
+    def trend_columns(self) -> tuple[str, ...]:
+        return tuple(name for name in self.columns if name in TREND_COLUMNS)
+
+    def session_columns(self) -> tuple[str, ...]:
+        return tuple(name for name in self.columns if name in SESSION_COLUMNS)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"computed": list(self.columns), "skipped": list(self.skipped)}
+
+
+def resolve(names: list[str]) -> set[str]:
+    """`names` plus every feature they depend on (raw bar fields are not included)."""
+    needed: set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name in needed or name not in FEATURES:
+            continue
+        needed.add(name)
+        stack.extend(FEATURES[name].inputs)
+    return needed
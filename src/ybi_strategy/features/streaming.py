@@ -0,0 +1,271 @@
+"""Incremental (bar-by-bar) indicator state.
+
+Each class keeps just enough state to produce the next value of its batch
+counterpart in `features.indicators` with an O(1) `update` (amortized O(1)
+for the rolling max/min), so a live or replay loop does not recompute the
+session history on every bar. Values match the batch functions bar for bar
+(within float tolerance), including across NaN inputs; NaN is returned
+until a window is full and while it holds a NaN.
+
+Scalar indicators take the new value (`update(x)`); bar indicators take a
+bar mapping with Polygon-style keys (`h`, `l`, `c`, `v`).
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Mapping
+
+NAN = float("nan")
+
+
+class EMA:
+    """
+    `ema(series, span)`: pandas `ewm(span, adjust=False)`, seeded with the first
+    non-NaN value. A NaN input returns the current value unchanged; as in
+    pandas, the old value's weight keeps decaying across the gap.
+    """
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = NAN
+        self._old_weight = 1.0
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(self.value):
+            self.value = x
+            return self.value
+        self._old_weight *= 1.0 - self.alpha
+        if math.isnan(x):
+            return self.value
+        self.value = (self._old_weight * self.value + self.alpha * x) / (self._old_weight + self.alpha)
+        self._old_weight = 1.0
+        return self.value
+
+
+class SMA:
+    """`sma(series, window)`: mean of the last `window` values (NaN until full or while one is NaN)."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque[float] = deque()
+        self._nans = 0
+        self._sum = 0.0  # of the non-NaN values
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        self._values.append(x)
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if math.isnan(old):
+                self._nans -= 1
+            else:
+                self._sum -= old
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return self._sum / self.window
+
+
+class RollingStd:
+    """Population (ddof=0) standard deviation of the last `window` values (NaN while one is NaN)."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque[float] = deque()
+        self._nans = 0
+        # Welford state over the non-NaN values in the window
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+
+    def _add(self, x: float) -> None:
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x: float) -> None:
+        self._count -= 1
+        if self._count == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (x - self._mean)
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        self._values.append(x)
+        old = self._values.popleft() if len(self._values) > self.window else None
+        if old is not None and not math.isnan(old) and not math.isnan(x) and self._count == self.window:
+            # Replace the oldest value in one step
+            new_mean = self._mean + (x - old) / self.window
+            self._m2 += (x - old) * (x - new_mean + old - self._mean)
+            self._mean = new_mean
+        else:
+            if old is not None:
+                if math.isnan(old):
+                    self._nans -= 1
+                else:
+                    self._remove(old)
+            if math.isnan(x):
+                self._nans += 1
+            else:
+                self._add(x)
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / self.window)
+
+
+class RollingMax:
+    """Max of the last `window` values (monotonic deque; amortized O(1); NaN while one is NaN)."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._n = 0
+        self._candidates: deque[tuple[int, float]] = deque()
+        self._nan_positions: deque[int] = deque()
+
+    def _better(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if math.isnan(x):
+            self._nan_positions.append(self._n)
+        else:
+            while self._candidates and self._better(x, self._candidates[-1][1]):
+                self._candidates.pop()
+            self._candidates.append((self._n, x))
+        oldest = self._n - self.window + 1  # first position still in the window
+        if self._candidates and self._candidates[0][0] < oldest:
+            self._candidates.popleft()
+        if self._nan_positions and self._nan_positions[0] < oldest:
+            self._nan_positions.popleft()
+        self._n += 1
+        if self._n < self.window or self._nan_positions:
+            return NAN
+        return self._candidates[0][1]
+
+
+class RollingMin(RollingMax):
+    """Min of the last `window` values."""
+
+    def _better(self, new: float, old: float) -> bool:
+        return new <= old
+
+
+class ATR:
+    """`atr(df, window)`: SMA of the true range (the first bar's TR is its high-low range)."""
+
+    def __init__(self, window: int) -> None:
+        self._sma = SMA(window)
+        self._prev_close = NAN
+
+    def update(self, bar: Mapping[str, float]) -> float:
+        h, l, c = float(bar["h"]), float(bar["l"]), float(bar["c"])
+        # Missing terms are skipped, like DataFrame.max(axis=1)
+        ranges = [r for r in (abs(h - l), abs(h - self._prev_close), abs(l - self._prev_close)) if not math.isnan(r)]
+        self._prev_close = c
+        return self._sma.update(max(ranges) if ranges else NAN)
+
+
+class VWAP:
+    """Causal cumulative VWAP of the typical price (h+l+c)/3; carries forward over zero volume."""
+
+    def __init__(self) -> None:
+        self._pv = 0.0
+        self._v = 0.0
+        self.value = NAN
+
+    def update(self, bar: Mapping[str, float]) -> float:
+        typical = (float(bar["h"]) + float(bar["l"]) + float(bar["c"])) / 3.0
+        volume = float(bar["v"])
+        self._pv += typical * volume
+        self._v += volume
+        if self._v != 0:
+            self.value = self._pv / self._v
+        return self.value
+
+
+class RollingLinReg:
+    """
+    Least-squares line over the last `window` values, evaluated at the newest
+    point (`indicators.rolling_linreg_last`). Keeps running sums of y and x*y;
+    a window containing NaN yields NaN.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self._values: deque[float] = deque()
+        self._nans = 0
+        self._sum_y = 0.0
+        self._sum_xy = 0.0  # x = 0..len-1 within the window, oldest first
+        self._x_mean = (window - 1) / 2.0
+        self._sxx = window * (window * window - 1) / 12.0
+
+    def update(self, y: float) -> float:
+        y = float(y)
+        missing = math.isnan(y)
+        y_val = 0.0 if missing else y
+        self._nans += missing
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            if math.isnan(old):
+                self._nans -= 1
+                old = 0.0
+            # Remaining values shift down one x position
+            self._sum_y -= old
+            self._sum_xy -= self._sum_y
+        self._sum_xy += len(self._values) * y_val
+        self._sum_y += y_val
+        self._values.append(y)
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        if self.window == 1:
+            return y
+        slope = (self._sum_xy - self._x_mean * self._sum_y) / self._sxx
+        return self._sum_y / self.window + slope * (self.window - 1 - self._x_mean)
+
+
+class TTMSqueeze:
+    """Incremental `ttm_squeeze_proxy`; `update` returns the same columns as the batch function."""
+
+    def __init__(self, length: int = 20, bb_mult: float = 2.0, kc_mult: float = 1.5) -> None:
+        self.bb_mult = bb_mult
+        self.kc_mult = kc_mult
+        self._sma = SMA(length)
+        self._std = RollingStd(length)
+        self._ema = EMA(length)
+        self._atr = ATR(length)
+        self._highest = RollingMax(length)
+        self._lowest = RollingMin(length)
+        self._momentum = RollingLinReg(length)
+
+    def update(self, bar: Mapping[str, float]) -> dict[str, float | bool]:
+        c = float(bar["c"])
+        sma_mid = self._sma.update(c)
+        std = self._std.update(c)
+        ema_mid = self._ema.update(c)
+        atr_val = self._atr.update(bar)
+        bb_upper = sma_mid + self.bb_mult * std
+        bb_lower = sma_mid - self.bb_mult * std
+        kc_upper = ema_mid + self.kc_mult * atr_val
+        kc_lower = ema_mid - self.kc_mult * atr_val
+        m1 = (self._highest.update(bar["h"]) + self._lowest.update(bar["l"])) / 2.0
+        momentum = self._momentum.update(c - (m1 + sma_mid) / 2.0)
+        return {
+            "ttm_bb_upper": bb_upper,
+            "ttm_bb_lower": bb_lower,
+            "ttm_kc_upper": kc_upper,
+            "ttm_kc_lower": kc_lower,
+            # NaN comparisons are False, as in the batch version
+            "ttm_squeeze_on": bool(bb_lower > kc_lower and bb_upper < kc_upper),
+            "momentum": momentum,
+        }
@@ -0,0 +1,101 @@
+"""Asyncio front-end for concurrent Polygon fetches.
+
+`AsyncPolygonClient` wraps a (synchronous) `PolygonClient` and runs its methods on
+worker threads, so calls share the client's pooled transport and HTTP cache.
+The `*_many` helpers fan out with bounded concurrency and always return results
+in the same order as their inputs, regardless of completion order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from typing import Any, Awaitable, Iterable, TypeVar
+
+from ybi_strategy.polygon.client import PolygonClient
+
+T = TypeVar("T")
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[T]],
+    *,
+    limit: int,
+    return_exceptions: bool = False,
+) -> list[T | BaseException]:
+    """
+    Like `asyncio.gather`, but with at most `limit` awaitables in flight.
+
+    Results are returned in input order. With `return_exceptions=True`, failures
+    are returned in place of results instead of cancelling the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(limit)))
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class AsyncPolygonClient:
+    """
+    Async counterpart of `PolygonClient` with bounded-concurrency batch methods.
+
+    Args:
+        client: The synchronous client to delegate to. Its transport pool size
+            should be >= `max_concurrency` so connections are not re-opened.
+        max_concurrency: Max requests in flight for the `*_many` methods.
+    """
+
+    def __init__(self, client: PolygonClient, *, max_concurrency: int = 8) -> None:
+        self.client = client
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    async def grouped_daily(self, d: date) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.grouped_daily, d)
+
+    async def minute_bars(self, ticker: str, d: date) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.client.minute_bars, ticker, d)
+
+    async def daily_bar(self, ticker: str, d: date) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.client.daily_bar, ticker, d)
+
+    async def ticker_details(self, ticker: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.client.ticker_details, ticker)
+
+    async def grouped_daily_many(
+        self, days: Iterable[date], *, return_exceptions: bool = False
+    ) -> list[Any]:
+        return await gather_bounded(
+            (self.grouped_daily(d) for d in days),
+            limit=self.max_concurrency,
+            return_exceptions=return_exceptions,
+        )
+
+    async def minute_bars_many(
+        self, tickers: Iterable[str], d: date, *, return_exceptions: bool = False
+    ) -> list[Any]:
+        return await gather_bounded(
+            (self.minute_bars(t, d) for t in tickers),
+            limit=self.max_concurrency,
+            return_exceptions=return_exceptions,
+        )
+
+    async def daily_bar_many(
+        self, tickers: Iterable[str], d: date, *, return_exceptions: bool = False
+    ) -> list[Any]:
+        return await gather_bounded(
+            (self.daily_bar(t, d) for t in tickers),
+            limit=self.max_concurrency,
+            return_exceptions=return_exceptions,
+        )
+
+    async def ticker_details_many(
+        self, tickers: Iterable[str], *, return_exceptions: bool = False
+    ) -> list[Any]:
+        return await gather_bounded(
+            (self.ticker_details(t) for t in tickers),
+            limit=self.max_concurrency,
+            return_exceptions=return_exceptions,
+        )
@@ -1,46 +1,115 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Any
+from urllib.parse import parse_qsl, urlparse
 
-import requests
-
+from ybi_strategy.config import Config
 from ybi_strategy.polygon.http_cache import HttpCache
+from ybi_strategy.polygon.memory_cache import HitCounter, MemoryCache
+from ybi_strategy.polygon.sqlite_cache import SqliteHttpCache
+from ybi_strategy.polygon.transport import HttpTransport
 
 
 class PolygonError(RuntimeError):
     pass
 
 
+def merge_stats(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Combine `PolygonClient.stats()` snapshots from several processes.
+
+    Counters and timings are summed; ratios (hit_rate, throttled_pct) are
+    recomputed from the sums and max_bytes keeps the per-process budget.
+    """
+    out: dict[str, Any] = {}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, dict):
+                out[key] = merge_stats([out.get(key, {}), value])
+            elif key == "max_bytes":
+                out[key] = max(out.get(key, 0), value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                out[key] = out.get(key, 0) + value
+    if "hit_rate" in out:
+        total = out.get("hits", 0) + out.get("misses", 0)
+        out["hit_rate"] = round(out.get("hits", 0) / total, 4) if total else 0.0
+    if "throttled_pct" in out:
+        total = out.get("fetch_seconds", 0.0) + out.get("throttled_seconds", 0.0)
+        out["throttled_pct"] = round(out.get("throttled_seconds", 0.0) / total * 100, 1) if total > 0 else 0.0
+    for key in ("fetch_seconds", "throttled_seconds"):
+        if key in out:
+            out[key] = round(out[key], 3)
+    return out
+
+
 @dataclass(frozen=True)
 class PolygonClient:
     api_key: str
     base_url: str = "https://api.polygon.io"
     timeout_s: int = 30
-    cache: HttpCache | None = None
+    cache: HttpCache | SqliteHttpCache | None = None
+    # Shared pooled session + retry policy. Excluded from eq/hash: it carries live
+    # connection state, not client identity.
+    transport: HttpTransport = field(default_factory=HttpTransport, compare=False, repr=False)
+    # Optional in-process LRU of parsed responses, consulted before `cache`.
+    # Returned objects are shared: callers must not mutate them.
+    memory: MemoryCache | None = field(default=None, compare=False, repr=False)
+    disk_counter: HitCounter = field(default_factory=HitCounter, compare=False, repr=False)
 
     @staticmethod
-    def from_env() -> "PolygonClient":
+    def from_env(config: Config | None = None) -> "PolygonClient":
         api_key = os.environ.get("POLYGON_API_KEY", "").strip()
         if not api_key:
             raise PolygonError("Missing POLYGON_API_KEY environment variable.")
+        # YBI_HTTP_CACHE_DB (single-file SQLite) takes precedence over the directory cache
+        cache_db = os.environ.get("YBI_HTTP_CACHE_DB", "").strip()
         cache_dir = os.environ.get("YBI_HTTP_CACHE_DIR", "").strip()
-        cache = HttpCache.from_dir(cache_dir) if cache_dir else None
-        return PolygonClient(api_key=api_key, cache=cache)
+        cache: HttpCache | SqliteHttpCache | None = None
+        if cache_db:
+            cache = SqliteHttpCache.from_path(cache_db)
+        elif cache_dir:
+            cache = HttpCache.from_dir(cache_dir)
+        memory_mb = float(config.get("polygon", "memory_cache_mb", default=0) or 0) if config is not None else 0.0
+        memory = MemoryCache(max_bytes=int(memory_mb * 1024 * 1024)) if memory_mb > 0 else None
+        return PolygonClient(
+            api_key=api_key,
+            cache=cache,
+            transport=HttpTransport.from_config(config),
+            memory=memory,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Request counters, fetch vs. rate-limit time, and memory/disk cache hit rates."""
+        out = self.transport.stats.to_dict()
+        if self.memory is not None:
+            out["memory_cache"] = self.memory.stats()
+        if self.cache is not None:
+            out["disk_cache"] = self.disk_counter.to_dict()
+        return out
 
     def _get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         url = f"{self.base_url}{path}"
         p = dict(params or {})
         p["apiKey"] = self.api_key
 
+        cache_params = {k: v for k, v in p.items() if k != "apiKey"}
+        if self.memory is not None:
+            cached = self.memory.get(url=url, params=cache_params)
+            if cached is not None:
+                return cached
+
         if self.cache is not None:
-            cached = self.cache.get(url=url, params={k: v for k, v in p.items() if k != "apiKey"})
+            cached = self.cache.get(url=url, params=cache_params)
+            self.disk_counter.record(cached is not None)
             if cached is not None:
+                if self.memory is not None:
+                    self.memory.put(url=url, params=cache_params, value=cached)
                 return cached
 
-        resp = requests.get(url, params=p, timeout=self.timeout_s)
+        resp = self.transport.get(url, params=p, timeout=self.timeout_s)
         if resp.status_code != 200:
             raise PolygonError(f"Polygon error {resp.status_code}: {resp.text[:500]}")
         data = resp.json()
@@ -50,7 +119,9 @@ class PolygonClient:
             raise PolygonError(f"Unexpected response: {type(data)}")
 
         if self.cache is not None:
-            self.cache.put(url=url, params={k: v for k, v in p.items() if k != "apiKey"}, value=data)
+            self.cache.put(url=url, params=cache_params, value=data)
+        if self.memory is not None:
+            self.memory.put(url=url, params=cache_params, value=data)
 
         return data
 
@@ -81,6 +152,35 @@ class PolygonClient:
             return None
         return results[0]
 
+    def list_tickers(self, *, d: date | None = None, market: str = "stocks", limit: int = 1000) -> list[dict[str, Any]]:
+        """
+        Fetch the full reference ticker listing, following `next_url` pagination.
+
+        Args:
+            d: Point-in-time date for the listing (None = current listing).
+            market: Polygon market filter ("stocks", "otc", ...).
+            limit: Page size (Polygon maximum is 1000).
+
+        Returns:
+            Rows with fields like ticker, type, market, active, delisted_utc.
+        """
+        path = "/v3/reference/tickers"
+        params: dict[str, Any] = {"market": market, "limit": limit}
+        if d is not None:
+            params["date"] = d.isoformat()
+        rows: list[dict[str, Any]] = []
+        while True:
+            data = self._get(path, params=params)
+            results = data.get("results", [])
+            if not isinstance(results, list):
+                raise PolygonError("Unexpected list_tickers results shape.")
+            rows.extend(results)
+            next_url = data.get("next_url")
+            if not next_url:
+                return rows
+            # next_url carries the cursor (and repeats the filters); the key is re-added by _get
+            params = {k: v for k, v in parse_qsl(urlparse(next_url).query) if k != "apiKey"}
+
     def ticker_details(self, ticker: str) -> dict[str, Any] | None:
         """
         Fetch ticker reference data for asset type classification.
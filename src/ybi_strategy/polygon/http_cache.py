@@ -1,39 +1,186 @@
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
+import os
+import tempfile
+import zlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+# Payload codecs for the sharded layout: name -> file suffix
+_SUFFIXES = {"gzip": ".json.gz", "zstd": ".json.zst", "none": ".json"}
 
 
 def _stable_json(value: Any) -> str:
     return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
 
 
+def cache_key(*, url: str, params: dict[str, Any]) -> str:
+    """Content key shared by all HTTP cache backends (sha256 of url + params)."""
+    payload = _stable_json({"url": url, "params": params})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("HTTP cache compression 'zstd' requires the 'zstandard' package.") from e
+    return zstandard
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        return _zstd().ZstdCompressor(level=10).compress(data)
+    return data
+
+
+def _decompress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".json.gz":
+        return gzip.decompress(data)
+    if suffix == ".json.zst":
+        return _zstd().ZstdDecompressor().decompress(data)
+    return data
+
+
 @dataclass(frozen=True)
 class HttpCache:
+    """
+    Directory cache of Polygon responses.
+
+    Layout: `<root>/<k[0:2]>/<k[2:4]>/<k>.json.gz` (two-level sharding by key
+    prefix, compressed payload). Entries written under another compression
+    setting are still read (`recompress` converts them); entries written by
+    older versions as flat `<root>/<k>.json` files are still read. Writes go to a temp file in the target directory and are
+    renamed into place, so concurrent writers never expose a partially
+    written entry.
+    """
     root: Path
+    compression: str = "gzip"
+
+    def __post_init__(self) -> None:
+        if self.compression not in _SUFFIXES:
+            raise ValueError(f"Unknown HTTP cache compression: {self.compression}")
 
     @staticmethod
-    def from_dir(path: str) -> "HttpCache":
+    def from_dir(path: str, compression: str | None = None) -> "HttpCache":
         p = Path(path)
         p.mkdir(parents=True, exist_ok=True)
-        return HttpCache(root=p)
+        if compression is None:
+            compression = os.environ.get("YBI_HTTP_CACHE_COMPRESSION", "").strip() or "gzip"
+        return HttpCache(root=p, compression=compression)
 
     def _key(self, *, url: str, params: dict[str, Any]) -> str:
-        payload = _stable_json({"url": url, "params": params})
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return cache_key(url=url, params=params)
+
+    def _path(self, key: str, compression: str | None = None) -> Path:
+        suffix = _SUFFIXES[compression or self.compression]
+        return self.root / key[:2] / key[2:4] / f"{key}{suffix}"
+
+    def _read(self, path: Path) -> dict[str, Any] | None:
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        suffix = next(sfx for sfx in (".json.gz", ".json.zst", ".json") if path.name.endswith(sfx))
+        try:
+            return json.loads(_decompress(raw, suffix).decode("utf-8"))
+        except (ValueError, OSError, EOFError, zlib.error):
+            # Truncated entry (e.g. from a pre-atomic-write crash): treat as a miss
+            return None
 
     def get(self, *, url: str, params: dict[str, Any]) -> dict[str, Any] | None:
         key = self._key(url=url, params=params)
-        path = self.root / f"{key}.json"
-        if not path.exists():
-            return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        value = self._read(self._path(key))
+        if value is None:
+            value = self._read_other_codec(key)
+        if value is None:
+            value = self._read(self.root / f"{key}.json")  # legacy flat layout
+        return value
+
+    def _read_other_codec(self, key: str) -> dict[str, Any] | None:
+        """
+        Entry written under another compression setting (left in place; use
+        `recompress` to convert a cache to the current codec).
+        """
+        for compression in _SUFFIXES:
+            if compression == self.compression:
+                continue
+            try:
+                value = self._read(self._path(key, compression))
+            except RuntimeError:
+                continue  # codec package not installed here
+            if value is not None:
+                return value
+        return None
 
     def put(self, *, url: str, params: dict[str, Any], value: dict[str, Any]) -> None:
-        key = self._key(url=url, params=params)
-        path = self.root / f"{key}.json"
-        path.write_text(_stable_json(value), encoding="utf-8")
+        self._write(self._key(url=url, params=params), value)
+
+    def _write(self, key: str, value: dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = _compress(_stable_json(value).encode("utf-8"), self.compression)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{key[:8]}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def recompress(self) -> int:
+        """
+        Rewrite sharded entries stored under another codec with the current one
+        and remove the originals. Entries whose codec package is not installed
+        are left as they are; legacy flat files are not touched.
+
+        Returns:
+            Number of entries rewritten.
+        """
+        rewritten = 0
+        for compression, suffix in _SUFFIXES.items():
+            if compression == self.compression:
+                continue
+            for path in sorted(self.root.glob(f"??/??/*{suffix}")):
+                key = path.name[: -len(suffix)]
+                if "." in key:
+                    continue
+                try:
+                    value = self._read(path)
+                except RuntimeError:
+                    continue
+                if value is None:
+                    continue
+                self._write(key, value)
+                path.unlink()
+                rewritten += 1
+        return rewritten
 
+    def iter_entries(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (key, value) for every readable entry in both layouts."""
+        seen: set[str] = set()
+        for suffix in _SUFFIXES.values():
+            for path in sorted(self.root.glob(f"??/??/*{suffix}")):
+                key = path.name[: -len(suffix)]
+                if key in seen or "." in key:
+                    continue
+                value = self._read(path)
+                if value is not None:
+                    seen.add(key)
+                    yield key, value
+        for path in sorted(self.root.glob("*.json")):
+            if path.stem in seen:
+                continue
+            value = self._read(path)
+            if value is not None:
+                yield path.stem, value
@@ -0,0 +1,128 @@
+"""In-process LRU tier for parsed Polygon responses.
+
+Sits in front of the disk cache (and the network) inside `PolygonClient._get`.
+Values are the parsed response dicts themselves, shared between callers, so
+consumers must treat them as read-only. Eviction is by an approximate in-memory
+byte footprint rather than entry count, since a minute-bar response is orders
+of magnitude larger than a ticker-details response.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from ybi_strategy.polygon.http_cache import _stable_json, cache_key
+
+# Rough CPython footprint of one parsed JSON row: dict overhead + per-key slot/value
+_ROW_OVERHEAD_BYTES = 104
+_FIELD_BYTES = 72
+
+
+def estimate_nbytes(value: dict[str, Any]) -> int:
+    """Approximate memory held by a parsed Polygon response (cheap; no serialization)."""
+    results = value.get("results")
+    if isinstance(results, list):
+        if results and isinstance(results[0], dict):
+            return 256 + len(results) * (_ROW_OVERHEAD_BYTES + _FIELD_BYTES * len(results[0]))
+        return 256 + 32 * len(results)
+    return 4 * len(_stable_json(value))
+
+
+@dataclass
+class HitCounter:
+    """Thread-safe hit/miss counter."""
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+@dataclass
+class MemoryCache:
+    """
+    Size-bounded LRU of parsed responses keyed like the disk caches.
+
+    Args:
+        max_bytes: Approximate memory budget; least-recently-used entries are
+            evicted once the estimated total exceeds it. Single entries larger
+            than the budget are not cached.
+    """
+    max_bytes: int
+    counter: HitCounter = field(default_factory=HitCounter)
+    evictions: int = 0
+    _entries: "OrderedDict[str, tuple[dict[str, Any], int]]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _nbytes: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def get(self, *, url: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        key = cache_key(url=url, params=params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self.counter.record(entry is not None)
+        return entry[0] if entry is not None else None
+
+    def put(self, *, url: str, params: dict[str, Any], value: dict[str, Any]) -> None:
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        key = cache_key(url=url, params=params)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_bytes
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, nbytes, evictions = len(self._entries), self._nbytes, self.evictions
+        return {
+            **self.counter.to_dict(),
+            "entries": entries,
+            "approx_bytes": nbytes,
+            "max_bytes": self.max_bytes,
+            "evictions": evictions,
+        }
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Ship configuration only; each process builds its own working set.
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(max_bytes=state["max_bytes"])  # type: ignore[misc]
@@ -0,0 +1,173 @@
+"""Token-bucket rate limiting for Polygon requests.
+
+One `RateLimiter` is shared by every thread (and asyncio task, which run client
+calls on threads) using a transport. When `state_file` is set, the bucket state
+lives in that file under an exclusive OS file lock, so separate processes (e.g.
+process-pool workers or concurrent backtests) draw from the same budget.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ybi_strategy.config import Config
+
+try:  # POSIX
+    import fcntl
+
+    def _lock_fd(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_fd(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_fd(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_fd(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@dataclass
+class RateLimiter:
+    """
+    Token bucket allowing `requests_per_minute` on average and `burst` at once.
+
+    `max_in_flight` additionally caps concurrent requests within this process
+    (0 = unlimited). `acquire()` blocks until a token is available and returns
+    the seconds spent waiting.
+    """
+    requests_per_minute: float
+    burst: int = 1
+    max_in_flight: int = 0
+    state_file: Path | None = None
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+    _tokens: float = field(default=-1.0, init=False, repr=False)
+    _ts: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _in_flight: threading.BoundedSemaphore | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be > 0")
+        self.burst = max(1, int(self.burst))
+        if self.state_file is not None:
+            self.state_file = Path(self.state_file)
+        self._init_semaphore()
+
+    def _init_semaphore(self) -> None:
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight) if self.max_in_flight > 0 else None
+
+    @staticmethod
+    def from_config(config: Config | None) -> "RateLimiter | None":
+        """Build from `polygon.rate_limit`; returns None when the limit is disabled."""
+        if config is None:
+            return None
+        rpm = float(config.get("polygon", "rate_limit", "requests_per_minute", default=0) or 0)
+        if rpm <= 0:
+            return None
+        state_file = config.get("polygon", "rate_limit", "state_file", default=None)
+        return RateLimiter(
+            requests_per_minute=rpm,
+            burst=int(config.get("polygon", "rate_limit", "burst", default=1)),
+            max_in_flight=int(config.get("polygon", "rate_limit", "max_in_flight", default=0) or 0),
+            state_file=Path(state_file) if state_file else None,
+        )
+
+    @property
+    def rate_per_s(self) -> float:
+        return self.requests_per_minute / 60.0
+
+    @contextmanager
+    def _bucket(self) -> Iterator[dict[str, float]]:
+        """Yield the mutable bucket state under the thread lock (and file lock, if shared)."""
+        with self._lock:
+            if self.state_file is None:
+                state = {"tokens": self._tokens, "ts": self._ts}
+                yield state
+                self._tokens, self._ts = state["tokens"], state["ts"]
+                return
+
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(fd)
+                try:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    raw = os.read(fd, 256)
+                    try:
+                        state = json.loads(raw.decode("utf-8")) if raw else {}
+                    except ValueError:
+                        state = {}
+                    state = {"tokens": float(state.get("tokens", -1.0)), "ts": float(state.get("ts", 0.0))}
+                    yield state
+                    payload = json.dumps(state).encode("utf-8")
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.ftruncate(fd, 0)
+                    os.write(fd, payload)
+                finally:
+                    _unlock_fd(fd)
+            finally:
+                os.close(fd)
+
+    def _take_token(self) -> float:
+        """Take one token if available; otherwise return seconds until one accrues."""
+        with self._bucket() as state:
+            now = self.clock()
+            if state["tokens"] < 0:  # fresh bucket starts full
+                tokens = float(self.burst)
+            else:
+                tokens = min(float(self.burst), state["tokens"] + max(0.0, now - state["ts"]) * self.rate_per_s)
+            state["ts"] = now
+            if tokens >= 1.0:
+                state["tokens"] = tokens - 1.0
+                return 0.0
+            state["tokens"] = tokens
+            return (1.0 - tokens) / self.rate_per_s
+
+    def acquire(self) -> float:
+        """Block until a request may be sent. Returns seconds spent throttled."""
+        waited = 0.0
+        while True:
+            wait = self._take_token()
+            if wait <= 0:
+                return waited
+            self.sleep(wait)
+            waited += wait
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """Acquire a token and an in-flight slot for one request; yields seconds throttled."""
+        start = time.perf_counter()
+        if self._in_flight is not None:
+            self._in_flight.acquire()
+        try:
+            slot_wait = time.perf_counter() - start
+            yield slot_wait + self.acquire()
+        finally:
+            if self._in_flight is not None:
+                self._in_flight.release()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        state.pop("_in_flight", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._init_semaphore()
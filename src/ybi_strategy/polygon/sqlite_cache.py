@@ -0,0 +1,231 @@
+"""Single-file SQLite backend for the Polygon HTTP cache.
+
+Drop-in alternative to the one-file-per-response `HttpCache`: every response is
+a row keyed by the same sha256 content key, with a zlib-compressed JSON payload
+and index columns (endpoint, ticker, day) parsed from the request URL. Lookups
+go through the primary-key B-tree (O(log n)) instead of a directory listing.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+
+from ybi_strategy.polygon.http_cache import HttpCache, _stable_json, cache_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT,
+    params TEXT,
+    endpoint TEXT,
+    ticker TEXT,
+    day TEXT,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_endpoint_ticker_day ON responses (endpoint, ticker, day);
+CREATE INDEX IF NOT EXISTS responses_day ON responses (day);
+"""
+
+_AGGS_PATH = re.compile(r"^/v2/aggs/ticker/([^/]+)/range/\d+/(\w+)/(\d{4}-\d{2}-\d{2})/")
+_GROUPED_PATH = re.compile(r"^/v2/aggs/grouped/locale/\w+/market/\w+/(\d{4}-\d{2}-\d{2})$")
+_DETAILS_PATH = re.compile(r"^/v3/reference/tickers/([^/]+)$")
+
+_MARKET_TZ = ZoneInfo("America/New_York")
+
+# SQLite caps bound parameters per statement; chunk IN (...) queries below this.
+_MAX_VARS = 500
+
+
+def index_fields(url: str) -> tuple[str, str | None, str | None]:
+    """Parse (endpoint, ticker, day) index columns from a Polygon request URL."""
+    path = urlparse(url).path
+    m = _AGGS_PATH.match(path)
+    if m:
+        return f"aggs_{m.group(2)}", m.group(1), m.group(3)
+    m = _GROUPED_PATH.match(path)
+    if m:
+        return "grouped_daily", None, m.group(1)
+    m = _DETAILS_PATH.match(path)
+    if m:
+        return "ticker_details", m.group(1), None
+    return path, None, None
+
+
+def _infer_index_from_payload(value: dict[str, Any]) -> tuple[str | None, str | None, str | None]:
+    """
+    Best-effort (endpoint, ticker, day) for entries migrated from the directory
+    cache, which stores only the sha256 key and payload (the URL is not recoverable).
+    """
+    results = value.get("results")
+    if isinstance(results, dict):
+        return "ticker_details", results.get("ticker"), None
+    if not isinstance(results, list):
+        return None, value.get("ticker"), None
+    day = None
+    if results and isinstance(results[0], dict) and "t" in results[0]:
+        day = datetime.fromtimestamp(int(results[0]["t"]) / 1000, tz=_MARKET_TZ).date().isoformat()
+    if results and isinstance(results[0], dict) and "T" in results[0] and "ticker" not in value:
+        return "grouped_daily", None, day
+    return None, value.get("ticker"), day
+
+
+def _encode(value: dict[str, Any]) -> bytes:
+    return zlib.compress(_stable_json(value).encode("utf-8"), 6)
+
+
+def _decode(blob: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+@dataclass
+class SqliteHttpCache:
+    path: Path
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+
+    @staticmethod
+    def from_path(path: str | Path) -> "SqliteHttpCache":
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        cache = SqliteHttpCache(path=p)
+        cache._conn()  # create schema eagerly so misconfiguration fails fast
+        return cache
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed during writes.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, *, url: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        row = self._conn().execute(
+            "SELECT payload FROM responses WHERE key = ?", (cache_key(url=url, params=params),)
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def put(self, *, url: str, params: dict[str, Any], value: dict[str, Any]) -> None:
+        self.put_many([(url, params, value)])
+
+    def get_many(self, requests: Iterable[tuple[str, dict[str, Any]]]) -> list[dict[str, Any] | None]:
+        """Batched lookup; returns payloads (or None) in request order."""
+        keys = [cache_key(url=url, params=params) for url, params in requests]
+        found: dict[str, bytes] = {}
+        conn = self._conn()
+        for i in range(0, len(keys), _MAX_VARS):
+            chunk = keys[i:i + _MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            for key, payload in conn.execute(
+                f"SELECT key, payload FROM responses WHERE key IN ({placeholders})", chunk
+            ):
+                found[key] = payload
+        return [_decode(found[k]) if k in found else None for k in keys]
+
+    def put_many(self, items: Iterable[tuple[str, dict[str, Any], dict[str, Any]]]) -> None:
+        """Batched insert/replace in a single transaction."""
+        now = time.time()
+        rows = []
+        for url, params, value in items:
+            endpoint, ticker, day = index_fields(url)
+            rows.append((
+                cache_key(url=url, params=params), url, _stable_json(params),
+                endpoint, ticker, day, _encode(value), now,
+            ))
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, url, params, endpoint, ticker, day, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def find(
+        self,
+        *,
+        endpoint: str | None = None,
+        ticker: str | None = None,
+        day: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """List index rows (key, url, endpoint, ticker, day) matching the given filters."""
+        clauses, args = [], []
+        for column, value in (("endpoint", endpoint), ("ticker", ticker), ("day", day)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur = self._conn().execute(
+            f"SELECT key, url, endpoint, ticker, day FROM responses{where} ORDER BY endpoint, ticker, day", args
+        )
+        cols = ["key", "url", "endpoint", "ticker", "day"]
+        return [dict(zip(cols, row)) for row in cur]
+
+    def stats(self) -> dict[str, Any]:
+        entries, payload_bytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM responses"
+        ).fetchone()
+        return {
+            "entries": entries,
+            "payload_bytes": payload_bytes,
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.path = state["path"]
+        self._local = threading.local()
+
+
+def migrate_dir_cache(src_dir: str | Path, dst: SqliteHttpCache, *, batch_size: int = 1000) -> int:
+    """
+    Copy a directory cache (flat or sharded/compressed layout) into `dst`.
+
+    Keys are preserved, so lookups by (url, params) hit the migrated rows. The
+    original URL is not stored by the directory format; index columns are
+    inferred from the payload where possible. Returns the number of entries copied.
+    """
+    conn = dst._conn()
+    now = time.time()
+    copied = 0
+    batch: list[tuple[Any, ...]] = []
+
+    def _flush() -> None:
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO responses (key, url, params, endpoint, ticker, day, payload, created_at) "
+                "VALUES (?, NULL, NULL, ?, ?, ?, ?, ?)",
+                batch,
+            )
+        batch.clear()
+
+    for key, value in HttpCache(root=Path(src_dir)).iter_entries():
+        endpoint, ticker, day = _infer_index_from_payload(value)
+        batch.append((key, endpoint, ticker, day, _encode(value), now))
+        copied += 1
+        if len(batch) >= batch_size:
+            _flush()
+    if batch:
+        _flush()
+    return copied
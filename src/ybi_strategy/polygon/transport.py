@@ -0,0 +1,183 @@
+"""Pooled, retrying HTTP transport for Polygon requests.
+
+A single `requests.Session` is shared by every call made through a client so that
+TCP/TLS connections are reused from a connection pool instead of being re-opened
+per request. Throttling (429) and transient server errors (5xx) are retried with
+capped, jittered exponential backoff. An optional `RateLimiter` gates every
+attempt (including retries), and `TransportStats` records time spent throttled
+versus fetching.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ybi_strategy.config import Config
+from ybi_strategy.polygon.rate_limit import RateLimiter
+
+# Status codes that indicate a transient condition worth retrying.
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class TransportStats:
+    """Thread-safe counters for requests sent through a transport."""
+    requests: int = 0
+    retries: int = 0
+    fetch_s: float = 0.0
+    throttled_s: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record(self, *, fetch_s: float, throttled_s: float, retry: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += int(retry)
+            self.fetch_s += fetch_s
+            self.throttled_s += throttled_s
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.fetch_s + self.throttled_s
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "fetch_seconds": round(self.fetch_s, 3),
+                "throttled_seconds": round(self.throttled_s, 3),
+                "throttled_pct": round(self.throttled_s / total * 100, 1) if total > 0 else 0.0,
+            }
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+@dataclass
+class HttpTransport:
+    """
+    Shared `requests.Session` with a sized connection pool and retry policy.
+
+    Args:
+        pool_size: Max pooled connections per host. Should be >= the number of
+            threads issuing requests concurrently through this transport.
+        max_retries: Retries after the first attempt (0 disables retrying).
+        backoff_base_s: Base delay; attempt k waits up to base * 2**k seconds.
+        backoff_max_s: Upper bound on any single backoff delay.
+        rate_limiter: Optional token bucket consulted before every attempt.
+        sleep: Injected for tests; defaults to `time.sleep`.
+    """
+    pool_size: int = 16
+    max_retries: int = 4
+    backoff_base_s: float = 0.5
+    backoff_max_s: float = 30.0
+    rate_limiter: RateLimiter | None = None
+    stats: TransportStats = field(default_factory=TransportStats, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    _session: requests.Session | None = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @staticmethod
+    def from_config(config: Config | None) -> "HttpTransport":
+        """Build a transport from the `polygon` section of the strategy config."""
+        if config is None:
+            return HttpTransport()
+        return HttpTransport(
+            pool_size=int(config.get("polygon", "pool_size", default=16)),
+            max_retries=int(config.get("polygon", "max_retries", default=4)),
+            backoff_base_s=float(config.get("polygon", "backoff_base_s", default=0.5)),
+            backoff_max_s=float(config.get("polygon", "backoff_max_s", default=30.0)),
+            rate_limiter=RateLimiter.from_config(config),
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        # Created lazily (and re-created after unpickling) so transports can be
+        # shipped to worker processes.
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def backoff_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Delay before retry number `attempt` (0-based), using "full jitter".
+
+        A numeric `Retry-After` header is honoured as a lower bound.
+        """
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt))
+        delay = random.uniform(0.0, cap)
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max_s))
+            except ValueError:
+                pass
+        return delay
+
+    def get(self, url: str, *, params: dict[str, Any] | None = None, timeout: float = 30) -> requests.Response:
+        """
+        GET `url`, retrying 429/5xx responses and connection errors.
+
+        Returns the final response (which may still be a non-200 once retries are
+        exhausted). Connection errors re-raise after the last attempt.
+        """
+        attempt = 0
+        while True:
+            try:
+                resp = self._send(url, params=params, timeout=timeout, retry=attempt > 0)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return resp
+            self.sleep(self.backoff_delay(attempt, resp.headers.get("Retry-After")))
+            attempt += 1
+
+    def _send(self, url: str, *, params: dict[str, Any] | None, timeout: float, retry: bool) -> requests.Response:
+        if self.rate_limiter is None:
+            return self._timed_get(url, params=params, timeout=timeout, retry=retry, throttled_s=0.0)
+        with self.rate_limiter.slot() as throttled_s:
+            return self._timed_get(url, params=params, timeout=timeout, retry=retry, throttled_s=throttled_s)
+
+    def _timed_get(
+        self, url: str, *, params: dict[str, Any] | None, timeout: float, retry: bool, throttled_s: float
+    ) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            return self.session.get(url, params=params, timeout=timeout)
+        finally:
+            self.stats.record(fetch_s=time.perf_counter() - start, throttled_s=throttled_s, retry=retry)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,154 @@
+"""Stage timers and counters for backtest runs.
+
+`Profiler.stage(name, day)` times a block and `Profiler.count(name, n, day)`
+bumps a counter; both aggregate per stage/counter over the run and per trading
+day. A disabled profiler (the default) makes both no-ops. Worker processes
+`drain()` their profiler after each day and the parent `merge()`s it, so
+`profile.json` covers parallel runs too.
+
+Stage times are wall-clock per call. Loading stages run on prefetch threads
+concurrently with simulation, so stage totals can exceed the run's elapsed time.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterator
+
+# cProfile output written next to profile.json when requested
+CPROFILE_FILE = "profile.pstats"
+
+
+def _empty_stage() -> dict[str, float]:
+    return {"calls": 0, "seconds": 0.0, "max_seconds": 0.0}
+
+
+class Profiler:
+    """Thread-safe stage timers and counters, aggregated per stage and per day."""
+
+    def __init__(self, enabled: bool = True, *, cprofile: bool = False) -> None:
+        self.enabled = enabled
+        # Also run the (main-process) backtest under cProfile
+        self.cprofile = cprofile and enabled
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, float] = {}
+        self.days: dict[str, dict[str, dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def disabled() -> "Profiler":
+        return Profiler(enabled=False)
+
+    @contextmanager
+    def stage(self, name: str, day: date | None = None) -> Iterator[None]:
+        """Time the enclosed block under `name` (and under `day`, if given)."""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_stage(name, time.perf_counter() - t0, day)
+
+    def count(self, name: str, n: float = 1, day: date | None = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            if day is not None:
+                counters = self._day(day.isoformat())["counters"]
+                counters[name] = counters.get(name, 0) + n
+
+    def _add_stage(self, name: str, seconds: float, day: date | None) -> None:
+        with self._lock:
+            s = self.stages.setdefault(name, _empty_stage())
+            s["calls"] += 1
+            s["seconds"] += seconds
+            s["max_seconds"] = max(s["max_seconds"], seconds)
+            if day is not None:
+                stages = self._day(day.isoformat())["stages"]
+                stages[name] = stages.get(name, 0.0) + seconds
+
+    def _day(self, key: str) -> dict[str, dict[str, float]]:
+        return self.days.setdefault(key, {"stages": {}, "counters": {}})
+
+    def snapshot(self) -> dict[str, Any]:
+        """Raw aggregates (picklable; see `merge`)."""
+        with self._lock:
+            return json.loads(json.dumps({"stages": self.stages, "counters": self.counters, "days": self.days}))
+
+    def drain(self) -> dict[str, Any]:
+        """Snapshot and reset (used by worker processes after each day)."""
+        with self._lock:
+            out = {"stages": self.stages, "counters": self.counters, "days": self.days}
+            self.stages, self.counters, self.days = {}, {}, {}
+        return out
+
+    def merge(self, part: dict[str, Any]) -> None:
+        """Add another profiler's `snapshot()`/`drain()` into this one."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, other in part.get("stages", {}).items():
+                s = self.stages.setdefault(name, _empty_stage())
+                s["calls"] += other["calls"]
+                s["seconds"] += other["seconds"]
+                s["max_seconds"] = max(s["max_seconds"], other["max_seconds"])
+            for name, n in part.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            for key, other in part.get("days", {}).items():
+                day = self._day(key)
+                for kind in ("stages", "counters"):
+                    for name, v in other.get(kind, {}).items():
+                        day[kind][name] = day[kind].get(name, 0) + v
+
+    def to_dict(self, *, elapsed_seconds: float | None = None, extra: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Report for `profile.json`.
+
+        Args:
+            elapsed_seconds: Wall-clock duration of the run (for stage shares).
+            extra: Additional sections (e.g. API usage) added verbatim.
+
+        Returns:
+            Dict with per-stage totals (sorted by time), counters and per-day breakdowns.
+        """
+        snap = self.snapshot()
+        stages = {}
+        for name, s in sorted(snap["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+            stages[name] = {
+                "calls": int(s["calls"]),
+                "seconds": round(s["seconds"], 6),
+                "mean_ms": round(s["seconds"] / s["calls"] * 1000, 3) if s["calls"] else 0.0,
+                "max_ms": round(s["max_seconds"] * 1000, 3),
+            }
+            if elapsed_seconds:
+                stages[name]["pct_of_elapsed"] = round(s["seconds"] / elapsed_seconds * 100, 1)
+        days = {
+            key: {
+                "stages": {k: round(v, 6) for k, v in day["stages"].items()},
+                "counters": day["counters"],
+            }
+            for key, day in sorted(snap["days"].items())
+        }
+        report: dict[str, Any] = {"stages": stages, "counters": snap["counters"], "days": days}
+        if elapsed_seconds is not None:
+            report["elapsed_seconds"] = round(elapsed_seconds, 6)
+        report.update(extra or {})
+        return report
+
+    def write(self, path: Path, **kwargs: Any) -> None:
+        path.write_text(json.dumps(self.to_dict(**kwargs), indent=2, sort_keys=False), encoding="utf-8")
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker copies start empty; their totals come back through drain()/merge()
+        return {"enabled": self.enabled, "cprofile": False}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["enabled"], cprofile=state["cprofile"])
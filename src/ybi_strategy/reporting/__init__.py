@@ -5,15 +5,25 @@ from ybi_strategy.reporting.metrics import (
     PerformanceMetrics,
 )
 from ybi_strategy.reporting.analysis import (
+    load_backtest_output,
     stratified_analysis,
     monte_carlo_simulation,
     walk_forward_validation,
 )
+from ybi_strategy.reporting.summary import (
+    AnalysisSettings,
+    analyze_results,
+    summarize_trades,
+)
 
 __all__ = [
     "compute_metrics",
     "PerformanceMetrics",
+    "load_backtest_output",
     "stratified_analysis",
     "monte_carlo_simulation",
     "walk_forward_validation",
+    "AnalysisSettings",
+    "analyze_results",
+    "summarize_trades",
 ]
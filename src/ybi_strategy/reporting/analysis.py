@@ -4,14 +4,44 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
+from ybi_strategy.backtest.writers import OUTPUT_FORMATS, read_output_frame
 from ybi_strategy.reporting.metrics import compute_metrics, PerformanceMetrics
 
 
+def load_backtest_output(
+    path: str | Path,
+    name: str = "trades",
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Load a backtest output written as CSV or Parquet.
+
+    All analysis functions in this module accept either result: CSV frames
+    carry ISO timestamp strings, Parquet frames tz-aware timestamps and
+    categorical tickers/reasons; both are parsed the same way downstream.
+
+    Args:
+        path: Output file (`trades.csv`, `trades.parquet`, ...) or a results
+            directory, in which case `<name>.parquet` is preferred over `<name>.csv`.
+        name: Output name when `path` is a directory.
+        columns: Optional subset of columns to load.
+
+    Returns:
+        DataFrame (empty if the output is missing or has no rows).
+    """
+    p = Path(path)
+    if p.is_dir():
+        candidates = [p / f"{name}.{fmt}" for fmt in reversed(OUTPUT_FORMATS)]
+        p = next((c for c in candidates if c.exists()), candidates[-1])
+    return read_output_frame(p, columns=columns)
+
+
 @dataclass
 class StratifiedAnalysis:
     """Results of stratified performance analysis."""
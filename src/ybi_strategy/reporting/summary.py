@@ -0,0 +1,284 @@
+"""Summary statistics for a backtest, gated by analysis level.
+
+Levels (config `analysis.level`, CLI `--analysis`):
+
+- `none`: performance metrics only.
+- `core`: + stratified analysis, leakage audit and HAC daily-series inference
+  (all closed-form / single pass).
+- `full`: + Monte Carlo, walk-forward, block bootstrap and the heuristic
+  stress tests (resampling-heavy; each can be switched off individually).
+
+Statistics skipped by a run can be computed later from its saved outputs with
+`python -m ybi_strategy analyze <results_dir>`.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from ybi_strategy.config import Config
+from ybi_strategy.reporting.analysis import (
+    block_bootstrap_test,
+    daily_series_inference,
+    leakage_audit,
+    load_backtest_output,
+    monte_carlo_simulation,
+    shuffle_dates_negative_control,
+    stratified_analysis,
+    time_shift_negative_control,
+    walk_forward_validation,
+)
+from ybi_strategy.reporting.metrics import compute_metrics
+
+ANALYSIS_LEVELS = ("none", "core", "full")
+
+# Lowest level at which each component runs
+COMPONENT_LEVELS = {
+    "stratified": "core",
+    "leakage_audit": "core",
+    "hac": "core",
+    "monte_carlo": "full",
+    "walk_forward": "full",
+    "bootstrap": "full",
+    "stress_tests": "full",
+}
+
+# Day statuses included in the daily P&L series
+ELIGIBLE_DAY_STATUSES = ("ok", "no_trades", "no_watchlist")
+
+# Watchlist columns used by the summary (stratified analysis merges the gap column)
+SUMMARY_WATCHLIST_COLUMNS = ("date", "ticker", "gap_pct", "premarket_pct")
+
+
+@dataclass(frozen=True)
+class AnalysisSettings:
+    level: str = "full"
+    # Per-component switches (only consulted at or above the component's level)
+    stratified: bool = True
+    leakage_audit: bool = True
+    hac: bool = True
+    monte_carlo: bool = True
+    walk_forward: bool = True
+    bootstrap: bool = True
+    stress_tests: bool = True
+    monte_carlo_simulations: int = 10000
+    walk_forward_folds: int = 5
+    walk_forward_train_pct: float = 0.7
+    bootstrap_samples: int = 10000
+    stress_test_simulations: int = 1000
+    stress_test_shift_minutes: int = 5
+    seed: int = 42
+
+    @staticmethod
+    def from_config(config: Config, level: str | None = None) -> "AnalysisSettings":
+        """
+        Build from the `analysis` config section.
+
+        Args:
+            config: Strategy config.
+            level: Overrides `analysis.level` (e.g. from `--analysis`).
+
+        Returns:
+            AnalysisSettings (defaults reproduce the full historical summary).
+        """
+        def get(*keys: str, default: Any) -> Any:
+            return config.get("analysis", *keys, default=default)
+
+        settings = AnalysisSettings(
+            level=str(level or get("level", default="full")),
+            stratified=bool(get("stratified", "enabled", default=True)),
+            leakage_audit=bool(get("leakage_audit", "enabled", default=True)),
+            hac=bool(get("hac", "enabled", default=True)),
+            monte_carlo=bool(get("monte_carlo", "enabled", default=True)),
+            walk_forward=bool(get("walk_forward", "enabled", default=True)),
+            bootstrap=bool(get("bootstrap", "enabled", default=True)),
+            stress_tests=bool(get("stress_tests", "enabled", default=True)),
+            monte_carlo_simulations=int(get("monte_carlo", "n_simulations", default=10000)),
+            walk_forward_folds=int(get("walk_forward", "n_folds", default=5)),
+            walk_forward_train_pct=float(get("walk_forward", "train_pct", default=0.7)),
+            bootstrap_samples=int(get("bootstrap", "n_bootstrap", default=10000)),
+            stress_test_simulations=int(get("stress_tests", "n_simulations", default=1000)),
+            stress_test_shift_minutes=int(get("stress_tests", "shift_minutes", default=5)),
+        )
+        if settings.level not in ANALYSIS_LEVELS:
+            raise ValueError(f"Unknown analysis level {settings.level!r}; expected one of {ANALYSIS_LEVELS}")
+        return settings
+
+    def runs(self, component: str) -> bool:
+        """True if `component` is enabled and within the configured level."""
+        within = ANALYSIS_LEVELS.index(self.level) >= ANALYSIS_LEVELS.index(COMPONENT_LEVELS[component])
+        return within and bool(getattr(self, component))
+
+    def skipped(self) -> list[str]:
+        return [c for c in COMPONENT_LEVELS if not self.runs(c)]
+
+
+def eligible_trading_days(audit_df: pd.DataFrame) -> list[str]:
+    """
+    Dates (ISO strings) that belong in the daily P&L series.
+
+    CRITICAL: Error days are MISSING DATA, not "flat performance" - they must be
+    excluded to avoid biasing Sharpe/significance statistics. Holidays (market
+    closed) are excluded too - no trading could occur.
+    """
+    if audit_df.empty:
+        return []
+    return audit_df[audit_df["status"].astype(str).isin(ELIGIBLE_DAY_STATUSES)]["date"].astype(str).tolist()
+
+
+def summarize_trades(
+    trades_df: pd.DataFrame,
+    *,
+    settings: AnalysisSettings,
+    account_equity: float,
+    watchlist_df: pd.DataFrame | None = None,
+    all_trading_days: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Performance metrics plus the statistics enabled by `settings`.
+
+    Args:
+        trades_df: Trades (CSV or Parquet frame).
+        settings: Analysis level, component switches and simulation counts.
+        account_equity: Starting equity for return-based metrics.
+        watchlist_df: Watchlist rows (gap buckets for stratified analysis).
+        all_trading_days: Eligible days, including 0-trade days.
+
+    Returns:
+        Summary dict; sections for skipped components are omitted.
+    """
+    if trades_df.empty:
+        return {"trades": 0}
+
+    seed = settings.seed
+    # Compute comprehensive metrics with all trading days for proper Sharpe/Sortino
+    metrics = compute_metrics(
+        trades_df,
+        account_equity=account_equity,
+        all_trading_days=all_trading_days,
+    )
+    summary: dict[str, Any] = {"metrics": metrics.to_dict()}
+
+    if settings.runs("stratified"):
+        summary["stratified_analysis"] = stratified_analysis(
+            trades_df,
+            watchlist_df=watchlist_df,
+            account_equity=account_equity,
+        ).to_dict()
+
+    if settings.runs("monte_carlo"):
+        summary["monte_carlo"] = monte_carlo_simulation(
+            trades_df,
+            n_simulations=settings.monte_carlo_simulations,
+            account_equity=account_equity,
+            random_seed=seed,
+        ).to_dict()
+
+    if settings.runs("walk_forward"):
+        summary["walk_forward"] = walk_forward_validation(
+            trades_df,
+            n_folds=settings.walk_forward_folds,
+            train_pct=settings.walk_forward_train_pct,
+            account_equity=account_equity,
+        ).to_dict()
+
+    # Statistical inference (hypothesis tests)
+    inference: dict[str, Any] = {}
+    if settings.runs("hac"):
+        # Daily series inference with HAC (Newey-West) standard errors
+        # This is the PRIMARY inference method that accounts for autocorrelation
+        inference["daily_series_hac"] = {
+            "description": "PRIMARY inference method using HAC (Newey-West) standard errors to account for autocorrelation in daily returns.",
+            **daily_series_inference(trades_df, all_trading_days=all_trading_days).to_dict(),
+        }
+    if settings.runs("bootstrap"):
+        # NOTE: This is an INFERENCE method testing H0: E[daily P&L] = 0,
+        # NOT a leakage-detecting negative control.
+        # Pass all_trading_days for consistency with compute_metrics()
+        inference["bootstrap_mean_test"] = {
+            "description": "Day-level block bootstrap testing H0: E[daily P&L] = 0. This is a HYPOTHESIS TEST for edge detection, not a leakage control.",
+            "note": "observed_mean_daily_pnl should match metrics.mean_daily_pnl (same day set)",
+            **block_bootstrap_test(
+                trades_df,
+                n_bootstrap=settings.bootstrap_samples,
+                random_seed=seed,
+                all_trading_days=all_trading_days,  # Include 0-trade days for consistency
+            ).to_dict(),
+        }
+    if inference:
+        summary["statistical_inference"] = inference
+
+    if settings.runs("leakage_audit"):
+        # Leakage audit - MUST pass for valid backtest (verifies signal_ts < entry_ts)
+        summary["leakage_audit"] = {
+            "description": "Verifies signal_ts < entry_ts for all trades. ANY violations indicate potential lookahead bias.",
+            **leakage_audit(trades_df).to_dict(),
+        }
+
+    if settings.runs("stress_tests"):
+        # IMPORTANT: These are NOT true negative controls for leakage detection.
+        # They operate on already-realized P&L values, not resimulated backtests.
+        summary["stress_tests"] = {
+            "description": "Heuristic tests that perturb realized P&L values. LIMITATION: These do NOT resimulate the backtest with modified entries, so they CANNOT reliably detect lookahead bias. They are useful for sanity checks but are not rigorous leakage controls.",
+            f"time_shift_{settings.stress_test_shift_minutes}min": time_shift_negative_control(
+                trades_df,
+                shift_minutes=settings.stress_test_shift_minutes,
+                n_simulations=settings.stress_test_simulations,
+                random_seed=seed,
+            ).to_dict(),
+            "shuffle_dates": shuffle_dates_negative_control(
+                trades_df,
+                n_simulations=settings.stress_test_simulations,
+                random_seed=seed,
+            ).to_dict(),
+        }
+
+    summary["analysis"] = {"level": settings.level, "skipped": settings.skipped()}
+    return summary
+
+
+def analyze_results(results_dir: Path, *, level: str | None = "full", config: Config | None = None) -> dict[str, Any]:
+    """
+    Recompute summary statistics from a finished run's saved outputs.
+
+    Reads trades, watchlist and day_audit (CSV or Parquet) plus
+    `run_metadata.json` (config, account equity, seed), then rewrites
+    `summary.json`, keeping its `day_audit` section.
+
+    Args:
+        results_dir: Output directory of an earlier backtest.
+        level: Analysis level to compute (None = the run config's level).
+        config: Overrides the config recorded in run_metadata.json.
+
+    Returns:
+        The new summary dict.
+    """
+    metadata = json.loads((results_dir / "run_metadata.json").read_text(encoding="utf-8"))
+    config = config or Config(raw=metadata.get("config_content", {}))
+    settings = replace(
+        AnalysisSettings.from_config(config, level=level),
+        seed=int(metadata.get("monte_carlo_seed", AnalysisSettings.seed)),
+    )
+    account_equity = float(metadata.get("account_equity", config.get("risk", "account_equity", default=10000.0)))
+
+    audit_df = load_backtest_output(results_dir, "day_audit", columns=["date", "status"])
+    summary = summarize_trades(
+        load_backtest_output(results_dir, "trades"),
+        settings=settings,
+        account_equity=account_equity,
+        watchlist_df=load_backtest_output(results_dir, "watchlist", columns=SUMMARY_WATCHLIST_COLUMNS),
+        all_trading_days=eligible_trading_days(audit_df),
+    )
+
+    summary_path = results_dir / "summary.json"
+    if summary_path.exists():
+        previous = json.loads(summary_path.read_text(encoding="utf-8"))
+        if "day_audit" in previous:
+            summary["day_audit"] = previous["day_audit"]
+    summary_path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    return summary
@@ -0,0 +1,151 @@
+"""Point-in-time reference-data universe for common-stock filtering.
+
+Replaces per-ticker `ticker_details` lookups with one paginated
+`/v3/reference/tickers` listing per snapshot date. Snapshots are written as
+`<root>/tickers_<YYYY-MM-DD>.csv.gz` and reused for later trading days until
+they are `ttl_days` old (measured in as-of dates, so historical backtests are
+reproducible), after which a fresh listing is taken. The default TTL of one
+day only reuses same-day snapshots: an older snapshot misses tickers listed
+after it was taken.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from ybi_strategy.config import Config
+
+UNIVERSE_COLUMNS = ["ticker", "type", "market", "active", "list_date", "delisted_utc"]
+
+_SNAPSHOT_NAME = re.compile(r"^tickers_(\d{4}-\d{2}-\d{2})\.csv\.gz$")
+
+
+def universe_frame(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    """Normalize Polygon reference ticker rows to `UNIVERSE_COLUMNS`, one row per ticker."""
+    df = pd.DataFrame(rows, columns=UNIVERSE_COLUMNS)
+    df["active"] = df["active"].fillna(True).astype(bool)
+    df = df.dropna(subset=["ticker"]).drop_duplicates(subset="ticker", keep="first")
+    return df.reset_index(drop=True)
+
+
+def common_stock_join(tickers: list[str], universe: pd.DataFrame) -> list[str]:
+    """
+    Keep tickers that the universe lists as active, non-OTC common stock (type "CS").
+
+    Vectorized equivalent of the per-ticker reference checks in
+    `filter_common_stocks`; tickers absent from the universe are dropped.
+    Input order is preserved.
+    """
+    if not tickers:
+        return []
+    df = pd.DataFrame({"ticker": tickers}).merge(
+        universe[["ticker", "type", "market", "active"]], on="ticker", how="left"
+    )
+    keep = (
+        (df["type"] == "CS")
+        & (df["market"].fillna("").str.lower() != "otc")
+        & (df["active"].astype("boolean").fillna(False).astype(bool))
+    )
+    return df.loc[keep, "ticker"].tolist()
+
+
+@dataclass(frozen=True)
+class ReferenceUniverse:
+    root: Path
+    ttl_days: int = 1
+    # Only the most recent snapshot frame: days are screened in order and the
+    # TTL only looks back, so older frames are not needed again
+    _loaded: dict[Path, pd.DataFrame] = field(default_factory=dict, compare=False, repr=False)
+    # Serializes snapshot creation when days are loaded on prefetch threads
+    _lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    @staticmethod
+    def from_dir(path: str | Path, ttl_days: int = 1) -> "ReferenceUniverse":
+        p = Path(path)
+        p.mkdir(parents=True, exist_ok=True)
+        return ReferenceUniverse(root=p, ttl_days=max(1, int(ttl_days)))
+
+    @staticmethod
+    def from_config(config: Config) -> "ReferenceUniverse | None":
+        """Build from the `universe` config section; None when no snapshot_dir is set."""
+        snapshot_dir = config.get("universe", "snapshot_dir", default=None)
+        if not snapshot_dir:
+            return None
+        ttl_days = int(config.get("universe", "snapshot_ttl_days", default=1))
+        return ReferenceUniverse.from_dir(str(snapshot_dir), ttl_days=ttl_days)
+
+    def path(self, d: date) -> Path:
+        return self.root / f"tickers_{d.isoformat()}.csv.gz"
+
+    def latest_snapshot(self, d: date) -> Path | None:
+        """Most recent snapshot taken on or before `d` that is still within the TTL."""
+        best: tuple[date, Path] | None = None
+        for p in self.root.glob("tickers_*.csv.gz"):
+            m = _SNAPSHOT_NAME.match(p.name)
+            if not m:
+                continue
+            snap = date.fromisoformat(m.group(1))
+            if snap <= d and (d - snap).days < self.ttl_days and (best is None or snap > best[0]):
+                best = (snap, p)
+        return best[1] if best else None
+
+    def snapshot(self, polygon: Any, d: date) -> pd.DataFrame:
+        """
+        Reference universe as of `d`: a fresh-enough snapshot from disk, or a new
+        listing fetched from Polygon and saved.
+
+        Args:
+            polygon: PolygonClient (must provide `list_tickers`).
+            d: Trading day being screened.
+
+        Returns:
+            DataFrame with `UNIVERSE_COLUMNS`, one row per ticker.
+        """
+        with self._lock:
+            path = self.latest_snapshot(d)
+            if path is not None and path in self._loaded:
+                return self._loaded[path]
+            if path is None:
+                df = universe_frame(polygon.list_tickers(d=d))
+                path = self.path(d)
+                self._save(path, df)
+            else:
+                df = pd.read_csv(
+                    path, dtype={"ticker": str, "type": str, "market": str}, keep_default_na=False,
+                    na_values={"type": [""], "market": [""], "list_date": [""], "delisted_utc": [""]},
+                )
+            self._loaded.clear()
+            self._loaded[path] = df
+            return df
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Snapshots are re-read from disk by each process
+        return {"root": self.root, "ttl_days": self.ttl_days}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        object.__setattr__(self, "root", state["root"])
+        object.__setattr__(self, "ttl_days", state["ttl_days"])
+        object.__setattr__(self, "_loaded", {})
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _save(self, path: Path, df: pd.DataFrame) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_csv(tmp, index=False, compression="gzip")
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from dataclasses import dataclass
 from datetime import date, timedelta
@@ -7,7 +8,10 @@ from typing import Any
 
 import pandas as pd
 
+from ybi_strategy.data.bar_store import DayBarContext, MinuteBarStore, array_to_frame, load_minute_arrays
+from ybi_strategy.polygon.async_client import AsyncPolygonClient
 from ybi_strategy.polygon.client import PolygonClient
+from ybi_strategy.universe.reference import common_stock_join
 
 
 # =============================================================================
@@ -116,6 +120,8 @@ def filter_common_stocks(
     tickers: list[str],
     polygon: PolygonClient | None = None,
     use_reference_data: bool = True,
+    max_concurrency: int = 1,
+    universe: pd.DataFrame | None = None,
 ) -> list[str]:
     """
     Filter a list of tickers to only include common stocks.
@@ -128,16 +134,34 @@ def filter_common_stocks(
         tickers: List of ticker symbols to filter.
         polygon: Optional PolygonClient for reference data lookup.
         use_reference_data: Whether to use Polygon reference data (recommended).
+        max_concurrency: If > 1, reference data lookups are issued concurrently
+            (bounded) before filtering. Results are identical to the serial path.
+        universe: Optional reference universe snapshot (see
+            `ybi_strategy.universe.reference`). When given (and use_reference_data
+            is True), classification is a single join against it and no
+            per-ticker API calls are made.
 
     Returns:
         List of tickers that are classified as common stocks.
     """
+    if use_reference_data and universe is not None:
+        candidates = [t for t in tickers if is_common_stock_ticker(t, use_ambiguous_patterns=False)]
+        return common_stock_join(candidates, universe)
+
     common_stocks = []
 
     # When reference data is available, don't use ambiguous patterns (W$, P$)
     # to avoid false positives on legitimate stocks like SNOW, SHOP
     use_ambiguous = not (use_reference_data and polygon is not None)
 
+    # Optional concurrent prefetch of reference data (same lookups as the loop below)
+    prefetched_details: dict[str, dict[str, Any] | None] = {}
+    if use_reference_data and polygon is not None and max_concurrency > 1:
+        to_lookup = [t for t in tickers if is_common_stock_ticker(t, use_ambiguous_patterns=use_ambiguous)]
+        client = AsyncPolygonClient(polygon, max_concurrency=max_concurrency)
+        results = asyncio.run(client.ticker_details_many(to_lookup))
+        prefetched_details = dict(zip(to_lookup, results))
+
     for ticker in tickers:
         # Apply pattern-based filter
         # CRITICAL: Skip ambiguous patterns when reference data will verify
@@ -146,7 +170,10 @@ def filter_common_stocks(
 
         # When reference data is enabled, use Polygon for definitive classification
         if use_reference_data and polygon is not None:
-            details = polygon.ticker_details(ticker)
+            if ticker in prefetched_details:
+                details = prefetched_details[ticker]
+            else:
+                details = polygon.ticker_details(ticker)
             if details:
                 # Check asset type - ONLY allow common stocks (CS)
                 ticker_type = details.get("type", "")
@@ -212,6 +239,26 @@ def _to_frame(rows: list[dict[str, Any]]) -> pd.DataFrame:
     return df
 
 
+def _prev_session_grouped(polygon: PolygonClient, day: date, prev_day: date | None) -> list[dict[str, Any]]:
+    """
+    Grouped daily bars for the session before `day`.
+
+    Uses the calendar-resolved `prev_day` (one API call) when given; otherwise,
+    or if that day has no data, probes backwards up to 7 days.
+    """
+    if prev_day is not None:
+        prev = polygon.grouped_daily(prev_day)
+        if prev:
+            return prev
+    probe = (prev_day or day) - timedelta(days=1)
+    for _ in range(7):
+        prev = polygon.grouped_daily(probe)
+        if prev:
+            return prev
+        probe = probe - timedelta(days=1)
+    return []
+
+
 def build_watchlist_open_gap(
     *,
     polygon: PolygonClient,
@@ -222,6 +269,8 @@ def build_watchlist_open_gap(
     max_prev_close: float,
     filter_common_stocks_only: bool = True,
     use_reference_data: bool = True,  # CRITICAL: Default True - pattern filter alone misses preferreds (e.g., CCLDP)
+    universe: pd.DataFrame | None = None,
+    prev_day: date | None = None,
 ) -> list[WatchlistItem]:
     """
     Build watchlist of small-cap stocks with gap-up on market open.
@@ -237,17 +286,15 @@ def build_watchlist_open_gap(
         use_reference_data: If True (default), verify with Polygon reference data.
             This is REQUIRED to filter out preferreds (e.g., CCLDP) and other non-CS
             instruments that pattern rules miss. Only set False for testing.
+        universe: Optional reference universe snapshot used instead of
+            per-ticker reference lookups.
+        prev_day: Previous trading day (e.g. from `ybi_strategy.calendar`). If
+            None, it is found by probing grouped_daily backwards.
 
     Returns:
         List of WatchlistItem sorted by gap percentage descending.
     """
-    prev: list[dict[str, Any]] = []
-    prev_day = day - timedelta(days=1)
-    for _ in range(7):
-        prev = polygon.grouped_daily(prev_day)
-        if prev:
-            break
-        prev_day = prev_day - timedelta(days=1)
+    prev = _prev_session_grouped(polygon, day, prev_day)
     if not prev:
         return []
     cur = polygon.grouped_daily(day)
@@ -272,6 +319,7 @@ def build_watchlist_open_gap(
             merged["ticker"].tolist(),
             polygon=polygon,
             use_reference_data=use_reference_data,
+            universe=universe,
         )
         merged = merged[merged["ticker"].isin(verified_tickers)]
 
@@ -304,6 +352,11 @@ def build_watchlist_premarket_gappers(
     filter_common_stocks_only: bool = True,
     use_reference_data: bool = True,
     max_candidates_to_scan: int = 200,
+    fetch_concurrency: int = 1,
+    bar_store: MinuteBarStore | None = None,
+    bar_context: DayBarContext | None = None,
+    universe: pd.DataFrame | None = None,
+    prev_day: date | None = None,
 ) -> list[PremarketWatchlistItem]:
     """
     Build watchlist of premarket gappers using 04:00-09:29 ET data.
@@ -337,18 +390,22 @@ def build_watchlist_premarket_gappers(
         use_reference_data: If True, verify with Polygon reference data.
         max_candidates_to_scan: Max tickers to fetch minute data for (API budget).
             Candidates are prioritized by previous day's volume (descending).
+        fetch_concurrency: Max minute-bar / reference-data requests in flight.
+            1 (default) fetches serially; results do not depend on this value.
+        bar_store: Optional columnar minute-bar store; ticker-days already stored
+            are read from it without any API call or JSON decoding.
+        bar_context: Optional per-day context; every candidate's parsed bars are
+            registered in it so the day simulation can reuse them.
+        universe: Optional reference universe snapshot used instead of
+            per-ticker reference lookups.
+        prev_day: Previous trading day (e.g. from `ybi_strategy.calendar`). If
+            None, it is found by probing grouped_daily backwards.
 
     Returns:
         List of PremarketWatchlistItem sorted by premarket_pct descending.
     """
     # Step 1: Get previous day's data (includes volume for prioritization)
-    prev: list[dict[str, Any]] = []
-    prev_day = day - timedelta(days=1)
-    for _ in range(7):
-        prev = polygon.grouped_daily(prev_day)
-        if prev:
-            break
-        prev_day = prev_day - timedelta(days=1)
+    prev = _prev_session_grouped(polygon, day, prev_day)
     if not prev:
         return []
 
@@ -398,41 +455,40 @@ def build_watchlist_premarket_gappers(
     # Step 4: Fetch premarket data and compute metrics
     premarket_data: list[dict[str, Any]] = []
 
-    for row in candidates:
+    # Minute bars for all candidates, in candidate order: served from the columnar
+    # store when available, otherwise fetched (concurrently if fetch_concurrency > 1).
+    # Failed fetches come back as exceptions and are skipped, as in a serial scan.
+    candidate_arrays = load_minute_arrays(
+        polygon,
+        [row["ticker"] for row in candidates],
+        day,
+        store=bar_store,
+        context=bar_context,
+        concurrency=fetch_concurrency,
+    )
+
+    # Filter to premarket window
+    pm_start_ts = pd.Timestamp(
+        year=day.year, month=day.month, day=day.day,
+        hour=pm_start_hour, minute=pm_start_min
+    ).tz_localize("America/New_York")
+    pm_end_ts = pd.Timestamp(
+        year=day.year, month=day.month, day=day.day,
+        hour=pm_end_hour, minute=pm_end_min
+    ).tz_localize("America/New_York")
+
+    for row, arr in zip(candidates, candidate_arrays):
         ticker = row["ticker"]
         prev_close = row["prev_close"]
 
-        try:
-            bars = polygon.minute_bars(ticker, day)
-        except Exception:
+        if isinstance(arr, BaseException) or len(arr) == 0:
             continue
 
-        if not bars:
-            continue
+        # Timestamp-indexed frame in ET (Polygon 't' is Unix ms)
+        bars_df = array_to_frame(arr, "America/New_York")
+        has_vwap = bool(bars_df["vw"].notna().any())
 
-        # Convert to DataFrame and filter to premarket window
-        bars_df = pd.DataFrame(bars)
-        if bars_df.empty or "t" not in bars_df.columns:
-            continue
-
-        # Polygon 't' is Unix timestamp in milliseconds
-        bars_df["ts"] = pd.to_datetime(bars_df["t"], unit="ms", utc=True)
-        bars_df["ts_et"] = bars_df["ts"].dt.tz_convert("America/New_York")
-
-        # Filter to premarket window
-        pm_start_ts = pd.Timestamp(
-            year=day.year, month=day.month, day=day.day,
-            hour=pm_start_hour, minute=pm_start_min
-        ).tz_localize("America/New_York")
-        pm_end_ts = pd.Timestamp(
-            year=day.year, month=day.month, day=day.day,
-            hour=pm_end_hour, minute=pm_end_min
-        ).tz_localize("America/New_York")
-
-        pm_bars = bars_df[
-            (bars_df["ts_et"] >= pm_start_ts) &
-            (bars_df["ts_et"] <= pm_end_ts)
-        ]
+        pm_bars = bars_df[(bars_df.index >= pm_start_ts) & (bars_df.index <= pm_end_ts)]
 
         if pm_bars.empty:
             continue
@@ -444,7 +500,7 @@ def build_watchlist_premarket_gappers(
         premarket_volume = int(pm_bars["v"].sum())
 
         # Dollar volume: use vwap if available, otherwise approximate with (h+l+c)/3
-        if "vw" in pm_bars.columns:
+        if has_vwap:
             premarket_dollar_volume = float((pm_bars["vw"] * pm_bars["v"]).sum())
             premarket_vwap = float(
                 (pm_bars["vw"] * pm_bars["v"]).sum() / pm_bars["v"].sum()
@@ -487,6 +543,8 @@ def build_watchlist_premarket_gappers(
             tickers_to_verify,
             polygon=polygon,
             use_reference_data=True,
+            max_concurrency=fetch_concurrency,
+            universe=universe,
         )
         premarket_data = [d for d in premarket_data if d["ticker"] in verified_tickers]
 
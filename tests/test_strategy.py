@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import sys
 from datetime import date, time
 from pathlib import Path
@@ -18,6 +19,7 @@ from ybi_strategy.features.indicators import (
     compute_trend_indicators,
     compute_session_indicators,
     ema,
+    rolling_linreg_last,
     vwap,
     ttm_squeeze_proxy,
     ttm_color_state,
@@ -129,6 +131,40 @@ def _deep_update(base: dict, updates: dict) -> None:
             base[k] = v
 
 
+class _SyntheticPolygon:
+    """Deterministic, picklable stand-in for PolygonClient (engine-level tests)."""
+
+    def grouped_daily(self, d):
+        if d.weekday() >= 5:
+            return []
+        rng = np.random.default_rng(d.toordinal())
+        return [
+            {"T": f"SYN{i}", "o": 5.0, "c": float(2 + rng.random() * 5), "h": 8.0, "l": 1.5, "v": 1e6 - i * 1e3}
+            for i in range(6)
+        ]
+
+    def minute_bars(self, ticker, d):
+        rng = np.random.default_rng(d.toordinal() * 100 + int(ticker[3:]))
+        t0 = int(pd.Timestamp(f"{d.isoformat()} 04:00", tz="America/New_York").timestamp() * 1000)
+        n = 8 * 60
+        c = 3.0 * np.exp(np.cumsum(rng.normal(0.0004, 0.01, n)))
+        o = np.r_[c[0], c[:-1]]
+        h = np.maximum(o, c) * 1.002
+        l = np.minimum(o, c) * 0.998
+        v = rng.integers(1000, 50000, n)
+        return [
+            {"t": t0 + k * 60_000, "o": float(o[k]), "h": float(h[k]), "l": float(l[k]), "c": float(c[k]),
+             "v": int(v[k]), "vw": float((h[k] + l[k] + c[k]) / 3)}
+            for k in range(n)
+        ]
+
+    def daily_bar(self, ticker, d):
+        return {"h": 6.0, "l": 2.0, "o": 3.0, "c": 4.0}
+
+    def ticker_details(self, ticker):
+        return {"type": "CS", "market": "stocks", "active": True}
+
+
 class TestIndicators:
     """Test indicator calculations."""
 
@@ -169,6 +205,101 @@ class TestIndicators:
         assert result["ttm_squeeze_on"].dtype == bool
         print("  ✓ TTM squeeze proxy produces valid output")
 
+    def test_rolling_linreg_last_matches_polyfit(self):
+        """Closed-form rolling regression matches a per-window np.polyfit (incl. NaN windows)."""
+        def polyfit_last(w):
+            x = np.arange(len(w), dtype=float)
+            slope, intercept = np.polyfit(x, w, 1)
+            return slope * x[-1] + intercept
+
+        rng = np.random.default_rng(7)
+        series = pd.Series(np.cumsum(rng.normal(0, 0.05, 960)) + 25.0)
+        series.iloc[:19] = np.nan
+        series.iloc[300] = np.nan
+
+        expected = series.rolling(window=20, min_periods=20).apply(polyfit_last, raw=True)
+        result = rolling_linreg_last(series, 20)
+
+        assert result.index.equals(series.index)
+        assert (result.isna() == expected.isna()).all()
+        assert result.iloc[300:319].isna().all()
+        np.testing.assert_allclose(result.dropna(), expected.dropna(), rtol=1e-9, atol=1e-9)
+        # Short input: no complete window
+        assert rolling_linreg_last(series.iloc[25:35], 20).isna().all()
+        print("  ✓ Rolling linreg matches polyfit")
+
+    def test_rolling_linreg_last_matches_reference_windows(self):
+        """Closed-form regression matches the rolling().apply reference across windows and price levels."""
+        import os
+        import time as time_mod
+
+        def reference(series, window):
+            return series.rolling(window=window, min_periods=window).apply(
+                lambda w: np.polyval(np.polyfit(np.arange(float(window)), w, 1), window - 1.0), raw=True
+            )
+
+        rng = np.random.default_rng(3)
+        for level in (0.0, 2.5, 4000.0):
+            series = pd.Series(level + np.cumsum(rng.normal(0, 0.05, 960)))
+            for window in (2, 5, 20, 60):
+                np.testing.assert_allclose(
+                    rolling_linreg_last(series, window), reference(series, window),
+                    rtol=1e-9, atol=1e-9, err_msg=f"level={level} window={window}",
+                )
+        assert rolling_linreg_last(series, 1).equals(series)
+
+        # Timing is opt-in: wall-clock ratios are unreliable on loaded CI machines
+        if os.environ.get("YBI_PERF_TESTS"):
+            t0 = time_mod.perf_counter()
+            reference(series, 20)
+            slow = time_mod.perf_counter() - t0
+            t0 = time_mod.perf_counter()
+            for _ in range(10):
+                rolling_linreg_last(series, 20)
+            fast = (time_mod.perf_counter() - t0) / 10
+            assert slow / fast > 20
+            print(f"  ✓ Rolling linreg {slow / fast:.0f}x faster")
+        print("  ✓ Rolling linreg matches reference for windows 1-60")
+
+    def test_trend_kernel_matches_pandas(self):
+        """Fused array kernel reproduces the pandas rolling/ewm construction."""
+        from ybi_strategy.features.kernels import TREND_COLUMNS, trend_indicator_arrays
+
+        df = create_mock_bars(n_bars=400)
+        c, h, l = df["c"], df["h"], df["l"]
+        sma20 = c.rolling(20, min_periods=20).mean()
+        std20 = c.rolling(20, min_periods=20).std(ddof=0)
+        tr = pd.concat([(h - l).abs(), (h - c.shift(1)).abs(), (l - c.shift(1)).abs()], axis=1).max(axis=1)
+        atr20 = tr.rolling(20, min_periods=20).mean()
+        m2 = ((h.rolling(20, min_periods=20).max() + l.rolling(20, min_periods=20).min()) / 2.0 + sma20) / 2.0
+        momentum = (c - m2).rolling(20, min_periods=20).apply(
+            lambda w: np.polyval(np.polyfit(np.arange(20.0), w, 1), 19.0), raw=True
+        )
+        expected = {
+            "ema_8": c.ewm(span=8, adjust=False).mean(),
+            "ema_55": c.ewm(span=55, adjust=False).mean(),
+            "sma_200": c.rolling(200, min_periods=200).mean(),
+            "ttm_bb_upper": sma20 + 2.0 * std20,
+            "ttm_kc_lower": c.ewm(span=20, adjust=False).mean() - 1.5 * atr20,
+            "momentum": momentum,
+            "hod_so_far": h.cummax(),
+            "lod_so_far": l.cummin(),
+        }
+
+        arrays = trend_indicator_arrays(h.to_numpy(), l.to_numpy(), c.to_numpy())
+        assert tuple(arrays) == TREND_COLUMNS
+        for name, ref in expected.items():
+            np.testing.assert_allclose(arrays[name], ref.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=name)
+
+        result = compute_trend_indicators(df)
+        assert list(result.columns) == list(df.columns) + list(TREND_COLUMNS)
+        assert result["ttm_state"].equals(ttm_color_state(result["momentum"]))
+        assert (result["momentum_sign"] == np.where(result["momentum"] >= 0, "bull", "bear")).all()
+        # Short frames: rolling columns are all NaN, no errors
+        short = compute_trend_indicators(df.iloc[:5])
+        assert short["sma_200"].isna().all() and short["momentum"].isna().all()
+        print("  ✓ Trend kernel matches pandas")
+
     def test_ttm_color_state(self):
         """Test TTM color state classification."""
         momentum = pd.Series([1, 2, 3, 2, 1, 0, -1, -2, -3, -2])
@@ -2603,6 +2734,1557 @@ class TestPremarketScreener:
               f"dollar_volume=${config_dict['watchlist']['min_premarket_dollar_volume']:,.0f}")
 
 
+class TestHttpTransport:
+    """Tests for the pooled, retrying Polygon HTTP transport."""
+
+    class _FakeResponse:
+        def __init__(self, status_code, payload=None, headers=None):
+            self.status_code = status_code
+            self._payload = payload or {}
+            self.headers = headers or {}
+            self.text = str(self._payload)
+
+        def json(self):
+            return self._payload
+
+    class _FakeSession:
+        def __init__(self, responses):
+            self.responses = list(responses)
+            self.calls = 0
+
+        def get(self, url, params=None, timeout=None):
+            self.calls += 1
+            item = self.responses.pop(0)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+    def _transport(self, responses, **kwargs):
+        from ybi_strategy.polygon.transport import HttpTransport
+
+        delays = []
+        transport = HttpTransport(sleep=delays.append, **kwargs)
+        transport._session = self._FakeSession(responses)
+        return transport, delays
+
+    def test_retries_429_and_5xx_then_succeeds(self):
+        """429 and 5xx responses are retried with bounded, jittered backoff."""
+        transport, delays = self._transport(
+            [self._FakeResponse(429), self._FakeResponse(503), self._FakeResponse(200, {"ok": 1})],
+            backoff_base_s=0.5,
+        )
+        resp = transport.get("https://example.test/x")
+
+        assert resp.status_code == 200
+        assert transport.session.calls == 3
+        assert len(delays) == 2
+        assert 0.0 <= delays[0] <= 0.5
+        assert 0.0 <= delays[1] <= 1.0
+        print("  ✓ Transport retries 429/5xx with jittered backoff")
+
+    def test_non_retryable_status_returned_immediately(self):
+        """4xx errors other than 429 are not retried."""
+        transport, delays = self._transport([self._FakeResponse(404)])
+        resp = transport.get("https://example.test/x")
+
+        assert resp.status_code == 404
+        assert transport.session.calls == 1
+        assert delays == []
+        print("  ✓ Transport does not retry 404")
+
+    def test_gives_up_after_max_retries(self):
+        """After max_retries the last response is returned and connection errors re-raise."""
+        import requests
+
+        transport, delays = self._transport([self._FakeResponse(500)] * 3, max_retries=2)
+        assert transport.get("https://example.test/x").status_code == 500
+        assert len(delays) == 2
+
+        transport, _ = self._transport([requests.ConnectionError("down")] * 2, max_retries=1)
+        try:
+            transport.get("https://example.test/x")
+            raise AssertionError("expected ConnectionError")
+        except requests.ConnectionError:
+            pass
+        print("  ✓ Transport gives up after max_retries")
+
+    def test_retry_after_header_respected(self):
+        """A numeric Retry-After is used as a lower bound, capped by backoff_max_s."""
+        transport, delays = self._transport(
+            [self._FakeResponse(429, headers={"Retry-After": "3"}), self._FakeResponse(200)],
+            backoff_base_s=0.01,
+            backoff_max_s=2.0,
+        )
+        transport.get("https://example.test/x")
+        assert delays == [2.0]
+        print("  ✓ Transport honours Retry-After (capped)")
+
+    def test_pool_size_and_pickling(self):
+        """Session adapters use the configured pool size; transports survive pickling."""
+        import pickle
+        from ybi_strategy.polygon.client import PolygonClient
+        from ybi_strategy.polygon.transport import HttpTransport
+
+        transport = HttpTransport.from_config(Config(raw={"polygon": {"pool_size": 7}}))
+        adapter = transport.session.get_adapter("https://api.polygon.io")
+        assert adapter._pool_maxsize == 7
+
+        client = pickle.loads(pickle.dumps(PolygonClient(api_key="k", transport=transport)))
+        assert client.transport.pool_size == 7
+        assert client.transport.session is not None
+        print("  ✓ Transport pool size configurable and picklable")
+
+
+class TestAsyncPolygonClient:
+    """Tests for the asyncio concurrent fetch API against a local stub server."""
+
+    @staticmethod
+    def _start_stub_server():
+        """Serve Polygon-shaped JSON with per-ticker delays so completion order is scrambled."""
+        import json
+        import re
+        import threading
+        import time as time_mod
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        state = {"in_flight": 0, "max_in_flight": 0, "requests": 0}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with lock:
+                    state["in_flight"] += 1
+                    state["requests"] += 1
+                    state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                try:
+                    path = self.path.split("?")[0]
+                    m = re.match(r"/v2/aggs/ticker/([^/]+)/range/1/minute/([^/]+)/", path)
+                    if m:
+                        ticker = m.group(1)
+                        # Later tickers answer faster -> completion order != request order
+                        time_mod.sleep(0.002 * (10 - int(ticker[1:]) % 10))
+                        body = {"results": [{"t": 1735826400000, "c": float(ticker[1:]), "T": ticker}]}
+                    elif path.startswith("/v3/reference/tickers/"):
+                        ticker = path.rsplit("/", 1)[-1]
+                        body = {"results": {"ticker": ticker, "type": "CS", "market": "stocks", "active": True}}
+                    elif path.startswith("/v2/aggs/grouped/"):
+                        body = {"results": [{"T": "X" + path.rsplit("/", 1)[-1]}]}
+                    else:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    data = json.dumps(body).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with lock:
+                        state["in_flight"] -= 1
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, state
+
+    def test_minute_bars_many_order_is_deterministic(self):
+        """Results come back in input order and match the serial client."""
+        import asyncio
+        from ybi_strategy.polygon.async_client import AsyncPolygonClient
+        from ybi_strategy.polygon.client import PolygonClient
+
+        server, state = self._start_stub_server()
+        try:
+            client = PolygonClient(api_key="k", base_url=f"http://127.0.0.1:{server.server_port}")
+            tickers = [f"T{i}" for i in range(20)]
+            d = date(2025, 1, 2)
+
+            async_client = AsyncPolygonClient(client, max_concurrency=4)
+            concurrent = asyncio.run(async_client.minute_bars_many(tickers, d))
+            serial = [client.minute_bars(t, d) for t in tickers]
+
+            assert concurrent == serial
+            assert [bars[0]["T"] for bars in concurrent] == tickers
+            assert 1 < state["max_in_flight"] <= 4
+
+            details = asyncio.run(async_client.ticker_details_many(["A1", "B2"]))
+            assert [x["ticker"] for x in details] == ["A1", "B2"]
+            grouped = asyncio.run(async_client.grouped_daily_many([date(2025, 1, 2), date(2025, 1, 3)]))
+            assert grouped == [[{"T": "X2025-01-02"}], [{"T": "X2025-01-03"}]]
+        finally:
+            server.shutdown()
+        print(f"  ✓ Async fetch preserves input order (max in flight={state['max_in_flight']})")
+
+    def test_gather_bounded_return_exceptions(self):
+        """Failures are returned in place when return_exceptions=True."""
+        import asyncio
+        from ybi_strategy.polygon.async_client import gather_bounded
+
+        async def ok(x):
+            await asyncio.sleep(0.001 * (5 - x))
+            return x
+
+        async def bad():
+            raise ValueError("boom")
+
+        results = asyncio.run(gather_bounded([ok(1), bad(), ok(3)], limit=2, return_exceptions=True))
+        assert results[0] == 1 and results[2] == 3
+        assert isinstance(results[1], ValueError)
+        print("  ✓ gather_bounded keeps order and returns exceptions in place")
+
+    def test_premarket_screener_concurrent_matches_serial(self):
+        """The premarket screener yields identical watchlists at any fetch_concurrency."""
+        from ybi_strategy.universe.watchlist import build_watchlist_premarket_gappers
+
+        day = date(2025, 1, 2)
+        base_ms = int(pd.Timestamp("2025-01-02 08:00", tz="America/New_York").timestamp() * 1000)
+
+        class MockPolygon:
+            def grouped_daily(self, d):
+                return [{"T": f"T{i}", "c": 2.0, "v": 1_000_000 - i} for i in range(12)]
+
+            def minute_bars(self, ticker, d):
+                if ticker == "T5":
+                    raise RuntimeError("transient")
+                i = int(ticker[1:])
+                return [
+                    {"t": base_ms + k * 60_000, "o": 2.0, "h": 2.3, "l": 2.0, "c": 2.1 + 0.01 * i, "v": 20_000, "vw": 2.1}
+                    for k in range(10)
+                ]
+
+            def ticker_details(self, ticker):
+                return {"type": "ETF" if ticker == "T3" else "CS", "market": "stocks", "active": True}
+
+        kwargs = dict(
+            polygon=MockPolygon(), day=day, top_n=5, min_premarket_pct=0.05,
+            min_prev_close=0.5, max_prev_close=20.0,
+        )
+        serial = build_watchlist_premarket_gappers(**kwargs, fetch_concurrency=1)
+        concurrent = build_watchlist_premarket_gappers(**kwargs, fetch_concurrency=6)
+
+        assert serial == concurrent
+        assert [i.ticker for i in serial] == ["T11", "T10", "T9", "T8", "T7"]
+        print("  ✓ Premarket screener concurrent fetch matches serial")
+
+
+class TestRateLimiter:
+    """Tests for the shared token-bucket rate limiter."""
+
+    @staticmethod
+    def _fake_clock():
+        now = {"t": 1000.0}
+
+        def clock():
+            return now["t"]
+
+        def sleep(s):
+            now["t"] += s
+
+        return clock, sleep
+
+    def test_token_bucket_throttles_after_burst(self):
+        """Burst requests pass immediately; the next waits for a token to accrue."""
+        from ybi_strategy.polygon.rate_limit import RateLimiter
+
+        clock, sleep = self._fake_clock()
+        limiter = RateLimiter(requests_per_minute=60, burst=2, clock=clock, sleep=sleep)
+
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        waited = limiter.acquire()
+        assert abs(waited - 1.0) < 1e-9, f"Expected 1s wait at 60 rpm, got {waited}"
+        print("  ✓ Token bucket throttles after burst")
+
+    def test_state_file_shared_between_limiters(self):
+        """Limiters pointing at the same state file draw from one budget (cross-process)."""
+        import tempfile
+        from ybi_strategy.polygon.rate_limit import RateLimiter
+
+        clock, sleep = self._fake_clock()
+        with tempfile.TemporaryDirectory() as tmp:
+            state_file = Path(tmp) / "bucket.json"
+            a = RateLimiter(requests_per_minute=60, burst=2, state_file=state_file, clock=clock, sleep=sleep)
+            b = RateLimiter(requests_per_minute=60, burst=2, state_file=state_file, clock=clock, sleep=sleep)
+
+            assert a.acquire() == 0.0
+            assert b.acquire() == 0.0
+            assert b.acquire() > 0.0, "Second limiter must see tokens spent by the first"
+        print("  ✓ Rate limiter state shared via coordination file")
+
+    def test_disabled_by_default_and_stats_reported(self):
+        """rate_limit is opt-in; transport stats split fetch vs. throttled time."""
+        from ybi_strategy.polygon.rate_limit import RateLimiter
+        from ybi_strategy.polygon.transport import HttpTransport
+
+        assert RateLimiter.from_config(Config(raw={})) is None
+        assert RateLimiter.from_config(Config(raw={"polygon": {"rate_limit": {"requests_per_minute": 0}}})) is None
+
+        clock, sleep = self._fake_clock()
+        limiter = RateLimiter(requests_per_minute=60, burst=1, clock=clock, sleep=sleep)
+        transport = HttpTransport(rate_limiter=limiter)
+        transport._session = TestHttpTransport._FakeSession([TestHttpTransport._FakeResponse(200)] * 2)
+
+        transport.get("https://example.test/a")
+        transport.get("https://example.test/b")
+        stats = transport.stats.to_dict()
+
+        assert stats["requests"] == 2
+        assert stats["throttled_seconds"] >= 1.0
+        print(f"  ✓ Transport stats: {stats}")
+
+
+class TestSqliteHttpCache:
+    """Tests for the single-file SQLite HTTP cache."""
+
+    def test_roundtrip_batch_and_index(self):
+        """get/put, get_many/put_many and the endpoint/ticker/day index."""
+        import tempfile
+        from ybi_strategy.polygon.sqlite_cache import SqliteHttpCache
+
+        base = "https://api.polygon.io"
+        p = {"adjusted": "true"}
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SqliteHttpCache.from_path(Path(tmp) / "cache.sqlite")
+            cache.put_many([
+                (f"{base}/v2/aggs/ticker/AAA/range/1/minute/2025-01-02/2025-01-02", p, {"results": [{"c": 1.0}]}),
+                (f"{base}/v2/aggs/ticker/BBB/range/1/minute/2025-01-02/2025-01-02", p, {"results": [{"c": 2.0}]}),
+                (f"{base}/v2/aggs/grouped/locale/us/market/stocks/2025-01-02", p, {"results": []}),
+            ])
+            cache.put(url=f"{base}/v3/reference/tickers/AAA", params={}, value={"results": {"type": "CS"}})
+
+            got = cache.get_many([
+                (f"{base}/v2/aggs/ticker/BBB/range/1/minute/2025-01-02/2025-01-02", p),
+                (f"{base}/v2/aggs/ticker/ZZZ/range/1/minute/2025-01-02/2025-01-02", p),
+                (f"{base}/v2/aggs/ticker/AAA/range/1/minute/2025-01-02/2025-01-02", p),
+            ])
+            assert got == [{"results": [{"c": 2.0}]}, None, {"results": [{"c": 1.0}]}]
+            assert cache.get(url=f"{base}/v3/reference/tickers/AAA", params={}) == {"results": {"type": "CS"}}
+
+            minute_rows = cache.find(endpoint="aggs_minute", day="2025-01-02")
+            assert [r["ticker"] for r in minute_rows] == ["AAA", "BBB"]
+            assert len(cache.find(ticker="AAA")) == 2
+            assert cache.stats()["entries"] == 4
+        print("  ✓ SQLite cache roundtrip, batch API and prefix index")
+
+    def test_migrate_directory_cache(self):
+        """Entries from the flat directory format are readable after migration."""
+        import tempfile
+        from ybi_strategy.polygon.http_cache import HttpCache
+        from ybi_strategy.polygon.sqlite_cache import SqliteHttpCache, migrate_dir_cache
+
+        url = "https://api.polygon.io/v2/aggs/ticker/AAA/range/1/minute/2025-01-02/2025-01-02"
+        params = {"adjusted": "true", "sort": "asc", "limit": 50000}
+        value = {"ticker": "AAA", "results": [{"t": 1735808400000, "c": 1.5}] * 50}
+        with tempfile.TemporaryDirectory() as tmp:
+            old = HttpCache.from_dir(str(Path(tmp) / "dir"))
+            old.put(url=url, params=params, value=value)
+            (old.root / "corrupt.json").write_text("{\"trunc", encoding="utf-8")
+
+            new = SqliteHttpCache.from_path(Path(tmp) / "cache.sqlite")
+            assert migrate_dir_cache(old.root, new) == 1
+            assert new.get(url=url, params=params) == value
+            rows = new.find(ticker="AAA")
+            assert rows and rows[0]["day"] == "2025-01-02"
+            assert new.stats()["payload_bytes"] < len(json.dumps(value))
+        print("  ✓ Directory cache migrated to SQLite with compressed payloads")
+
+
+class TestShardedHttpCache:
+    """Tests for the sharded, compressed directory HTTP cache."""
+
+    def _minute_payload(self, n=500):
+        return {
+            "ticker": "AAA",
+            "results": [
+                {"t": 1735808400000 + k * 60000, "o": 1.5, "h": 1.52, "l": 1.49, "c": 1.51, "v": 1200, "vw": 1.505, "n": 12}
+                for k in range(n)
+            ],
+        }
+
+    def test_sharded_compressed_layout(self):
+        """Entries land in two-level shards as gzip and compress well."""
+        import tempfile
+        from ybi_strategy.polygon.http_cache import HttpCache, cache_key
+
+        url, params = "https://api.polygon.io/v2/aggs/ticker/AAA/range/1/minute/2025-01-02/2025-01-02", {"a": 1}
+        value = self._minute_payload()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HttpCache.from_dir(tmp, compression="gzip")
+            cache.put(url=url, params=params, value=value)
+
+            key = cache_key(url=url, params=params)
+            path = Path(tmp) / key[:2] / key[2:4] / f"{key}.json.gz"
+            assert path.exists()
+            assert not list(Path(tmp).rglob("*.tmp")), "temp files must be renamed away"
+            assert cache.get(url=url, params=params) == value
+
+            ratio = len(json.dumps(value)) / path.stat().st_size
+            assert ratio > 5, f"Expected strong compression, got {ratio:.1f}x"
+        print(f"  ✓ Sharded gzip cache entry ({ratio:.0f}x compression)")
+
+    def test_reads_legacy_flat_layout_and_ignores_truncated(self):
+        """Old flat <key>.json entries are readable; truncated entries are misses."""
+        import tempfile
+        from ybi_strategy.polygon.http_cache import HttpCache, cache_key
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HttpCache.from_dir(tmp)
+            legacy_key = cache_key(url="u1", params={})
+            (Path(tmp) / f"{legacy_key}.json").write_text(json.dumps({"results": [1]}), encoding="utf-8")
+            assert cache.get(url="u1", params={}) == {"results": [1]}
+
+            broken_key = cache_key(url="u2", params={})
+            (Path(tmp) / f"{broken_key}.json").write_text('{"results": [', encoding="utf-8")
+            assert cache.get(url="u2", params={}) is None
+
+            cache.put(url="u3", params={}, value={"results": [3]})
+            assert sorted(v["results"][0] for _, v in cache.iter_entries()) == [1, 3]
+        print("  ✓ Legacy flat entries readable, truncated entries treated as misses")
+
+    def test_reads_entries_written_under_another_codec(self):
+        """Changing the compression setting keeps existing entries as hits; only recompress rewrites them."""
+        import tempfile
+        from ybi_strategy.polygon.http_cache import HttpCache, cache_key
+
+        value = self._minute_payload(50)
+        with tempfile.TemporaryDirectory() as tmp:
+            HttpCache.from_dir(tmp, compression="gzip").put(url="u", params={}, value=value)
+            cache = HttpCache.from_dir(tmp, compression="none")
+            assert cache.get(url="u", params={}) == value
+
+            key = cache_key(url="u", params={})
+            shard = Path(tmp) / key[:2] / key[2:4]
+            assert sorted(p.name for p in shard.iterdir()) == [f"{key}.json.gz"], "reads leave entries in place"
+
+            assert cache.recompress() == 1
+            assert sorted(p.name for p in shard.iterdir()) == [f"{key}.json"]
+            assert HttpCache.from_dir(tmp, compression="gzip").get(url="u", params={}) == value
+            assert [k for k, _ in cache.iter_entries()] == [key]
+            assert cache.recompress() == 0
+        print("  ✓ Entries under another codec are hits; recompress converts them")
+
+    def test_concurrent_writers_never_expose_partial_entries(self):
+        """Parallel puts/gets of the same key always see a complete payload."""
+        import tempfile
+        import threading
+        from ybi_strategy.polygon.http_cache import HttpCache
+
+        value = self._minute_payload(2000)
+        errors = []
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HttpCache.from_dir(tmp)
+
+            def writer():
+                for _ in range(10):
+                    cache.put(url="u", params={}, value=value)
+
+            def reader():
+                for _ in range(50):
+                    got = cache.get(url="u", params={})
+                    if got is not None and got != value:
+                        errors.append("partial read")
+
+            threads = [threading.Thread(target=writer) for _ in range(4)] + [threading.Thread(target=reader) for _ in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert not errors
+            assert cache.get(url="u", params={}) == value
+        print("  ✓ Atomic writes: no partial entries under concurrent writers")
+
+
+class TestMemoryCache:
+    """Tests for the in-process LRU tier in front of the HTTP cache."""
+
+    def test_lru_evicts_by_bytes(self):
+        """Least-recently-used entries are evicted once the byte budget is exceeded."""
+        from ybi_strategy.polygon.memory_cache import MemoryCache, estimate_nbytes
+
+        rows = {"results": [{"t": i, "c": 1.0} for i in range(100)]}
+        size = estimate_nbytes(rows)
+        cache = MemoryCache(max_bytes=int(size * 2.5))
+
+        cache.put(url="a", params={}, value=rows)
+        cache.put(url="b", params={}, value=rows)
+        assert cache.get(url="a", params={}) is rows  # touch a -> b is now LRU
+        cache.put(url="c", params={}, value=rows)
+
+        assert cache.get(url="b", params={}) is None
+        assert cache.get(url="a", params={}) is rows
+        assert cache.get(url="c", params={}) is rows
+        stats = cache.stats()
+        assert stats["evictions"] == 1 and stats["entries"] == 2
+        assert stats["hits"] == 3 and stats["misses"] == 1
+
+        cache.put(url="huge", params={}, value={"results": [{"t": i} for i in range(100_000)]})
+        assert cache.get(url="huge", params={}) is None, "entries over budget are not cached"
+        print("  ✓ Memory LRU evicts by approximate bytes")
+
+    def test_client_memory_tier_in_front_of_disk(self):
+        """Repeat requests are served from memory without touching disk or network."""
+        import tempfile
+        from ybi_strategy.polygon.client import PolygonClient
+        from ybi_strategy.polygon.http_cache import HttpCache
+        from ybi_strategy.polygon.memory_cache import MemoryCache
+
+        class NoNetwork:
+            def get(self, *args, **kwargs):
+                raise AssertionError("network must not be used")
+
+        class CountingCache(HttpCache):
+            reads = 0
+
+            def get(self, *, url, params):
+                CountingCache.reads += 1
+                return super().get(url=url, params=params)
+
+        d = date(2025, 1, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            disk = CountingCache(root=Path(tmp))
+            url = f"https://api.polygon.io/v2/aggs/grouped/locale/us/market/stocks/{d.isoformat()}"
+            disk.put(url=url, params={"adjusted": "true"}, value={"results": [{"T": "AAA", "c": 1.0}]})
+
+            client = PolygonClient(api_key="k", cache=disk, transport=NoNetwork(), memory=MemoryCache(max_bytes=1 << 20))
+            first = client.grouped_daily(d)
+            second = client.grouped_daily(d)
+
+            assert first == [{"T": "AAA", "c": 1.0}]
+            assert second is first, "memory tier returns the parsed object"
+            assert CountingCache.reads == 1
+            stats = client.memory.stats()
+            assert stats["hits"] == 1 and stats["misses"] == 1
+            assert client.disk_counter.to_dict()["hits"] == 1
+        print("  ✓ Memory tier serves repeat reads without disk I/O")
+
+
+class TestMinuteBarStore:
+    """Tests for the columnar minute-bar store."""
+
+    @staticmethod
+    def _bars(n=5, start_ms=1735822800000):
+        return [
+            {"t": start_ms + i * 60_000, "o": 1.0 + i, "h": 1.5 + i, "l": 0.5 + i, "c": 1.2 + i,
+             "v": 1000 + i, "vw": 1.1 + i, "n": 10 + i}
+            for i in range(n)
+        ]
+
+    def test_round_trip_and_memmap(self):
+        """Saved ticker-days load back identically, memory-mapped; empty days round-trip too."""
+        import tempfile
+        from ybi_strategy.data import MinuteBarStore, bars_to_array
+
+        d = date(2025, 1, 2)
+        bars = self._bars()
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MinuteBarStore.from_dir(tmp)
+            assert store.load("AAA", d) is None
+            store.save("AAA", d, bars_to_array(list(reversed(bars))))
+            store.save("EMPTY", d, bars_to_array([]))
+
+            arr = store.load("AAA", d)
+            assert isinstance(arr, np.memmap)
+            assert list(arr["t"]) == [b["t"] for b in bars], "rows are sorted by timestamp"
+            assert list(arr["c"]) == [b["c"] for b in bars]
+            assert len(store.load("EMPTY", d)) == 0
+            assert not list(Path(tmp).rglob("*.tmp"))
+        print("  ✓ Bar store round-trips arrays (incl. empty days)")
+
+    def test_store_hit_skips_fetch(self):
+        """A stored ticker-day is served without calling polygon.minute_bars."""
+        import tempfile
+        from ybi_strategy.data import MinuteBarStore, load_minute_array, load_minute_arrays
+
+        bars = self._bars()
+
+        class FakePolygon:
+            calls = 0
+
+            def minute_bars(self, ticker, d):
+                FakePolygon.calls += 1
+                if ticker == "BAD":
+                    raise RuntimeError("boom")
+                return bars
+
+        d = date(2025, 1, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MinuteBarStore.from_dir(tmp)
+            first = load_minute_array(FakePolygon(), "AAA", d, store)
+            second = load_minute_array(FakePolygon(), "AAA", d, store)
+            assert FakePolygon.calls == 1
+            np.testing.assert_array_equal(first, second)
+
+            out = load_minute_arrays(FakePolygon(), ["AAA", "BAD", "BBB"], d, store=store)
+            assert FakePolygon.calls == 3, "only store misses are fetched"
+            assert isinstance(out[1], RuntimeError)
+            np.testing.assert_array_equal(out[2], first)
+            assert store.load("BAD", d) is None, "failures are not stored"
+        print("  ✓ Store hits skip the API entirely")
+
+    def test_frame_matches_legacy_conversion(self):
+        """Engine frames built from arrays match the old DataFrame(bars) conversion."""
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        bars = self._bars(30)
+        engine = BacktestEngine.__new__(BacktestEngine)
+        engine.config = Config(raw={"timezone": "America/New_York"})
+        df = engine._bars_to_frame(bars)
+
+        legacy = pd.DataFrame(bars)[["t", "o", "h", "l", "c", "v"]]
+        legacy["ts"] = pd.to_datetime(legacy["t"], unit="ms", utc=True).dt.tz_convert("America/New_York")
+        legacy = legacy.drop(columns=["t"]).set_index("ts").sort_index()
+
+        pd.testing.assert_frame_equal(df, legacy, check_dtype=False, check_index_type=False)
+        assert list(df.columns) == ["o", "h", "l", "c", "v"]
+        print("  ✓ Array-backed frames match legacy conversion")
+
+    def test_day_context_shares_screener_bars(self):
+        """Bars parsed by the screener are reused by the day simulation without refetching."""
+        from ybi_strategy.data import DayBarContext, load_minute_array
+        from ybi_strategy.universe.watchlist import build_watchlist_premarket_gappers
+
+        d = date(2025, 1, 2)
+        # 04:00 ET on 2025-01-02, then a minute every bar
+        bars = self._bars(20, start_ms=1735808400000)
+
+        class FakePolygon:
+            minute_calls = 0
+
+            def grouped_daily(self, day):
+                return [{"T": "AAA", "c": 0.5, "v": 1e6}, {"T": "BBB", "c": 0.5, "v": 5e5}]
+
+            def minute_bars(self, ticker, day):
+                FakePolygon.minute_calls += 1
+                return bars
+
+        ctx = DayBarContext(day=d)
+        wl = build_watchlist_premarket_gappers(
+            polygon=FakePolygon(), day=d, top_n=5, min_premarket_pct=0.0,
+            min_prev_close=0.1, max_prev_close=20.0, min_premarket_volume=0,
+            min_premarket_dollar_volume=0.0, use_reference_data=False, bar_context=ctx,
+        )
+        assert [i.ticker for i in wl] and len(ctx) == 2
+        assert FakePolygon.minute_calls == 2
+
+        for item in wl:
+            load_minute_array(FakePolygon(), item.ticker, d, context=ctx)
+        assert FakePolygon.minute_calls == 2, "simulation stage must reuse screener bars"
+        print("  ✓ Screener bars are reused by the day simulation")
+
+
+class TestReferenceUniverse:
+    """Tests for the paginated reference-ticker universe snapshot."""
+
+    def test_list_tickers_follows_next_url(self):
+        """list_tickers walks every page via next_url's cursor."""
+        from ybi_strategy.polygon.client import PolygonClient
+
+        Resp = TestHttpTransport._FakeResponse
+        pages = [
+            Resp(200, {"results": [{"ticker": "AAA"}], "next_url": "https://api.polygon.io/v3/reference/tickers?cursor=c1&apiKey=x"}),
+            Resp(200, {"results": [{"ticker": "BBB"}]}),
+        ]
+        seen_params = []
+
+        class PagedTransport:
+            def get(self, url, params=None, timeout=None):
+                seen_params.append(dict(params))
+                return pages.pop(0)
+
+        client = PolygonClient(api_key="k", transport=PagedTransport())
+        rows = client.list_tickers(d=date(2025, 1, 2))
+        assert [r["ticker"] for r in rows] == ["AAA", "BBB"]
+        assert seen_params[0]["date"] == "2025-01-02"
+        assert seen_params[1] == {"cursor": "c1", "apiKey": "k"}
+        print("  ✓ list_tickers follows next_url pagination")
+
+    def test_join_matches_per_ticker_filter(self):
+        """The universe join classifies tickers like the per-ticker reference lookups."""
+        from ybi_strategy.universe.reference import universe_frame
+        from ybi_strategy.universe.watchlist import filter_common_stocks
+
+        details = {
+            "AAA": {"ticker": "AAA", "type": "CS", "market": "stocks", "active": True},
+            "BBBW": {"ticker": "BBBW", "type": "WARRANT", "market": "stocks", "active": True},
+            "CCC": {"ticker": "CCC", "type": "CS", "market": "otc", "active": True},
+            "DDD": {"ticker": "DDD", "type": "CS", "market": "stocks", "active": False},
+            "SNOW": {"ticker": "SNOW", "type": "CS", "market": "stocks", "active": True},
+        }
+
+        class FakePolygon:
+            def ticker_details(self, ticker):
+                return details.get(ticker)
+
+        tickers = ["SNOW", "AAA", "BBBW", "CCC", "DDD", "EEE", "X.WS"]
+        expected = filter_common_stocks(tickers, polygon=FakePolygon())
+        joined = filter_common_stocks(tickers, polygon=None, universe=universe_frame(list(details.values())))
+        assert joined == expected == ["SNOW", "AAA"]
+        print("  ✓ Universe join matches per-ticker classification")
+
+    def test_snapshot_reused_within_ttl(self):
+        """A snapshot serves later days until it expires, then a new listing is taken."""
+        import tempfile
+        from ybi_strategy.universe.reference import ReferenceUniverse
+
+        class FakePolygon:
+            calls = []
+
+            def list_tickers(self, *, d=None):
+                FakePolygon.calls.append(d)
+                return [{"ticker": "NA", "type": "CS", "market": "stocks", "active": True}]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            uni = ReferenceUniverse.from_dir(tmp, ttl_days=3)
+            first = uni.snapshot(FakePolygon(), date(2025, 1, 2))
+            ReferenceUniverse.from_dir(tmp, ttl_days=3).snapshot(FakePolygon(), date(2025, 1, 3))
+            reloaded = ReferenceUniverse.from_dir(tmp, ttl_days=3).snapshot(FakePolygon(), date(2025, 1, 4))
+            uni.snapshot(FakePolygon(), date(2025, 1, 6))
+
+            assert FakePolygon.calls == [date(2025, 1, 2), date(2025, 1, 6)]
+            assert list(uni._loaded) == [uni.path(date(2025, 1, 6))], "only the latest snapshot stays in memory"
+            assert reloaded["ticker"].tolist() == ["NA"], "ticker 'NA' must not be read as missing"
+            assert bool(reloaded["active"].iloc[0]) and first["type"].iloc[0] == "CS"
+        print("  ✓ Universe snapshots are reused within the TTL")
+
+
+class TestTradingDayIndex:
+    """Tests for calendar-driven previous/next trading day resolution."""
+
+    def test_index_matches_day_by_day_scan(self):
+        """Index lookups agree with stepping through is_trading_day."""
+        from datetime import timedelta
+        from ybi_strategy.calendar import is_trading_day, next_trading_day, prev_trading_day
+
+        d = date(2023, 12, 1)
+        while d <= date(2026, 2, 1):
+            p = d - timedelta(days=1)
+            while not is_trading_day(p):
+                p -= timedelta(days=1)
+            n = d + timedelta(days=1)
+            while not is_trading_day(n):
+                n += timedelta(days=1)
+            assert prev_trading_day(d) == p, d
+            assert next_trading_day(d) == n, d
+            d += timedelta(days=1)
+
+        assert prev_trading_day(date(2025, 1, 2)) == date(2024, 12, 31)  # across New Year's Day
+        assert prev_trading_day(date(2025, 1, 21)) == date(2025, 1, 17)  # across MLK weekend
+        assert prev_trading_day(date(1989, 12, 31)) == date(1989, 12, 29), "outside index falls back"
+        print("  ✓ Trading-day index matches day-by-day scan")
+
+    def test_engine_prev_day_uses_no_api_calls(self):
+        """Engine resolves the previous session from the calendar; probing is opt-in."""
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        class FakePolygon:
+            probed = []
+
+            def grouped_daily(self, d):
+                FakePolygon.probed.append(d)
+                # Pretend 2025-01-08 (an unscheduled closure unknown to the calendar) has no data
+                return [] if d == date(2025, 1, 8) else [{"T": "AAA"}]
+
+        engine = BacktestEngine.__new__(BacktestEngine)
+        engine.polygon = FakePolygon()
+        engine.verify_calendar_with_api = False
+        assert engine._prev_trading_day(date(2025, 1, 6)) == date(2025, 1, 3)
+        assert FakePolygon.probed == []
+
+        engine.verify_calendar_with_api = True
+        assert engine._prev_trading_day(date(2025, 1, 9)) == date(2025, 1, 7)
+        print("  ✓ Previous session resolved without API calls (verification optional)")
+
+    def test_rule_based_holidays_and_early_closes(self):
+        """Generated holidays match NYSE schedules, including observed-date shifting."""
+        from ybi_strategy.calendar import (
+            early_closes, get_trading_days, is_market_holiday, market_close_time, market_holidays,
+        )
+
+        assert set(market_holidays(2025)) == {
+            date(2025, 1, 1), date(2025, 1, 9), date(2025, 1, 20), date(2025, 2, 17), date(2025, 4, 18),
+            date(2025, 5, 26), date(2025, 6, 19), date(2025, 7, 4), date(2025, 9, 1),
+            date(2025, 11, 27), date(2025, 12, 25),
+        }
+        assert is_market_holiday(date(2022, 12, 26)), "Sunday Christmas observed Monday"
+        assert is_market_holiday(date(2027, 6, 18)), "Saturday Juneteenth observed Friday"
+        assert not is_market_holiday(date(2021, 12, 31)), "Saturday New Year's Day is not observed"
+        assert not is_market_holiday(date(2021, 6, 18)), "Juneteenth only from 2022"
+        assert is_market_holiday(date(2030, 4, 19)), "Good Friday from Easter (2030-04-21)"
+
+        assert sorted(early_closes(2025)) == [date(2025, 7, 3), date(2025, 11, 28), date(2025, 12, 24)]
+        assert date(2026, 7, 3) not in early_closes(2026), "July 3 2026 is the observed holiday"
+        assert market_close_time(date(2024, 12, 24)) == time(13, 0)
+        assert market_close_time(date(2024, 12, 23)) == time(16, 0)
+
+        assert get_trading_days(date(2025, 1, 6), date(2025, 1, 10)) == [
+            date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 8), date(2025, 1, 10),
+        ]
+        assert len(get_trading_days(date(2024, 1, 1), date(2024, 12, 31))) == 252
+        print("  ✓ Rule-based holidays and early closes match NYSE schedules")
+
+
+class TestParallelDays:
+    """Tests for process-pool day execution in BacktestEngine."""
+
+    def test_workers_match_serial(self):
+        """Day results from a process pool equal the serial run, in date order."""
+        import tempfile
+        from datetime import timedelta
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 3, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+            "session": {"trade_start": "09:30", "trade_end": "11:00", "force_flat": "11:55"},
+            "strategy_small_caps": {"macro_filter": {"require_above_ema_34": False, "require_above_ema_55": False}},
+        })
+        dates = [date(2025, 1, 2) + timedelta(days=i) for i in range(7)]
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp))
+            engine._worker_usage = {}
+            serial = list(engine._iter_day_results(dates, workers=1))
+            parallel = list(engine._iter_day_results(dates, workers=2))
+
+        assert [r.audit for r in parallel] == [r.audit for r in serial]
+        assert [r.trades for r in parallel] == [r.trades for r in serial]
+        assert [r.fills for r in parallel] == [r.fills for r in serial]
+        assert [r.watchlist for r in parallel] == [r.watchlist for r in serial]
+        assert any(r.watchlist for r in serial), "fixture should produce watchlists"
+        print("  ✓ Parallel day execution matches the serial run")
+
+    def test_prefetch_pipeline_matches_serial_and_is_bounded(self):
+        """Prefetching upcoming days gives identical results with at most K+1 days in flight."""
+        import tempfile
+        import threading
+        from datetime import timedelta
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+        dates = [date(2025, 1, 2) + timedelta(days=i) for i in range(12)]
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp))
+            serial = list(engine._iter_day_results(dates))
+
+            engine.prefetch_days = 2
+            lock = threading.Lock()
+            counts = {"loaded": 0, "simulated": 0, "max_ahead": 0}
+            load, simulate = engine._load_day, engine._simulate_day
+
+            def counting_load(d):
+                with lock:
+                    counts["loaded"] += 1
+                    counts["max_ahead"] = max(counts["max_ahead"], counts["loaded"] - counts["simulated"])
+                return load(d)
+
+            def counting_simulate(d, inputs):
+                with lock:
+                    counts["simulated"] += 1
+                return simulate(d, inputs)
+
+            engine._load_day, engine._simulate_day = counting_load, counting_simulate
+            prefetched = list(engine._iter_day_results(dates))
+
+        assert [(r.audit, r.trades, r.fills, r.watchlist) for r in prefetched] == \
+            [(r.audit, r.trades, r.fills, r.watchlist) for r in serial]
+        assert counts["loaded"] == counts["simulated"] == 7
+        assert counts["max_ahead"] <= 3
+        print("  ✓ Prefetch pipeline matches serial results with a bounded window")
+
+    def test_merge_stats(self):
+        """Worker API usage is summed, with ratios recomputed."""
+        from ybi_strategy.polygon.client import merge_stats
+
+        a = {"requests": 3, "fetch_seconds": 1.0, "throttled_seconds": 1.0, "throttled_pct": 50.0,
+             "memory_cache": {"hits": 1, "misses": 3, "hit_rate": 0.25, "max_bytes": 100}}
+        b = {"requests": 1, "fetch_seconds": 2.0, "throttled_seconds": 0.0, "throttled_pct": 0.0,
+             "memory_cache": {"hits": 3, "misses": 1, "hit_rate": 0.75, "max_bytes": 100}}
+        merged = merge_stats([a, b])
+        assert merged["requests"] == 4 and merged["throttled_pct"] == 25.0
+        assert merged["memory_cache"] == {"hits": 4, "misses": 4, "hit_rate": 0.5, "max_bytes": 100}
+        print("  ✓ Worker API usage merges correctly")
+
+
+class TestCheckpoints:
+    """Tests for per-day checkpoints and resumable runs."""
+
+    def test_resume_skips_completed_days(self):
+        """Checkpointed days are restored verbatim; only missing days are simulated."""
+        import tempfile
+        from datetime import timedelta
+        from ybi_strategy.backtest.checkpoints import DayCheckpoints
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+        dates = [date(2025, 1, 2) + timedelta(days=i) for i in range(7)]
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp))
+            ckpt = DayCheckpoints.for_run(Path(tmp), engine._config_hash())
+            first = list(engine._iter_checkpointed(dates[:4], ckpt))
+            assert ckpt.completed() == [date(2025, 1, 2), date(2025, 1, 3)], "weekends are not checkpointed"
+
+            loaded = []
+            load = engine._load_day
+            engine._load_day = lambda d: loaded.append(d) or load(d)
+            resumed = list(engine._iter_checkpointed(dates, ckpt, resume=True))
+            assert loaded == [date(2025, 1, 6), date(2025, 1, 7), date(2025, 1, 8)]
+            assert engine.resumed_days == 2
+            assert [(r.audit, r.trades, r.fills, r.watchlist) for r in resumed[:4]] == \
+                [(r.audit, r.trades, r.fills, r.watchlist) for r in first]
+
+            other = DayCheckpoints(root=ckpt.root, config_hash="sha256:other")
+            assert other.load(date(2025, 1, 2)) is None, "checkpoints from another config are ignored"
+        print("  ✓ Resume restores checkpointed days and computes only the rest")
+
+    def test_resume_loads_lazily_and_recomputes_bad_checkpoints(self):
+        """Checkpoints are read as days are yielded; unreadable payloads are recomputed."""
+        import json
+        import tempfile
+        from datetime import timedelta
+        from ybi_strategy.backtest.checkpoints import DayCheckpoints
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        loads = []
+
+        class CountingCheckpoints(DayCheckpoints):
+            def load(self, d):
+                loads.append(d)
+                return super().load(d)
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+        dates = [date(2025, 1, 6) + timedelta(days=i) for i in range(5)]
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp))
+            base = DayCheckpoints.for_run(Path(tmp), engine._config_hash())
+            ckpt = CountingCheckpoints(root=base.root, config_hash=base.config_hash)
+            first = list(engine._iter_checkpointed(dates, ckpt))
+            assert date(2025, 1, 9) not in ckpt.completed(), "market closed"
+
+            resumed = engine._iter_checkpointed(dates, ckpt, resume=True)
+            next(resumed)
+            assert loads == [dates[0]], "checkpoints are loaded one day at a time"
+            list(resumed)
+            assert engine.resumed_days == 4
+
+            # Truncated file, payload without "result", and a result with unknown fields
+            ckpt.path(dates[1]).write_text('{"date": "2025-01-07", "config_', encoding="utf-8")
+            ckpt.path(dates[2]).write_text(json.dumps({"date": "2025-01-08", "config_hash": ckpt.config_hash}),
+                                           encoding="utf-8")
+            stale = json.loads(ckpt.path(dates[4]).read_text(encoding="utf-8"))
+            stale["result"]["old_field"] = 1
+            ckpt.path(dates[4]).write_text(json.dumps(stale), encoding="utf-8")
+            resumed = list(engine._iter_checkpointed(dates, ckpt, resume=True))
+            assert engine.resumed_days == 1
+            assert [(r.audit, r.trades, r.fills, r.watchlist) for r in resumed] == \
+                [(r.audit, r.trades, r.fills, r.watchlist) for r in first]
+            assert ckpt.load(dates[1]) is not None, "recomputed days are checkpointed again"
+        print("  ✓ Resume loads checkpoints lazily and recomputes unreadable ones")
+
+
+class TestResultCache:
+    """Tests for the content-addressed per-day result cache."""
+
+    def _config(self, **portfolio):
+        return Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+            "portfolio": portfolio,
+            "reporting": {"bootstrap_samples": 100},
+        })
+
+    def test_hit_skips_loading_and_keys_on_simulation_config(self):
+        """Cached days skip inputs entirely; only simulation sections change the key."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.backtest.result_cache import ResultCache
+
+        d = date(2025, 1, 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache.from_dir(Path(tmp) / "cache")
+            first = BacktestEngine(config=self._config(), polygon=_SyntheticPolygon(),
+                                   output_dir=Path(tmp) / "a", result_cache=cache)
+            expected = first._process_day(d)
+            assert expected.audit["status"] in ("ok", "no_trades")
+            assert cache.stats()["entries"] == 1
+
+            config = self._config()
+            config.raw["reporting"]["bootstrap_samples"] = 5000
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(),
+                                    output_dir=Path(tmp) / "b", result_cache=cache)
+            assert engine.sim_config_hash == first.sim_config_hash
+            engine._load_day = lambda day: (_ for _ in ()).throw(AssertionError("inputs loaded on a hit"))
+            got = engine._process_day(d)
+            assert (got.audit, got.fills, got.trades, got.watchlist) == \
+                (expected.audit, expected.fills, expected.trades, expected.watchlist)
+
+            changed = BacktestEngine(config=self._config(max_positions=1), polygon=_SyntheticPolygon(),
+                                     output_dir=Path(tmp) / "c", result_cache=cache)
+            assert changed.sim_config_hash != first.sim_config_hash
+            assert cache.get(changed.sim_config_hash, d) is None
+        print("  ✓ Result cache hits skip loading; simulation sections change the key")
+
+    def test_verify_inputs_detects_changed_data(self):
+        """With verify_inputs, a day whose inputs changed is re-simulated and re-cached."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.backtest.result_cache import ResultCache
+
+        class _ShiftedPolygon(_SyntheticPolygon):
+            def daily_bar(self, ticker, d):
+                return {"h": 7.0, "l": 2.5, "o": 3.0, "c": 4.0}
+
+        d = date(2025, 1, 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache.from_dir(tmp)
+            config = self._config()
+            config.raw["result_cache"] = {"verify_inputs": True}
+            BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp) / "a",
+                           result_cache=cache)._process_day(d)
+            before = cache.get(BacktestEngine(config=config, polygon=_SyntheticPolygon(),
+                                              output_dir=Path(tmp) / "a").sim_config_hash, d)
+
+            engine = BacktestEngine(config=config, polygon=_ShiftedPolygon(), output_dir=Path(tmp) / "b",
+                                    result_cache=cache)
+            simulated = []
+            simulate = engine._simulate_day
+            engine._simulate_day = lambda day, inputs: simulated.append(day) or simulate(day, inputs)
+            engine._process_day(d)
+            assert simulated == [d], "changed inputs must be re-simulated"
+            after = cache.get(engine.sim_config_hash, d)
+            assert after.input_fingerprint != before.input_fingerprint
+
+            simulated.clear()
+            engine._process_day(d)
+            assert simulated == [], "unchanged inputs reuse the cached result"
+        print("  ✓ verify_inputs re-simulates days whose inputs changed")
+
+    def test_prune_and_stats(self):
+        """Pruning by config drops its entries and unreferenced objects only."""
+        import tempfile
+        from ybi_strategy.backtest.result_cache import ResultCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache.from_dir(tmp)
+            cache.put("a" * 64, date(2025, 1, 2), "f1", {"audit": {"status": "ok"}})
+            cache.put("a" * 64, date(2025, 1, 3), "f2", {"audit": {"status": "ok"}})
+            cache.put("b" * 64, date(2025, 1, 2), "f1", {"audit": {"status": "ok"}})
+            assert cache.stats()["configs"] == 2 and cache.stats()["objects"] == 3
+
+            assert cache.prune(sim_hash="a" * 64) == {"entries": 2, "objects": 2}
+            assert cache.get("a" * 64, date(2025, 1, 2)) is None
+            assert cache.get("b" * 64, date(2025, 1, 2)).result == {"audit": {"status": "ok"}}
+            assert cache.prune(older_than_days=1) == {"entries": 0, "objects": 0}
+            assert cache.stats()["entries"] == 1
+        print("  ✓ Result cache prune/stats")
+
+
+class TestOutputWriters:
+    """Tests for streaming per-day output writers."""
+
+    def test_streamed_csv_matches_whole_run_frame(self):
+        """Per-day batches produce the same CSV as one DataFrame of all rows."""
+        import tempfile
+        from ybi_strategy.backtest.writers import CsvRowWriter, read_output_frame
+
+        days = [
+            [{"date": "2025-01-02", "ticker": "NA", "pnl": 0.1 + 0.2}],
+            [],
+            [{"date": "2025-01-03", "ticker": "ABC", "pnl": -1.5, "note": "late"},
+             {"date": "2025-01-03", "ticker": "XYZ", "pnl": 2.0}],
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trades.csv"
+            writer = CsvRowWriter(path)
+            for rows in days:
+                writer.write_rows(rows)
+            writer.close()
+            expected = pd.DataFrame([r for rows in days for r in rows]).to_csv(index=False)
+            assert path.read_text(encoding="utf-8") == expected, "new keys widen the header"
+
+            df = read_output_frame(path)
+            assert df["ticker"].tolist() == ["NA", "ABC", "XYZ"]
+            assert df["pnl"].iloc[0] == 0.1 + 0.2, "floats round-trip exactly"
+            assert read_output_frame(path, columns=["ticker", "missing"]).columns.tolist() == ["ticker"]
+
+            empty = CsvRowWriter(Path(tmp) / "fills.csv")
+            empty.close()
+            assert read_output_frame(empty.path).empty
+        print("  ✓ Streamed CSV output matches whole-run DataFrame output")
+
+    def test_parquet_output_is_typed_and_summarizes_identically(self):
+        """--format parquet writes typed columns; reporting reads both formats alike."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("  - skipped (pyarrow not installed)")
+            return
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.backtest.writers import ParquetRowWriter
+        from ybi_strategy.reporting import load_backtest_output
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ("csv", "parquet"):
+                BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp) / fmt).run(
+                    start_date="2025-01-02", end_date="2025-01-03", output_format=fmt
+                )
+            summaries = [json.loads((Path(tmp) / fmt / "summary.json").read_text()) for fmt in ("csv", "parquet")]
+            assert summaries[0] == summaries[1]
+
+            trades = load_backtest_output(Path(tmp) / "parquet")
+            csv_trades = load_backtest_output(Path(tmp) / "csv")
+            assert len(trades) == len(csv_trades) > 0
+            assert str(trades["entry_ts"].dt.tz) == "America/New_York"
+            assert isinstance(trades["ticker"].dtype, pd.CategoricalDtype)
+            assert trades["entry_ts"].tolist() == pd.to_datetime(csv_trades["entry_ts"]).tolist()
+
+            writer = ParquetRowWriter(Path(tmp) / "rows.parquet", "America/New_York")
+            writer.write_rows([{"ticker": "A", "qty": 1}])
+            writer.write_rows([{"ticker": "B", "qty": 2.5, "extra": "x"}])
+            writer.close()
+            df = pd.read_parquet(writer.path)
+            assert df["qty"].tolist() == [1.0, 2.5] and df["extra"].tolist()[1] == "x"
+        print("  ✓ Parquet output is typed and summarizes like CSV")
+
+
+class TestProfiler:
+    """Tests for stage timers/counters and profile.json."""
+
+    def test_profile_json_has_stages_counters_and_days(self):
+        """A profiled run writes per-stage and per-day timings next to summary.json."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.profiling import Profiler
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=Path(tmp),
+                                    profiler=Profiler())
+            engine.run(start_date="2025-01-02", end_date="2025-01-04")
+            profile = json.loads((Path(tmp) / "profile.json").read_text())
+            for stage in ("screen", "bars", "load", "indicators", "simulate", "write", "summarize"):
+                assert stage in profile["stages"], stage
+            assert profile["stages"]["indicators"]["calls"] == 2
+            assert profile["counters"]["tickers_simulated"] == 4
+            assert set(profile["days"]) == {"2025-01-02", "2025-01-03"}
+            assert profile["days"]["2025-01-02"]["counters"]["bars_processed"] == 2 * 8 * 60
+
+            plain = Path(tmp) / "plain"
+            BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=plain).run(
+                start_date="2025-01-02", end_date="2025-01-02"
+            )
+            assert not (plain / "profile.json").exists()
+        print("  ✓ profile.json records stages, counters and per-day breakdowns")
+
+    def test_drain_and_merge(self):
+        """Worker profiles drained per day merge into the parent's totals."""
+        from ybi_strategy.profiling import Profiler
+
+        worker, parent = Profiler(), Profiler()
+        for d in (date(2025, 1, 2), date(2025, 1, 3)):
+            with worker.stage("simulate", d):
+                pass
+            worker.count("tickers_simulated", 3, day=d)
+            parent.merge(worker.drain())
+        assert worker.snapshot() == {"stages": {}, "counters": {}, "days": {}}
+        report = parent.to_dict()
+        assert report["stages"]["simulate"]["calls"] == 2
+        assert report["counters"] == {"tickers_simulated": 6}
+        assert report["days"]["2025-01-03"]["counters"] == {"tickers_simulated": 3}
+
+        off = Profiler.disabled()
+        with off.stage("simulate"):
+            off.count("x")
+        assert off.snapshot()["stages"] == {} and off.snapshot()["counters"] == {}
+        print("  ✓ Profiler drain/merge and disabled no-ops")
+
+
+class TestAnalysisLevels:
+    """Tests for tiered summary statistics and the analyze entry point."""
+
+    def test_settings_gate_components_by_level(self):
+        """Components run only at/above their level and when switched on."""
+        from ybi_strategy.reporting.summary import AnalysisSettings
+
+        full = AnalysisSettings.from_config(Config(raw={}))
+        assert full.level == "full" and full.skipped() == []
+        assert full.monte_carlo_simulations == 10000 and full.bootstrap_samples == 10000
+
+        core = AnalysisSettings.from_config(Config(raw={"analysis": {"level": "full"}}), level="core")
+        assert core.runs("hac") and core.runs("stratified") and not core.runs("monte_carlo")
+
+        cfg = Config(raw={"analysis": {"level": "full", "bootstrap": {"enabled": False, "n_bootstrap": 50},
+                                       "monte_carlo": {"n_simulations": 200}}})
+        custom = AnalysisSettings.from_config(cfg)
+        assert custom.skipped() == ["bootstrap"] and custom.monte_carlo_simulations == 200
+        assert AnalysisSettings.from_config(cfg, level="none").skipped() == list(
+            ["stratified", "leakage_audit", "hac", "monte_carlo", "walk_forward", "bootstrap", "stress_tests"]
+        )
+        try:
+            AnalysisSettings.from_config(cfg, level="fast")
+            assert False, "unknown level must raise"
+        except ValueError:
+            pass
+        print("  ✓ Analysis levels gate summary components")
+
+    def test_analyze_fills_in_skipped_statistics(self):
+        """A run with analysis=none, analyzed later, matches a full run's summary."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.reporting.summary import analyze_results
+
+        config = Config(raw={
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+            "analysis": {"monte_carlo": {"n_simulations": 200}, "bootstrap": {"n_bootstrap": 200},
+                         "stress_tests": {"n_simulations": 50}},
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            quick, full = Path(tmp) / "quick", Path(tmp) / "full"
+            BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=quick).run(
+                start_date="2025-01-02", end_date="2025-01-03", analysis="none"
+            )
+            summary = json.loads((quick / "summary.json").read_text())
+            assert set(summary) == {"metrics", "analysis", "day_audit"}
+
+            BacktestEngine(config=config, polygon=_SyntheticPolygon(), output_dir=full).run(
+                start_date="2025-01-02", end_date="2025-01-03"
+            )
+            analyze_results(quick, level="full")
+            assert (quick / "summary.json").read_text() == (full / "summary.json").read_text()
+        print("  ✓ analyze recomputes skipped statistics from saved outputs")
+
+
+class TestBatchEngine:
+    """Tests for multi-config batch runs sharing loaded market data."""
+
+    def test_variants_share_loads_and_match_standalone_runs(self):
+        """Each screening group loads a day once; every variant's outputs match a solo run."""
+        import copy
+        import tempfile
+        from ybi_strategy.backtest.batch import BacktestVariant, BatchBacktestEngine, load_config_key
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        class _CountingPolygon(_SyntheticPolygon):
+            def __init__(self):
+                self.minute_calls = 0
+
+            def minute_bars(self, ticker, d):
+                self.minute_calls += 1
+                return super().minute_bars(ticker, d)
+
+        base = {
+            "timezone": "America/New_York",
+            "watchlist": {"method": "premarket_gap", "top_n": 2, "min_premarket_pct": -1.0,
+                          "min_prev_close": 0.1, "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+            "execution": {"slippage": {"model": "fixed_cents", "cents": 0.02}},
+        }
+        raws = []
+        for cents in (0.01, 0.05):
+            raw = copy.deepcopy(base)
+            raw["execution"]["slippage"]["cents"] = cents
+            raws.append(raw)
+        wider = copy.deepcopy(base)
+        wider["watchlist"]["top_n"] = 3
+        raws.append(wider)
+        assert load_config_key(Config(raw=raws[0])) == load_config_key(Config(raw=raws[1]))
+        assert load_config_key(Config(raw=raws[0])) != load_config_key(Config(raw=raws[2]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            poly = _CountingPolygon()
+            variants = [BacktestVariant(config=Config(raw=r), output_dir=Path(tmp) / f"v{i}") for i, r in enumerate(raws)]
+            batch = BatchBacktestEngine(variants=variants, polygon=poly)
+            batch.run(start_date="2025-01-02", end_date="2025-01-04", analysis="none")
+            assert len(batch.groups) == 2 and batch.days_loaded == 4
+
+            solo_poly = _CountingPolygon()
+            for i, raw in enumerate(raws):
+                solo = Path(tmp) / f"solo{i}"
+                BacktestEngine(config=Config(raw=raw), polygon=solo_poly, output_dir=solo).run(
+                    start_date="2025-01-02", end_date="2025-01-04", analysis="none"
+                )
+                for name in ("trades.csv", "fills.csv", "watchlist.csv", "day_audit.csv", "summary.json"):
+                    assert (solo / name).read_bytes() == (variants[i].output_dir / name).read_bytes(), (i, name)
+            assert poly.minute_calls == solo_poly.minute_calls // 3 * 2, "one data pass per screening group"
+            trades = pd.read_csv(variants[0].output_dir / "trades.csv")
+            assert not trades.equals(pd.read_csv(variants[1].output_dir / "trades.csv")), "slippage applied per variant"
+        print("  ✓ Batch variants share day loads and match standalone runs")
+
+
+class TestStreamingIndicators:
+    """Incremental indicator state matches the batch indicators bar for bar."""
+
+    def _bars(self, n_bars=960):
+        df = create_mock_bars(n_bars=n_bars, volatility=0.01)
+        df["v"] = df["v"].astype(float)
+        df.iloc[5, df.columns.get_loc("v")] = 0.0
+        return df
+
+    def _assert_matches(self, streamed, batch, name):
+        np.testing.assert_allclose(
+            np.asarray(streamed, dtype=float), batch.to_numpy(dtype=float), rtol=1e-9, atol=1e-9, err_msg=name
+        )
+
+    def test_scalar_indicators_match_batch(self):
+        from ybi_strategy.features.indicators import atr, rolling_linreg_last, sma
+        from ybi_strategy.features.streaming import ATR, EMA, SMA, VWAP, RollingLinReg, RollingMax, RollingMin, RollingStd
+
+        df = self._bars()
+        bars = df.to_dict("records")
+        c = df["c"]
+        checks = [
+            (EMA(21), c, ema(c, 21), "ema"),
+            (SMA(200), c, sma(c, 200), "sma"),
+            (RollingStd(20), c, c.rolling(20, min_periods=20).std(ddof=0), "std"),
+            (RollingMax(20), df["h"], df["h"].rolling(20, min_periods=20).max(), "max"),
+            (RollingMin(20), df["l"], df["l"].rolling(20, min_periods=20).min(), "min"),
+        ]
+        for state, inputs, expected, name in checks:
+            self._assert_matches([state.update(x) for x in inputs], expected, name)
+
+        atr_state, vwap_state = ATR(14), VWAP()
+        self._assert_matches([atr_state.update(b) for b in bars], atr(df, 14), "atr")
+        typical = (df["h"] + df["l"] + df["c"]) / 3.0
+        self._assert_matches([vwap_state.update(b) for b in bars], vwap(typical, df["v"]), "vwap")
+
+        # NaN gaps invalidate every window that contains them
+        y = c.diff()
+        y.iloc[400] = np.nan
+        linreg = RollingLinReg(20)
+        self._assert_matches([linreg.update(v) for v in y], rolling_linreg_last(y, 20), "linreg")
+        print("  ✓ Streaming EMA/SMA/STD/ATR/VWAP/linreg match batch")
+
+    def test_scalar_indicators_match_batch_across_nan(self):
+        from ybi_strategy.features.indicators import atr, sma
+        from ybi_strategy.features.streaming import ATR, EMA, SMA, RollingMax, RollingMin, RollingStd
+
+        small = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0])
+        state = SMA(2)
+        np.testing.assert_allclose([state.update(x) for x in small][4:], [4.5, 5.5, 6.5])
+
+        df = self._bars(n_bars=300)
+        df.iloc[[0, 50, 51, 52, 120], df.columns.get_loc("c")] = np.nan
+        df.iloc[[120, 200], df.columns.get_loc("h")] = np.nan
+        c = df["c"]
+        for series in (small, c):
+            checks = [
+                (EMA(8), ema(series, 8), "ema"),
+                (EMA(21), ema(series, 21), "ema"),
+                (SMA(2), sma(series, 2), "sma"),
+                (SMA(20), sma(series, 20), "sma"),
+                (RollingStd(2), series.rolling(2, min_periods=2).std(ddof=0), "std"),
+                (RollingStd(20), series.rolling(20, min_periods=20).std(ddof=0), "std"),
+            ]
+            for state, expected, name in checks:
+                self._assert_matches([state.update(x) for x in series], expected, name)
+        atr_state = ATR(14)
+        self._assert_matches([atr_state.update(b) for b in df.to_dict("records")], atr(df, 14), "atr")
+
+        state = RollingMax(3)
+        assert np.isnan([state.update(x) for x in [1.0, 5.0, np.nan, 2.0, 3.0]]).all()
+        df.iloc[[60, 61], df.columns.get_loc("l")] = np.nan
+        for series in (df["h"], df["l"]):
+            for window in (3, 20):
+                for state, reduce in ((RollingMax(window), "max"), (RollingMin(window), "min")):
+                    expected = getattr(series.rolling(window, min_periods=window), reduce)()
+                    self._assert_matches([state.update(x) for x in series], expected, reduce)
+        print("  ✓ Streaming EMA/SMA/STD/ATR/max/min recover after NaN inputs like batch")
+
+    def test_ttm_squeeze_matches_batch_across_nan(self):
+        from ybi_strategy.features.streaming import TTMSqueeze
+
+        df = self._bars(n_bars=300)
+        df.iloc[[40, 150], df.columns.get_loc("h")] = np.nan
+        df.iloc[[90], df.columns.get_loc("l")] = np.nan
+        expected = ttm_squeeze_proxy(df)
+        state = TTMSqueeze()
+        rows = pd.DataFrame([state.update(b) for b in df.to_dict("records")], index=df.index)
+        for col in ("ttm_bb_upper", "ttm_bb_lower", "ttm_kc_upper", "ttm_kc_lower", "momentum"):
+            self._assert_matches(rows[col], expected[col], col)
+        assert (rows["ttm_squeeze_on"] == expected["ttm_squeeze_on"]).all()
+        print("  ✓ Streaming TTM squeeze matches batch with NaN highs/lows")
+
+    def test_ttm_squeeze_matches_batch(self):
+        from ybi_strategy.features.streaming import TTMSqueeze
+
+        df = self._bars()
+        expected = ttm_squeeze_proxy(df)
+        state = TTMSqueeze()
+        rows = pd.DataFrame([state.update(b) for b in df.to_dict("records")], index=df.index)
+        for col in ("ttm_bb_upper", "ttm_bb_lower", "ttm_kc_upper", "ttm_kc_lower", "momentum"):
+            self._assert_matches(rows[col], expected[col], col)
+        assert (rows["ttm_squeeze_on"] == expected["ttm_squeeze_on"]).all()
+        assert rows["momentum"].iloc[:38].isna().all() and rows["momentum"].iloc[38:].notna().all()
+        print("  ✓ Streaming TTM squeeze matches batch")
+
+
+class TestPanelIndicators:
+    """Tests for computing a day's indicators as one (ticker x bar) panel."""
+
+    class _RaggedPolygon(_SyntheticPolygon):
+        """Tickers with gaps, short days, no premarket, no bars and zero-volume bars."""
+
+        def minute_bars(self, ticker, d):
+            bars = super().minute_bars(ticker, d)
+            if ticker == "SYN1":
+                return [b for k, b in enumerate(bars) if k % 5]
+            if ticker == "SYN2":
+                return bars[:360]
+            if ticker == "SYN3":
+                return bars[345:]
+            if ticker == "SYN4":
+                return []
+            if ticker == "SYN5":
+                return [dict(b, v=0) if 330 <= k < 335 else b for k, b in enumerate(bars)]
+            return bars
+
+    def _config(self, panel):
+        return Config(raw={
+            "timezone": "America/New_York",
+            "engine": {"panel_indicators": panel},
+            "watchlist": {"method": "premarket_gap", "top_n": 6, "min_premarket_pct": -1.0, "min_prev_close": 0.1,
+                          "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+        })
+
+    def test_panel_frames_match_per_ticker_frames(self):
+        """Panel mode builds the same session frames as per-ticker computation, including ragged inputs."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+        from ybi_strategy.data.bar_store import bars_to_array
+
+        d = date(2025, 1, 2)
+        poly = self._RaggedPolygon()
+        with tempfile.TemporaryDirectory() as tmp:
+            per_ticker = BacktestEngine(config=self._config(False), polygon=poly, output_dir=Path(tmp) / "a")
+            panel = BacktestEngine(config=self._config(True), polygon=poly, output_dir=Path(tmp) / "b")
+            inputs = per_ticker._load_day(d)
+            # The screener skips tickers without premarket bars; add them directly
+            for ticker in ("SYN3", "SYN4"):
+                inputs.bars[ticker] = (bars_to_array(poly.minute_bars(ticker, d)), None)
+            assert {"SYN0", "SYN1", "SYN2", "SYN5"} <= set(inputs.bars)
+            expected = per_ticker._prepare_bars(d, inputs)
+            result = panel._prepare_bars_panel(d, inputs)
+
+        assert list(result) == list(expected)
+        assert "SYN4" not in result  # no bars
+        assert result["SYN3"]["pmh"].isna().all() and (result["SYN3"]["premarket_vol"] == 0).all()
+        assert result["SYN3"]["pdh"].isna().all()
+        for ticker, frame in expected.items():
+            pd.testing.assert_frame_equal(result[ticker], frame, check_exact=True)
+        print("  ✓ Panel frames match per-ticker frames")
+
+    def test_panel_backtest_outputs_identical(self):
+        """A backtest with panel indicators writes byte-identical outputs."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, panel in (("a", False), ("b", True)):
+                BacktestEngine(config=self._config(panel), polygon=self._RaggedPolygon(), output_dir=Path(tmp) / name).run(
+                    start_date="2025-01-02", end_date="2025-01-03", analysis="none"
+                )
+            for name in ("trades.csv", "fills.csv", "watchlist.csv", "day_audit.csv"):
+                assert (Path(tmp) / "a" / name).read_bytes() == (Path(tmp) / "b" / name).read_bytes(), name
+        print("  ✓ Panel backtest outputs identical")
+
+
+class TestFeatureRegistry:
+    """Tests for computing only the indicator columns the config reads."""
+
+    def test_registry_declares_every_column(self):
+        from ybi_strategy.features.indicators import SESSION_COLUMNS
+        from ybi_strategy.features.kernels import TREND_COLUMNS
+        from ybi_strategy.features.registry import FEATURES
+
+        assert tuple(FEATURES) == TREND_COLUMNS + SESSION_COLUMNS
+        for feature in FEATURES.values():
+            for name in feature.inputs:
+                assert name in FEATURES or name in {"o", "h", "l", "c", "v"}, (feature.name, name)
+        print("  ✓ Registry covers every indicator column")
+
+    def test_plan_follows_config_flags(self):
+        from ybi_strategy.features.registry import FeaturePlan
+
+        plan = FeaturePlan.from_config(Config(raw={}))
+        assert "sma_200" in plan.skipped and "ttm_squeeze_on" in plan.skipped and "hod_so_far" in plan.skipped
+        assert {"ema_21", "ema_34", "ttm_state", "momentum", "vwap"} <= set(plan.columns)
+
+        sma = FeaturePlan.from_config(Config(raw={"strategy_small_caps": {"macro_filter": {"require_above_sma_200": True}}}))
+        assert "sma_200" in sma.columns
+
+        lean = FeaturePlan.from_config(Config(raw={"strategy_small_caps": {
+            "allow_starter_entries": False,
+            "macro_filter": {"require_above_ema_34": False, "require_above_ema_55": False},
+            "entry": {"require_momentum_bull": False},
+            "exits": {"exit_on_close_below_ema8": False, "exit_on_ttm_momentum_bear": False},
+        }}))
+        assert {"ema_34", "ema_55", "momentum_sign"} <= set(lean.skipped)
+        # Still an input of extension_from_ema8_pct
+        assert "ema_8" in lean.columns
+
+        assert FeaturePlan.from_config(Config(raw={"features": {"compute": "all"}})).skipped == ()
+        assert "hod_so_far" in FeaturePlan.from_config(Config(raw={"features": {"include": ["hod_so_far"]}})).columns
+        try:
+            FeaturePlan.from_config(Config(raw={"features": {"include": ["no_such_column"]}}))
+            assert False, "Should have raised ValueError"
+        except ValueError:
+            pass
+        print("  ✓ Feature plan follows config flags")
+
+    def test_required_features_give_identical_outputs(self):
+        """Skipping unread columns leaves every output unchanged; the skipped set is recorded."""
+        import tempfile
+        from ybi_strategy.backtest.engine import BacktestEngine
+
+        def config(compute):
+            return Config(raw={
+                "timezone": "America/New_York",
+                "features": {"compute": compute},
+                "watchlist": {"method": "premarket_gap", "top_n": 3, "min_premarket_pct": -1.0, "min_prev_close": 0.1,
+                              "min_premarket_volume": 0, "min_premarket_dollar_volume": 0},
+            })
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for compute in ("all", "required"):
+                engine = BacktestEngine(config=config(compute), polygon=_SyntheticPolygon(), output_dir=Path(tmp) / compute)
+                engine.run(start_date="2025-01-02", end_date="2025-01-03", analysis="none")
+            for name in ("trades.csv", "fills.csv", "watchlist.csv", "day_audit.csv"):
+                assert (Path(tmp) / "all" / name).read_bytes() == (Path(tmp) / "required" / name).read_bytes(), name
+            metadata = json.loads((Path(tmp) / "required" / "run_metadata.json").read_text())
+            assert "sma_200" in metadata["features"]["skipped"]
+            assert "ema_21" in metadata["features"]["computed"]
+
+            frames = engine._prepare_bars(date(2025, 1, 2), engine._load_day(date(2025, 1, 2)))
+            assert frames and all("sma_200" not in df.columns and "ema_34" in df.columns for df in frames.values())
+        print("  ✓ Required features give identical outputs")
+
+
 def run_all_tests():
     """Run all tests and report results."""
     print("\n" + "=" * 60)
@@ -2624,6 +4306,25 @@ def run_all_tests():
         ("V8 Audit Fixes", TestV8Fixes()),
         ("V9 Audit Fixes", TestV9Fixes()),
         ("Premarket Screener", TestPremarketScreener()),
+        ("HTTP Transport", TestHttpTransport()),
+        ("Async Polygon Client", TestAsyncPolygonClient()),
+        ("Rate Limiter", TestRateLimiter()),
+        ("SQLite HTTP Cache", TestSqliteHttpCache()),
+        ("Sharded HTTP Cache", TestShardedHttpCache()),
+        ("Memory Cache", TestMemoryCache()),
+        ("Minute Bar Store", TestMinuteBarStore()),
+        ("Reference Universe", TestReferenceUniverse()),
+        ("Trading Day Index", TestTradingDayIndex()),
+        ("Parallel Days", TestParallelDays()),
+        ("Checkpoints", TestCheckpoints()),
+        ("Result Cache", TestResultCache()),
+        ("Output Writers", TestOutputWriters()),
+        ("Profiler", TestProfiler()),
+        ("Analysis Levels", TestAnalysisLevels()),
+        ("Batch Engine", TestBatchEngine()),
+        ("Streaming Indicators", TestStreamingIndicators()),
+        ("Panel Indicators", TestPanelIndicators()),
+        ("Feature Registry", TestFeatureRegistry()),
     ]
 
     total_tests = 0